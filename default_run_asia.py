@@ -45,7 +45,7 @@ def main():
         "qwen_base_url": os.getenv("QWEN_BASE_URL", "http://10.164.46.86:8080"),
         "qwen_coder_base_url": os.getenv("QWEN_CODER_BASE_URL", "http://10.164.46.199:8080"),
         "tested_model_base_url": os.getenv("TESTED_MODEL_BASE_URL", "http://10.164.46.86:8080"),
-        "batch_size": 5,
+        "batch_size": 100,
         "rounds": 2,
         "data_path": "input_data/asia_data/raw_input",
         "output_dir": "evaluation_results_asia",
@@ -0,0 +1,122 @@
+"""
+OpenAI Batch API 格式的导出/导入（离线批量推理）
+
+导出（--batch_export）：
+- 响应缓存中没有的请求不发往服务端，而是按 Batch API 格式记下来，custom_id 就是响应缓存键；
+  对应的prompt按调用失败处理（抛出BatchPending），不写入断点日志
+- 一个阶段（回复 / 提取 / 评估）结束后，每个endpoint写出一个JSONL文件，程序退出
+
+导入（--batch_import）：
+- 读取 OpenAI Batch API 或 vLLM run_batch 的输出文件，按 custom_id 写入响应缓存
+- 之后加 --resume 重跑：已完成的工作从断点日志恢复，导入的结果命中缓存，继续到下一个阶段
+"""
+
+import json
+import os
+import threading
+
+# Batch API请求的url字段
+BATCH_URL = "/v1/chat/completions"
+
+# 当前的导出器，未启用时为None
+_batch_export = None
+
+
+class BatchPending(Exception):
+    """请求已导出到批处理文件，等待离线推理的结果"""
+
+
+class BatchExport:
+    """收集待离线推理的请求，按endpoint写出Batch API格式的JSONL"""
+
+    def __init__(self, export_dir):
+        self.export_dir = export_dir
+        # endpoint名称 -> {custom_id: 请求}
+        self._requests = {}
+        self._lock = threading.Lock()
+
+    def add(self, endpoint_name, custom_id, body):
+        """记下一个请求（相同custom_id只保留一份）"""
+        with self._lock:
+            self._requests.setdefault(endpoint_name, {})[custom_id] = {
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": BATCH_URL,
+                "body": body,
+            }
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(requests) for requests in self._requests.values())
+
+    def write(self, prefix):
+        """
+        写出并清空已收集的请求
+
+        Args:
+            prefix: 文件名前缀，例如 "round_1_extraction"
+
+        Returns:
+            {文件路径: 请求数}
+        """
+        os.makedirs(self.export_dir, exist_ok=True)
+        written = {}
+        with self._lock:
+            for endpoint_name, requests in self._requests.items():
+                path = os.path.join(self.export_dir, f"{prefix}_{endpoint_name}.jsonl")
+                with open(path, "w", encoding="utf-8") as f:
+                    for request in requests.values():
+                        f.write(json.dumps(request, ensure_ascii=False) + "\n")
+                written[path] = len(requests)
+            self._requests = {}
+        return written
+
+
+def enable_batch_export(export_dir):
+    """启用批处理导出"""
+    global _batch_export
+    _batch_export = BatchExport(export_dir)
+    return _batch_export
+
+
+def get_batch_export():
+    """返回当前的导出器，未启用时返回None"""
+    return _batch_export
+
+
+def import_batch_results(paths, cache):
+    """
+    把 Batch API 输出文件中的结果写入响应缓存
+
+    Args:
+        paths: 输出文件路径列表
+        cache: ResponseCache
+
+    Returns:
+        (导入的结果数, 失败或无法解析的行数)
+    """
+    imported = 0
+    failed = 0
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    response = record.get("response") or {}
+                    if record.get("error") or response.get("status_code") != 200:
+                        failed += 1
+                        continue
+                    body = response["body"]
+                    content = body["choices"][0]["message"]["content"]
+                except (json.JSONDecodeError, KeyError, IndexError, TypeError):
+                    failed += 1
+                    continue
+                if content is None:
+                    failed += 1
+                    continue
+                # 与在线调用一致：缓存去掉首尾空白后的内容
+                cache.put(record["custom_id"], "batch", body.get("model", ""), content.strip())
+                imported += 1
+    return imported, failed
@@ -0,0 +1,168 @@
+"""
+共享的HTTP连接池
+
+三个endpoint的AsyncOpenAI客户端以前各自创建一个httpx连接池，而 QWEN_BASE_URL 和 TESTED_MODEL_BASE_URL
+经常指向同一台vLLM，同一台机器上的成千上万个小请求分散在几个池里，默认的keep-alive连接数（100）
+又小于并发数，突发请求结束后多余的连接被关闭，下一批再重新建立TCP/TLS连接。
+
+现在所有客户端共用一个 httpx.AsyncClient，由 PooledTransport 按源站（scheme://host:port）各维护一个连接池：
+- 每个源站的最大连接数、keep-alive连接数和空闲过期时间可调
+- 可选HTTP/2（需要安装 h2，未安装时退回HTTP/1.1）
+- 通过httpcore的trace钩子统计请求数、新建的TCP连接数和TLS握手数，得到连接复用率
+"""
+
+import importlib.util
+
+import httpx
+
+# 每个源站的默认最大连接数
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 256
+# 每个源站默认保留的keep-alive连接数（不小于并发数，突发请求结束后连接不会被关掉）
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 256
+# keep-alive连接空闲多少秒后关闭
+DEFAULT_KEEPALIVE_EXPIRY = 60.0
+
+# 连接池配置，configure_pool() 修改后对之后创建的客户端生效
+_pool_config = {
+    "max_connections_per_host": DEFAULT_MAX_CONNECTIONS_PER_HOST,
+    "max_keepalive_connections": DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    "keepalive_expiry": DEFAULT_KEEPALIVE_EXPIRY,
+    "http2": False,
+}
+
+# 共享的客户端和传输层，第一次需要时创建
+_http_client = None
+_transport = None
+
+
+class PooledTransport(httpx.AsyncBaseTransport):
+    """按源站分别维护连接池的传输层，并统计连接复用情况"""
+
+    def __init__(self, max_connections_per_host=DEFAULT_MAX_CONNECTIONS_PER_HOST,
+                 max_keepalive_connections=DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+                 keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY, http2=False):
+        self.limits = httpx.Limits(
+            max_connections=max_connections_per_host,
+            max_keepalive_connections=min(max_keepalive_connections, max_connections_per_host),
+            keepalive_expiry=keepalive_expiry,
+        )
+        if http2 and importlib.util.find_spec("h2") is None:
+            print("⚠️  HTTP/2需要安装h2 (pip install 'httpx[http2]')，改用HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+        # 源站 -> httpx.AsyncHTTPTransport / 统计信息（只在事件循环线程中修改）
+        self._transports = {}
+        self._stats = {}
+
+    def _get_transport(self, origin):
+        transport = self._transports.get(origin)
+        if transport is None:
+            transport = httpx.AsyncHTTPTransport(limits=self.limits, http2=self.http2)
+            self._transports[origin] = transport
+            self._stats[origin] = {
+                "requests": 0,
+                "connections_opened": 0,
+                "tls_handshakes": 0,
+                "http2_responses": 0,
+            }
+        return transport
+
+    async def handle_async_request(self, request):
+        origin = f"{request.url.scheme}://{request.url.netloc.decode('ascii')}"
+        transport = self._get_transport(origin)
+        stats = self._stats[origin]
+        stats["requests"] += 1
+
+        outer_trace = request.extensions.get("trace")
+
+        async def trace(event_name, info):
+            if event_name.endswith(("connect_tcp.complete", "connect_unix_socket.complete")):
+                stats["connections_opened"] += 1
+            elif event_name.endswith("start_tls.complete"):
+                stats["tls_handshakes"] += 1
+            if outer_trace is not None:
+                await outer_trace(event_name, info)
+
+        request.extensions = {**request.extensions, "trace": trace}
+        response = await transport.handle_async_request(request)
+        if response.extensions.get("http_version") == b"HTTP/2":
+            stats["http2_responses"] += 1
+        return response
+
+    async def aclose(self):
+        for transport in self._transports.values():
+            await transport.aclose()
+
+    def stats(self):
+        """返回每个源站的统计信息：{源站: {...}}"""
+        result = {}
+        for origin, stats in self._stats.items():
+            # httpcore连接池当前持有的连接
+            pool = getattr(self._transports[origin], "_pool", None)
+            connections = list(getattr(pool, "connections", []))
+            requests = stats["requests"]
+            result[origin] = {
+                **stats,
+                "open_connections": len(connections),
+                "idle_connections": sum(1 for connection in connections if connection.is_idle()),
+                "reuse_rate": round(1 - stats["connections_opened"] / requests, 4) if requests else 0.0,
+            }
+        return result
+
+
+def configure_pool(max_connections_per_host=None, max_keepalive_connections=None, keepalive_expiry=None, http2=None):
+    """
+    调整共享连接池的配置（应在注册endpoint之前调用），参数为None时保持原值
+
+    Args:
+        max_connections_per_host: 每个源站的最大连接数
+        max_keepalive_connections: 每个源站保留的keep-alive连接数
+        keepalive_expiry: keep-alive连接空闲多少秒后关闭
+        http2: 是否启用HTTP/2
+    """
+    global _http_client, _transport
+    updates = {
+        "max_connections_per_host": max_connections_per_host,
+        "max_keepalive_connections": max_keepalive_connections,
+        "keepalive_expiry": keepalive_expiry,
+        "http2": http2,
+    }
+    _pool_config.update({key: value for key, value in updates.items() if value is not None})
+    # 之后注册的endpoint使用新的连接池，已注册的endpoint保留原来的
+    _http_client = None
+    _transport = None
+
+
+def get_http_client():
+    """返回所有AsyncOpenAI客户端共用的httpx.AsyncClient（必要时创建）"""
+    global _http_client, _transport
+    if _http_client is None:
+        _transport = PooledTransport(
+            max_connections_per_host=max(1, int(_pool_config["max_connections_per_host"])),
+            max_keepalive_connections=max(0, int(_pool_config["max_keepalive_connections"])),
+            keepalive_expiry=float(_pool_config["keepalive_expiry"]),
+            http2=bool(_pool_config["http2"]),
+        )
+        # 超时与openai客户端的默认值一致，实际请求会按调用时传入的timeout覆盖
+        _http_client = httpx.AsyncClient(
+            transport=_transport,
+            timeout=httpx.Timeout(600.0, connect=5.0),
+            follow_redirects=True,
+        )
+    return _http_client
+
+
+def pool_stats():
+    """返回共享连接池的统计信息：{源站: {...}}，尚未创建时为空字典"""
+    if _transport is None:
+        return {}
+    return _transport.stats()
+
+
+def print_pool_stats():
+    """打印共享连接池的统计信息"""
+    for origin, stats in pool_stats().items():
+        print(f"🔌 HTTP pool {origin}: {stats['requests']} requests over {stats['connections_opened']} new connections "
+              f"(reuse {stats['reuse_rate']*100:.1f}%), {stats['tls_handshakes']} TLS handshakes, "
+              f"{stats['open_connections']} open / {stats['idle_connections']} idle"
+              + (f", {stats['http2_responses']} over HTTP/2" if stats['http2_responses'] else ""))
@@ -0,0 +1,565 @@
+"""
+共享的异步LLM调用层
+
+tested_model_api / qwen_api / qwen_coder_api 三个模块都通过这里发请求：
+- 后台线程中常驻一个asyncio事件循环，所有请求都在这个循环里并发执行
+- 所有endpoint共用一个按源站划分的HTTP连接池（http_pool），指向同一台服务器的endpoint复用连接
+- 每个endpoint有独立的并发上限（信号量），控制同时在途的请求数量
+- 一个endpoint可以配置多个相同的副本（base_url用逗号分隔），请求优先发往在途请求最少的副本，
+  连续失败或返回429的副本会被暂时摘除
+- 每个endpoint可以配置令牌桶限流（每秒请求数、每分钟token数）
+- 429/5xx/连接错误只重试失败的那个prompt：带抖动的指数退避，服务端给出Retry-After时按它等待，
+  429还会让该endpoint的所有请求一起暂停，避免在被限流时继续打满服务端
+- 同步入口 call_endpoint() 阻塞直到整批结果返回，返回顺序与输入prompt顺序一致；
+  prompt可以是字符串，也可以是 (system前缀, user内容) 元组（固定前缀便于服务端的前缀缓存复用）
+- 启用响应缓存（response_cache）时，命中的请求不会发往服务端
+- 内容完全相同的请求（endpoint、模型、messages、参数都相同）同时在途时只发送一次，其余请求共享结果
+- 启用批处理导出（batch_io）时，未命中缓存的请求写入Batch API文件，不发往服务端
+- 每次调用按阶段记录token用量、耗时和重试次数（usage_stats）
+- 调用方可以按prompt指定max_tokens（提取、评估按输入长度给出预算），未指定时用 DEFAULT_MAX_TOKENS
+- 可以传入response_format（JSON schema等结构化输出），服务端不支持时返回的400错误由调用方处理
+"""
+
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from openai import AsyncOpenAI, APIConnectionError, APIStatusError
+
+from LLM_APIs.batch_io import BatchPending, get_batch_export
+from LLM_APIs.http_pool import get_http_client
+from LLM_APIs.response_cache import get_cache, make_cache_key
+from LLM_APIs.usage_stats import record_call
+
+# 每个endpoint默认允许同时在途的请求数
+DEFAULT_MAX_CONCURRENCY = 64
+
+# 调用方没有指定token预算时每个请求的max_tokens
+DEFAULT_MAX_TOKENS = 8096
+
+# 单个请求的超时（秒）
+REQUEST_TIMEOUT = 1800
+
+# 单个prompt失败后的默认重试次数
+DEFAULT_MAX_RETRIES = 5
+
+# 指数退避的基准时长和上限（秒）
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+
+# 服务端Retry-After的上限（秒），防止异常的响应头让评估长时间停住
+RETRY_AFTER_MAX = 600.0
+
+# 副本连续失败多少次后摘除，以及摘除时长的基准和上限（秒，每次摘除翻倍）
+EJECT_AFTER_FAILURES = 3
+EJECT_BASE = 5.0
+EJECT_MAX = 120.0
+
+# 后台事件循环
+_loop = None
+_loop_thread = None
+_loop_lock = threading.Lock()
+
+# endpoint名称 -> endpoint配置
+_endpoints = {}
+
+
+def _get_loop():
+    """获取（必要时启动）后台事件循环"""
+    global _loop, _loop_thread
+
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            _loop_thread = threading.Thread(target=_loop.run_forever, name="llm-client-loop", daemon=True)
+            _loop_thread.start()
+    return _loop
+
+
+def run_coroutine(coro):
+    """在后台事件循环中执行协程，并同步等待结果"""
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
+
+
+def estimate_tokens(text):
+    """粗略估计文本的token数：ASCII字符约4个一个token，其余字符（中日韩、阿拉伯文等）按一个字符一个token"""
+    ascii_count = sum(1 for char in text if ord(char) < 128)
+    return ascii_count // 4 + (len(text) - ascii_count) + 1
+
+
+class TokenBucket:
+    """令牌桶：每秒补充rate个令牌，最多积攒capacity个"""
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount):
+        """还需要等待多少秒才能取出amount个令牌（超过容量的请求只需等到桶满）"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, amount):
+        """取出令牌，允许透支（透支部分由后续请求等待补回）"""
+        self._refill()
+        self.tokens -= amount
+
+
+class RateLimiter:
+    """
+    单个endpoint的限流器
+
+    - requests_per_second：每秒请求数，为None时不限制
+    - tokens_per_minute：每分钟token数（prompt估计值 + 实际生成数），为None时不限制
+    - pause()：服务端返回429时让该endpoint的所有请求暂停一段时间
+    """
+
+    def __init__(self, requests_per_second=None, tokens_per_minute=None):
+        self.requests_per_second = requests_per_second
+        self.tokens_per_minute = tokens_per_minute
+        self.requests = TokenBucket(requests_per_second, max(1.0, requests_per_second)) if requests_per_second else None
+        self.tokens = TokenBucket(tokens_per_minute / 60.0, tokens_per_minute) if tokens_per_minute else None
+        self.paused_until = 0.0
+        self._lock = None
+
+    def _wait_time(self, tokens):
+        wait = self.paused_until - time.monotonic()
+        if self.requests is not None:
+            wait = max(wait, self.requests.wait_time(1))
+        if self.tokens is not None:
+            wait = max(wait, self.tokens.wait_time(tokens))
+        return wait
+
+    async def acquire(self, tokens):
+        """等待直到可以发送一个约tokens个token的请求（按到达顺序放行）"""
+        # 锁只在事件循环线程中创建和使用
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                wait = self._wait_time(tokens)
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+            if self.requests is not None:
+                self.requests.take(1)
+            if self.tokens is not None:
+                self.tokens.take(tokens)
+
+    def consume(self, tokens):
+        """按实际用量修正token桶（tokens为负数时退还多扣的部分）"""
+        if self.tokens is not None and tokens:
+            self.tokens.take(tokens)
+
+    def pause(self, seconds):
+        """暂停整个endpoint seconds秒，返回是否延长了暂停时间"""
+        until = time.monotonic() + seconds
+        if until <= self.paused_until:
+            return False
+        self.paused_until = until
+        return True
+
+
+class Replica:
+    """endpoint的一个副本（一个base_url），记录在途请求数和健康状态"""
+
+    def __init__(self, endpoint_name, index, base_url, client):
+        self.endpoint_name = endpoint_name
+        self.index = index
+        self.base_url = base_url
+        self.client = client
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.ejections = 0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+
+    def available(self, now):
+        return now >= self.ejected_until
+
+    def record_success(self):
+        self.consecutive_failures = 0
+
+    def record_failure(self):
+        """记录一次可重试的失败（5xx、连接错误），连续失败过多时摘除"""
+        self.failures += 1
+        if not self.available(time.monotonic()):
+            # 摘除前就已发出的请求陆续失败，不再延长摘除时间
+            return
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= EJECT_AFTER_FAILURES:
+            self.consecutive_failures = 0
+            self.eject(min(EJECT_MAX, EJECT_BASE * 2 ** min(self.ejections, 10)))
+
+    def eject(self, seconds):
+        """暂时摘除seconds秒（已被摘除时只延长，不重复计数）"""
+        now = time.monotonic()
+        if not self.available(now):
+            self.ejected_until = max(self.ejected_until, now + seconds)
+            return
+        self.ejected_until = now + seconds
+        self.ejections += 1
+        print(f"🚫 {self.endpoint_name}: replica {self.base_url} ejected for {seconds:.1f} seconds")
+
+    def stats(self):
+        return {
+            "base_url": self.base_url,
+            "requests": self.requests,
+            "failures": self.failures,
+            "ejections": self.ejections,
+            "outstanding": self.outstanding,
+        }
+
+
+def parse_base_urls(base_url):
+    """把 base_url（字符串、逗号分隔的字符串或列表）解析成列表，未指定时为[None]"""
+    if not base_url:
+        return [None]
+    if isinstance(base_url, str):
+        base_url = base_url.split(",")
+    urls = [url.strip() for url in base_url if url and url.strip()]
+    return urls or [None]
+
+
+def register_endpoint(name, api_key, base_url=None, model_name="default-model", max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                      requests_per_second=None, tokens_per_minute=None, max_retries=DEFAULT_MAX_RETRIES):
+    """
+    注册（或覆盖）一个endpoint
+
+    Args:
+        name: endpoint名称，例如 "qwen"、"qwen_coder"、"tested_model"
+        api_key: OpenAI API密钥
+        base_url: API基础URL（可选，用于自定义端点）；多个相同副本用逗号分隔的字符串或列表
+        model_name: 模型名称
+        max_concurrency: 每个副本同时在途的最大请求数
+        requests_per_second: 每秒请求数上限，为None或0时不限制
+        tokens_per_minute: 每分钟token数上限，为None或0时不限制
+        max_retries: 单个prompt遇到429/5xx/连接错误时的最大重试次数
+
+    Returns:
+        第一个副本的AsyncOpenAI客户端
+    """
+    replicas = []
+    for index, url in enumerate(parse_base_urls(base_url)):
+        # 重试由本模块按prompt处理，关闭openai客户端自带的重试，避免两层重试叠加
+        if url:
+            client = AsyncOpenAI(api_key=api_key, base_url=url, max_retries=0, http_client=get_http_client())
+        else:
+            client = AsyncOpenAI(api_key=api_key, max_retries=0, http_client=get_http_client())
+        replicas.append(Replica(name, index, url or str(client.base_url), client))
+
+    _endpoints[name] = {
+        "name": name,
+        "client": replicas[0].client,
+        "replicas": replicas,
+        "next_replica": 0,
+        "model_name": model_name,
+        "max_concurrency": max(1, int(max_concurrency)),
+        "semaphore": None,
+        "limiter": RateLimiter(requests_per_second or None, tokens_per_minute or None),
+        "max_retries": max(0, int(max_retries)),
+        "retries": 0,
+        # 在途请求：缓存键 -> Future（只在事件循环线程中访问）
+        "inflight": {},
+        "calls": 0,
+        "deduplicated": 0,
+    }
+    return replicas[0].client
+
+
+def set_max_concurrency(name, max_concurrency):
+    """调整某个endpoint的并发上限（下一批请求生效）"""
+    endpoint = _endpoints[name]
+    endpoint["max_concurrency"] = max(1, int(max_concurrency))
+    endpoint["semaphore"] = None
+
+
+def set_rate_limit(name, requests_per_second=None, tokens_per_minute=None):
+    """调整某个endpoint的限流（下一批请求生效），参数为None或0时不限制"""
+    _endpoints[name]["limiter"] = RateLimiter(requests_per_second or None, tokens_per_minute or None)
+
+
+def get_endpoint(name):
+    """返回endpoint配置，未注册时返回None"""
+    return _endpoints.get(name)
+
+
+def _get_semaphore(endpoint):
+    # 信号量只在事件循环线程中创建和使用，因此不需要加锁；并发上限按副本数放大
+    if endpoint["semaphore"] is None:
+        endpoint["semaphore"] = asyncio.Semaphore(endpoint["max_concurrency"] * len(endpoint["replicas"]))
+    return endpoint["semaphore"]
+
+
+def _pick_replica(endpoint):
+    """选择在途请求最少的可用副本，并列时轮转；所有副本都被摘除时选最早恢复的一个"""
+    replicas = endpoint["replicas"]
+    if len(replicas) == 1:
+        return replicas[0]
+    now = time.monotonic()
+    candidates = [replica for replica in replicas if replica.available(now)]
+    if not candidates:
+        return min(replicas, key=lambda replica: replica.ejected_until)
+    start = endpoint["next_replica"]
+    endpoint["next_replica"] = (start + 1) % len(replicas)
+    return min(candidates, key=lambda replica: (replica.outstanding, (replica.index - start) % len(replicas)))
+
+
+def _retry_after(error):
+    """从错误响应头中读取服务端建议的等待秒数（retry-after-ms / retry-after），没有时返回None"""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            # HTTP日期格式
+            return parsedate_to_datetime(value).timestamp() - time.time()
+    except (TypeError, ValueError):
+        return None
+
+
+def _retry_delay(error, attempt):
+    """
+    判断错误是否值得重试，并给出等待时间
+
+    Returns:
+        等待秒数；不可重试的错误（4xx参数错误、鉴权失败等）返回None
+    """
+    if isinstance(error, APIStatusError):
+        if error.status_code != 429 and error.status_code < 500:
+            return None
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            return min(max(retry_after, 0.0), RETRY_AFTER_MAX)
+    elif not isinstance(error, APIConnectionError):
+        # APITimeoutError 是 APIConnectionError 的子类
+        return None
+    # 全抖动指数退避：在 [0, min(上限, 基准 * 2^attempt)] 内均匀取值
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+async def _request_with_retry(endpoint, messages, max_tokens, temperature, stage, response_format=None):
+    """限流后发送请求，失败时只重试这一个请求；用量按stage记录"""
+    limiter = endpoint["limiter"]
+    estimated = sum(estimate_tokens(message["content"]) for message in messages) + max_tokens
+    started = time.monotonic()
+    # 未指定时不传response_format，避免发送null
+    extra = {"response_format": response_format} if response_format is not None else {}
+    attempt = 0
+    while True:
+        await limiter.acquire(estimated)
+        replica = None
+        try:
+            async with _get_semaphore(endpoint):
+                replica = _pick_replica(endpoint)
+                replica.outstanding += 1
+                replica.requests += 1
+                request_started = time.monotonic()
+                try:
+                    response = await replica.client.chat.completions.create(
+                        model=endpoint["model_name"],
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        temperature=temperature,
+                        timeout=REQUEST_TIMEOUT,
+                        **extra
+                    )
+                finally:
+                    replica.outstanding -= 1
+        except Exception as e:
+            delay = _retry_delay(e, attempt)
+            rate_limited = isinstance(e, APIStatusError) and e.status_code == 429
+            if replica is not None and delay is not None:
+                if rate_limited and len(endpoint["replicas"]) > 1:
+                    # 多副本时只摘除被限流的副本，其余副本继续服务
+                    replica.eject(delay)
+                elif not rate_limited:
+                    replica.record_failure()
+            if delay is None or attempt >= endpoint["max_retries"]:
+                record_call(stage, endpoint["name"], "failed", wall_time=time.monotonic() - started, retries=attempt)
+                raise
+            attempt += 1
+            endpoint["retries"] += 1
+            if rate_limited and len(endpoint["replicas"]) == 1 and limiter.pause(delay):
+                print(f"⏳ {endpoint['name']} rate limited, pausing for {delay:.1f} seconds")
+            await asyncio.sleep(delay)
+            continue
+
+        finished = time.monotonic()
+        replica.record_success()
+        # 达到max_tokens被截断的回复
+        truncated = bool(response.choices) and response.choices[0].finish_reason == "length"
+
+        # 预扣的是 prompt估计值 + max_tokens，按实际用量退还多扣的部分
+        usage = getattr(response, "usage", None)
+        if usage is not None and getattr(usage, "total_tokens", None):
+            limiter.consume(usage.total_tokens - estimated)
+            record_call(stage, endpoint["name"], "api", prompt_tokens=usage.prompt_tokens or 0,
+                        completion_tokens=usage.completion_tokens or 0, latency=finished - request_started,
+                        wall_time=finished - started, retries=attempt, truncated=truncated)
+        else:
+            # 服务端没有返回usage时按字符数估计
+            content = response.choices[0].message.content or ""
+            record_call(stage, endpoint["name"], "api",
+                        prompt_tokens=sum(estimate_tokens(message["content"]) for message in messages),
+                        completion_tokens=estimate_tokens(content), latency=finished - request_started,
+                        wall_time=finished - started, retries=attempt, estimated=True, truncated=truncated)
+        return response
+
+
+async def _create_completion(endpoint, prompt, stage=None, max_tokens=None, response_format=None):
+    """发送单个prompt（优先查询响应缓存，相同请求在途时共享它的结果）"""
+    # (system前缀, user内容) 元组：固定的模板部分放在system消息中
+    system, prompt = prompt if isinstance(prompt, tuple) else ("", prompt)
+    messages = [
+        {"role": "system", "content": system},
+        {"role": "user", "content": prompt},
+    ]
+    max_tokens = max_tokens or DEFAULT_MAX_TOKENS
+    temperature = 0.00
+
+    stage = stage or endpoint["name"]
+    endpoint["calls"] += 1
+    cache = get_cache()
+    cache_key = make_cache_key(endpoint["name"], endpoint["model_name"], messages, max_tokens, temperature, response_format)
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            record_call(stage, endpoint["name"], "cache")
+            return cached
+
+    # 相同的请求已经在途：等待它的结果（成功或异常都共享），不再重复发送
+    inflight = endpoint["inflight"]
+    shared = inflight.get(cache_key)
+    if shared is not None:
+        endpoint["deduplicated"] += 1
+        record_call(stage, endpoint["name"], "shared")
+        return await asyncio.shield(shared)
+
+    task = asyncio.ensure_future(_complete_uncached(endpoint, cache_key, messages, max_tokens, temperature, stage,
+                                                    response_format))
+    inflight[cache_key] = task
+    try:
+        return await asyncio.shield(task)
+    finally:
+        if inflight.get(cache_key) is task:
+            del inflight[cache_key]
+
+
+async def _complete_uncached(endpoint, cache_key, messages, max_tokens, temperature, stage, response_format=None):
+    """缓存未命中时真正发送请求（批处理导出模式下改为记入导出文件）"""
+    cache = get_cache()
+    exporter = get_batch_export()
+    if exporter is not None:
+        # custom_id 即缓存键，导入结果后同一请求直接命中缓存
+        body = {
+            "model": endpoint["model_name"],
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+        }
+        if response_format is not None:
+            body["response_format"] = response_format
+        exporter.add(endpoint["name"], cache_key, body)
+        raise BatchPending(cache_key)
+
+    response = await _request_with_retry(endpoint, messages, max_tokens, temperature, stage, response_format)
+    content = response.choices[0].message.content.strip()
+
+    if cache is not None:
+        cache.put(cache_key, endpoint["name"], endpoint["model_name"], content)
+    return content
+
+
+async def _gather_completions(endpoint, prompts, return_exceptions=False, stage=None, max_tokens=None,
+                              response_format=None):
+    """并发发送一批prompt，结果顺序与输入一致；max_tokens为与prompts等长的列表"""
+    results = await asyncio.gather(
+        *[_create_completion(endpoint, prompt, stage, budget, response_format) for prompt, budget in zip(prompts, max_tokens)],
+        return_exceptions=True
+    )
+    if return_exceptions:
+        return results
+    # 等整批都结束后再抛出第一个错误，避免遗留仍在运行的请求
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results
+
+
+def call_endpoint(name, prompts, return_exceptions=False, stage=None, max_tokens=None, response_format=None):
+    """
+    同步调用某个endpoint
+
+    Args:
+        name: endpoint名称
+        prompts: 单个prompt或prompt列表，prompt为字符串或 (system前缀, user内容) 元组
+        return_exceptions: 为True时，重试后仍失败的prompt在结果中对应位置放异常对象，其余结果照常返回；
+            为False时整批结束后抛出第一个错误
+        stage: 用量统计中的阶段名称，未指定时按endpoint名称归类
+        max_tokens: 单个值或与prompts等长的列表（每个prompt的token预算），为None时用 DEFAULT_MAX_TOKENS
+        response_format: 结构化输出的要求（例如 {"type": "json_schema", ...}），为None时不传
+
+    Returns:
+        结果列表，顺序与输入prompt一致
+    """
+    endpoint = _endpoints.get(name)
+    if endpoint is None:
+        raise ValueError(f"Endpoint '{name}' not configured.")
+
+    if not isinstance(prompts, list):
+        prompts = [prompts]
+    if not prompts:
+        return []
+    if not isinstance(max_tokens, list):
+        max_tokens = [max_tokens] * len(prompts)
+
+    return run_coroutine(_gather_completions(endpoint, prompts, return_exceptions, stage, max_tokens, response_format))
+
+
+def dedup_stats():
+    """返回各endpoint累计的调用数和被合并的调用数：{endpoint名称: {"calls": ..., "deduplicated": ...}}"""
+    return {name: {"calls": endpoint["calls"], "deduplicated": endpoint["deduplicated"]}
+            for name, endpoint in _endpoints.items()}
+
+
+def get_retry_count(name):
+    """返回某个endpoint累计的重试次数"""
+    return _endpoints[name]["retries"]
+
+
+def replica_stats():
+    """返回各endpoint每个副本的统计信息：{endpoint名称: [{...}, ...]}"""
+    return {name: [replica.stats() for replica in endpoint["replicas"]] for name, endpoint in _endpoints.items()}
+
+
+def print_replica_stats():
+    """打印有多个副本的endpoint的路由统计"""
+    for name, replicas in replica_stats().items():
+        if len(replicas) < 2:
+            continue
+        print(f"🔀 {name} replicas:")
+        for stats in replicas:
+            print(f"   - {stats['base_url']}: {stats['requests']} requests, {stats['failures']} failures, "
+                  f"{stats['ejections']} ejections")
@@ -1,62 +1,52 @@
-from openai import OpenAI
+from LLM_APIs.llm_client import register_endpoint, call_endpoint, DEFAULT_MAX_CONCURRENCY, DEFAULT_MAX_RETRIES
+
+# endpoint名称
+ENDPOINT_NAME = "qwen_coder"
 
 # 全局变量存储OpenAI客户端
 _qwen_coder_client = None
 _qwen_coder_model_name = "qwen-coder-model"
 
-def set_qwen_coder_config(api_key, base_url=None, model_name="qwen-coder-model"):
+def set_qwen_coder_config(api_key, base_url=None, model_name="qwen-coder-model", max_concurrency=DEFAULT_MAX_CONCURRENCY,
+        requests_per_second=None, tokens_per_minute=None, max_retries=DEFAULT_MAX_RETRIES):
     """
     设置Qwen Coder API配置
     
     Args:
         api_key: OpenAI API密钥
-        base_url: API基础URL（可选，用于自定义端点）
+        base_url: API基础URL（可选，用于自定义端点；多个相同副本用逗号分隔）
         model_name: 模型名称（可选，默认为"qwen-coder-model"）
+        max_concurrency: 每个副本同时在途的最大请求数（可选）
+        requests_per_second: 每秒请求数上限（可选，默认不限制）
+        tokens_per_minute: 每分钟token数上限（可选，默认不限制）
+        max_retries: 单个prompt遇到429/5xx/连接错误时的最大重试次数（可选）
     """
     global _qwen_coder_client, _qwen_coder_model_name
     
-    if base_url:
-        _qwen_coder_client = OpenAI(api_key=api_key, base_url=base_url)
-    else:
-        _qwen_coder_client = OpenAI(api_key=api_key)
-    
+    _qwen_coder_client = register_endpoint(
+        ENDPOINT_NAME,
+        api_key=api_key,
+        base_url=base_url,
+        model_name=model_name,
+        max_concurrency=max_concurrency,
+        requests_per_second=requests_per_second,
+        tokens_per_minute=tokens_per_minute,
+        max_retries=max_retries
+    )
     _qwen_coder_model_name = model_name
 
-def call_coder_model(prompts):
-    """调用Qwen Coder模型API"""
+def call_coder_model(prompts, return_exceptions=False, stage=None, max_tokens=None):
+    """
+    调用Qwen Coder模型API（列表中的prompt并发发送，返回顺序与输入一致）
+
+    return_exceptions为True时，重试后仍失败的prompt在结果中对应位置放异常对象，不影响同批其他prompt
+    stage为用量统计中的阶段名称（generation、extraction-code、extraction-normal、judge）
+    max_tokens为单个值或每个prompt的token预算列表，为None时用默认值
+    """
     if _qwen_coder_client is None:
         raise ValueError("Qwen Coder not configured. Please call set_qwen_coder_config() first.")
 
     try:
-        # 如果prompts是列表，批量处理
-        if isinstance(prompts, list):
-            results = []
-            for single_prompt in prompts:
-                response = _qwen_coder_client.chat.completions.create(
-                    model=_qwen_coder_model_name,
-                    messages=[
-                        {"role": "system", "content": ""},
-                        {"role": "user", "content": single_prompt},
-                    ],
-                    max_tokens=8096,
-                    temperature=0.00,
-                    timeout=1800
-                )
-                results.append(response.choices[0].message.content.strip())
-            return results
-        else:
-            # 单个prompt
-            response = _qwen_coder_client.chat.completions.create(
-                model=_qwen_coder_model_name,
-                messages=[
-                    {"role": "system", "content": ""},
-                    {"role": "user", "content": prompts},
-                ],
-                max_tokens=8096,
-                temperature=0.00,
-                timeout=1800
-            )
-            return [response.choices[0].message.content.strip()]
-
+        return call_endpoint(ENDPOINT_NAME, prompts, return_exceptions, stage, max_tokens)
     except Exception as e:
         raise Exception(f"API call failed: {e}")
\ No newline at end of file
@@ -0,0 +1,151 @@
+"""
+LLM响应的持久化缓存
+
+所有调用都使用 temperature=0，同样的请求会得到同样的结果。
+缓存按 (endpoint, 模型名, messages, max_tokens, temperature[, response_format]) 的内容哈希寻址，存储在SQLite中：
+- 记录命中/未命中次数
+- 总大小超过上限时按最近访问时间淘汰（LRU）
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+CACHE_FILE_NAME = "llm_cache.sqlite3"
+DEFAULT_MAX_SIZE_MB = 2048
+
+# 全局缓存实例，未启用时为None
+_cache = None
+
+
+def make_cache_key(endpoint, model_name, messages, max_tokens, temperature, response_format=None):
+    """根据请求内容生成缓存键（没有response_format的请求与之前的缓存键相同）"""
+    fields = [endpoint, model_name, messages, max_tokens, temperature]
+    if response_format is not None:
+        fields.append(response_format)
+    payload = json.dumps(
+        fields,
+        ensure_ascii=False,
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """基于SQLite的LRU响应缓存"""
+
+    def __init__(self, cache_dir, max_size_mb=DEFAULT_MAX_SIZE_MB):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, CACHE_FILE_NAME)
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, endpoint TEXT, model TEXT, response TEXT, "
+            "size INTEGER, last_access REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON responses(last_access)")
+        self._conn.commit()
+        self._total_size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def get(self, key):
+        """查询缓存，未命中返回None"""
+        with self._lock:
+            row = self._conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            return row[0]
+
+    def put(self, key, endpoint, model_name, response):
+        """写入缓存，必要时淘汰最久未访问的条目"""
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            if old is not None:
+                self._total_size -= old[0]
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, endpoint, model, response, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, endpoint, model_name, response, size, time.time())
+            )
+            self._total_size += size
+            if self._total_size > self.max_size:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        # 淘汰到上限的90%，避免每次写入都触发淘汰
+        target = int(self.max_size * 0.9)
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY last_access ASC").fetchall()
+        for key, size in rows:
+            if self._total_size <= target:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._total_size -= size
+            self.evictions += 1
+
+    def stats(self):
+        """返回缓存统计信息"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "entries": entries,
+            "size_mb": round(self._total_size / 1024 / 1024, 2),
+            "max_size_mb": round(self.max_size / 1024 / 1024, 2),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def enable_cache(cache_dir, max_size_mb=DEFAULT_MAX_SIZE_MB):
+    """启用全局响应缓存"""
+    global _cache
+    if _cache is not None:
+        _cache.close()
+    _cache = ResponseCache(cache_dir, max_size_mb)
+    return _cache
+
+
+def disable_cache():
+    """关闭全局响应缓存"""
+    global _cache
+    if _cache is not None:
+        _cache.close()
+    _cache = None
+
+
+def get_cache():
+    """返回当前的全局缓存实例，未启用时返回None"""
+    return _cache
+
+
+def print_cache_stats():
+    """打印缓存统计信息"""
+    if _cache is None:
+        return
+    stats = _cache.stats()
+    print(f"🗄️  LLM cache: {stats['hits']} hits, {stats['misses']} misses "
+          f"(hit rate {stats['hit_rate']*100:.1f}%), {stats['entries']} entries, "
+          f"{stats['size_mb']}/{stats['max_size_mb']} MB, {stats['evictions']} evicted")
@@ -0,0 +1,172 @@
+"""
+LLM调用的用量统计：按阶段和endpoint累计token数、耗时、重试次数和费用
+
+每次调用由 llm_client 记录一条，阶段由调用方传入（generation、extraction-code、extraction-normal、judge），
+未指定阶段时按endpoint名称归类。调用的来源分为四种：
+- api：实际发往服务端（prompt/completion token取自响应的usage，服务端没有返回时按字符数估计）
+- cache：命中响应缓存
+- shared：与内容相同的在途请求共享结果
+- failed：重试后仍失败
+
+每轮结束后用 take_usage() 取出本轮的累计值并清零，写成 round_N_usage.json，与 round_N_stats.json 放在同一目录。
+"""
+
+import json
+import os
+import threading
+
+_lock = threading.Lock()
+
+# (阶段, endpoint名称) -> 累计值
+_usage = {}
+
+# endpoint名称 -> (每百万prompt token价格, 每百万completion token价格)
+_prices = {}
+
+
+def _new_entry():
+    return {
+        "calls": 0,
+        "api_calls": 0,
+        "cache_hits": 0,
+        "shared": 0,
+        "failed": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        # usage由估计得到的调用数
+        "estimated_usage": 0,
+        "retries": 0,
+        # 达到max_tokens被截断的回复数
+        "truncated": 0,
+        # 成功那次请求的耗时（秒）
+        "latencies": [],
+        # 从排队、限流等待到拿到结果（含重试）的总耗时（秒）
+        "wall_time": 0.0,
+    }
+
+
+def set_token_price(endpoint_name, prompt_price=0.0, completion_price=0.0):
+    """设置endpoint的价格（每百万token），都为0时不计算费用"""
+    _prices[endpoint_name] = (float(prompt_price or 0), float(completion_price or 0))
+
+
+def record_call(stage, endpoint_name, source, prompt_tokens=0, completion_tokens=0, latency=None, wall_time=0.0,
+                retries=0, estimated=False, truncated=False):
+    """
+    记录一次调用
+
+    Args:
+        stage: 阶段名称
+        endpoint_name: endpoint名称
+        source: "api"、"cache"、"shared" 或 "failed"
+        prompt_tokens / completion_tokens: token数（只对api调用有意义）
+        latency: 成功那次请求的耗时（秒）
+        wall_time: 含排队、限流等待和重试的总耗时（秒）
+        retries: 重试次数
+        estimated: token数是否为估计值
+        truncated: 回复是否因达到max_tokens被截断
+    """
+    with _lock:
+        entry = _usage.get((stage, endpoint_name))
+        if entry is None:
+            entry = _usage[(stage, endpoint_name)] = _new_entry()
+        entry["calls"] += 1
+        if source == "api":
+            entry["api_calls"] += 1
+        elif source == "cache":
+            entry["cache_hits"] += 1
+        elif source == "shared":
+            entry["shared"] += 1
+        else:
+            entry["failed"] += 1
+        entry["prompt_tokens"] += prompt_tokens
+        entry["completion_tokens"] += completion_tokens
+        entry["estimated_usage"] += int(estimated)
+        entry["retries"] += retries
+        entry["truncated"] += int(truncated)
+        if latency is not None:
+            entry["latencies"].append(latency)
+        entry["wall_time"] += wall_time
+
+
+def take_usage():
+    """取出目前的累计值并清零：{(阶段, endpoint名称): {...}}"""
+    global _usage
+    with _lock:
+        usage, _usage = _usage, {}
+    return usage
+
+
+def _percentile(values, fraction):
+    index = min(len(values) - 1, int(round(fraction * (len(values) - 1))))
+    return values[index]
+
+
+def _summarize(entries, endpoint_names):
+    """把若干条累计值合并成一份汇总"""
+    summary = _new_entry()
+    cost = 0.0
+    for entry, endpoint_name in zip(entries, endpoint_names):
+        for key in summary:
+            summary[key] += entry[key]
+        prompt_price, completion_price = _prices.get(endpoint_name, (0.0, 0.0))
+        cost += (entry["prompt_tokens"] * prompt_price + entry["completion_tokens"] * completion_price) / 1e6
+    latencies = sorted(summary.pop("latencies"))
+    summary["total_tokens"] = summary["prompt_tokens"] + summary["completion_tokens"]
+    summary["avg_prompt_tokens"] = round(summary["prompt_tokens"] / summary["api_calls"], 1) if summary["api_calls"] else 0
+    summary["latency_avg"] = round(sum(latencies) / len(latencies), 4) if latencies else 0.0
+    summary["latency_p50"] = round(_percentile(latencies, 0.5), 4) if latencies else 0.0
+    summary["latency_p95"] = round(_percentile(latencies, 0.95), 4) if latencies else 0.0
+    summary["latency_max"] = round(latencies[-1], 4) if latencies else 0.0
+    summary["wall_time"] = round(summary["wall_time"], 4)
+    summary["cost"] = round(cost, 6)
+    return summary
+
+
+def usage_report(usage):
+    """
+    按阶段、endpoint和总计汇总 take_usage() 的结果
+
+    Returns:
+        {"stages": {阶段: {...}}, "endpoints": {endpoint名称: {...}}, "total": {...}}
+    """
+    stages = {}
+    endpoints = {}
+    for (stage, endpoint_name), entry in usage.items():
+        stages.setdefault(stage, []).append((entry, endpoint_name))
+        endpoints.setdefault(endpoint_name, []).append((entry, endpoint_name))
+
+    def summarize(pairs):
+        return _summarize([entry for entry, _ in pairs], [name for _, name in pairs])
+
+    return {
+        "stages": {stage: summarize(pairs) for stage, pairs in stages.items()},
+        "endpoints": {name: summarize(pairs) for name, pairs in endpoints.items()},
+        "total": summarize([(entry, endpoint_name) for (_, endpoint_name), entry in usage.items()]),
+    }
+
+
+def write_usage_report(output_dir, round_num, report):
+    """把一轮的用量汇总写到 round_N_usage.json，返回文件路径"""
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"round_{round_num}_usage.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"round": round_num, **report}, f, ensure_ascii=False, indent=4)
+    return path
+
+
+def print_usage_stats(report):
+    """打印各阶段的用量汇总"""
+    for stage, summary in list(report["stages"].items()) + [("total", report["total"])]:
+        if not summary["calls"]:
+            continue
+        line = (f"💰 {stage}: {summary['calls']} calls ({summary['api_calls']} API, {summary['cache_hits']} cached, "
+                f"{summary['shared']} shared, {summary['failed']} failed), "
+                f"{summary['prompt_tokens']} prompt + {summary['completion_tokens']} completion tokens, "
+                f"latency avg {summary['latency_avg']:.2f}s / p95 {summary['latency_p95']:.2f}s, "
+                f"{summary['retries']} retries")
+        if summary["truncated"]:
+            line += f", {summary['truncated']} truncated at max_tokens"
+        if summary["cost"]:
+            line += f", ${summary['cost']:.4f}"
+        print(line)
@@ -0,0 +1,211 @@
+"""
+多轮评估的断点续跑
+
+每轮在输出目录下维护一个只追加的日志 round_N.journal.jsonl，每完成一项工作就追加一行：
+- {"type": "response", "item": 条目键, "model_response": ...}
+- {"type": "extraction", "item": 条目键, "key": 抓取对象, "result": ..., "code": ...}
+- {"type": "eval", "item": 条目键, "point_id": ..., "rule": ..., "question": ..., "eval_result": ..., "eval_explanation": ..., "eval_method": ...}
+
+使用 --resume 重跑时先读取日志，把已完成的结果回填到数据中，对应的API调用和规则评估会被跳过。
+未打开日志时，所有函数都是空操作。
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+# 当前轮次的日志，未启用时为None
+_journal = None
+
+EVAL_FIELDS = ("eval_result", "eval_explanation", "eval_method")
+
+
+# 子问题中定义评估内容的字段（评估结果等字段会在评估过程中写入，不参与计算键）
+SUB_QUESTION_FIELDS = ("point_id", "question", "rule", "dep", "corresponding_part")
+
+
+def content_key(item):
+    """根据条目内容计算键：问题、类别、抓取对象和所有子问题的定义（不依赖条目在数据中的位置）"""
+    sub_questions = [
+        {field: sub_q.get(field) for field in SUB_QUESTION_FIELDS}
+        for sub_q in item.get("sub_questions", [])
+    ]
+    payload = json.dumps(
+        [item.get("og_question", item.get("question")), item.get("category"), item.get("corresponding_parts"),
+         sub_questions],
+        ensure_ascii=False,
+        sort_keys=True
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def item_key(item):
+    """
+    条目在日志中的键：内容键；内容完全相同的条目（例如不同数据文件中的同一题）
+    按在本轮数据中出现的顺序加上序号，由 open_journal 分配
+    """
+    if _journal is not None:
+        key = _journal.item_keys.get(id(item))
+        if key is not None:
+            return key
+    return content_key(item)
+
+
+def sub_question_key(sub_question):
+    """子问题评估记录的键：point_id 加上子问题的规则和问题文本"""
+    return (sub_question["point_id"], sub_question.get("rule"), sub_question.get("question"))
+
+
+def journal_path(output_dir, round_num):
+    return os.path.join(output_dir, f"round_{round_num}.journal.jsonl")
+
+
+class Journal:
+    """单轮的只追加日志"""
+
+    def __init__(self, path, resume=False):
+        self.path = path
+        self.responses = {}
+        self.extractions = {}
+        self.evals = {}
+        # id(条目) -> 日志键，见 assign_item_keys
+        self.item_keys = {}
+        self.restored = {"response": 0, "extraction": 0, "eval": 0}
+        self._lock = threading.Lock()
+
+        if resume and os.path.exists(path):
+            self._load()
+        mode = "a" if resume else "w"
+        self._file = open(path, mode, encoding="utf-8")
+
+    def _load(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # 进程被中断时最后一行可能不完整
+                    continue
+                if record["type"] == "response":
+                    self.responses[record["item"]] = record["model_response"]
+                elif record["type"] == "extraction":
+                    self.extractions[(record["item"], record["key"])] = record
+                elif record["type"] == "eval":
+                    self.evals[(record["item"], record["point_id"], record.get("rule"), record.get("question"))] = record
+        print(f"📒 Loaded journal {self.path}: {len(self.responses)} responses, "
+              f"{len(self.extractions)} extractions, {len(self.evals)} evaluations")
+
+    def append(self, record):
+        # 生成的提取代码可能返回无法序列化的对象，统一转成字符串，避免中断评估
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def assign_item_keys(self, items):
+        """按条目在本轮数据中的顺序分配日志键，内容相同的第2、3……个条目加上序号"""
+        seen = {}
+        for item in items:
+            key = content_key(item)
+            count = seen.get(key, 0)
+            seen[key] = count + 1
+            self.item_keys[id(item)] = key if count == 0 else f"{key}#{count}"
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def open_journal(output_dir, round_num, resume=False, items=None):
+    """
+    打开某一轮的日志；resume为False时清空旧日志
+
+    Args:
+        items: 本轮的全部条目（顺序需与续跑时相同），用于区分内容完全相同的条目
+    """
+    global _journal
+    close_journal()
+    _journal = Journal(journal_path(output_dir, round_num), resume)
+    if items is not None:
+        _journal.assign_item_keys(items)
+    return _journal
+
+
+def close_journal():
+    """关闭当前日志，并打印本轮恢复的数量"""
+    global _journal
+    if _journal is None:
+        return
+    restored = _journal.restored
+    if any(restored.values()):
+        print(f"📒 Restored from journal: {restored['response']} responses, "
+              f"{restored['extraction']} extractions, {restored['eval']} evaluations")
+    _journal.close()
+    _journal = None
+
+
+def restore_response(item):
+    """如果日志中已有该条目的模型回复，回填并返回True"""
+    if _journal is None:
+        return False
+    key = item_key(item)
+    if key not in _journal.responses:
+        return False
+    item["model_response"] = _journal.responses[key]
+    _journal.restored["response"] += 1
+    return True
+
+
+def record_response(item):
+    if _journal is None:
+        return
+    _journal.append({"type": "response", "item": item_key(item), "model_response": item["model_response"]})
+
+
+def restore_extraction(item, key):
+    """如果日志中已有该抓取对象的结果，回填并返回True"""
+    if _journal is None:
+        return False
+    record = _journal.extractions.get((item_key(item), key))
+    if record is None:
+        return False
+    item.setdefault("extraction_results", {})[key] = record["result"]
+    if record.get("code") is not None:
+        item.setdefault("extraction_code", {})[key] = record["code"]
+    _journal.restored["extraction"] += 1
+    return True
+
+
+def record_extraction(item, key, result, code=None):
+    if _journal is None:
+        return
+    record = {"type": "extraction", "item": item_key(item), "key": key, "result": result}
+    if code is not None:
+        record["code"] = code
+    _journal.append(record)
+
+
+def restore_eval(sub_question, item):
+    """如果日志中已有该子问题的评估结果，回填并返回True"""
+    if _journal is None:
+        return False
+    record = _journal.evals.get((item_key(item),) + sub_question_key(sub_question))
+    if record is None:
+        return False
+    for field in EVAL_FIELDS:
+        if field in record:
+            sub_question[field] = record[field]
+    _journal.restored["eval"] += 1
+    return True
+
+
+def record_eval(sub_question, item):
+    if _journal is None:
+        return
+    point_id, rule, question = sub_question_key(sub_question)
+    record = {"type": "eval", "item": item_key(item), "point_id": point_id, "rule": rule, "question": question}
+    for field in EVAL_FIELDS:
+        if field in sub_question:
+            record[field] = sub_question[field]
+    _journal.append(record)
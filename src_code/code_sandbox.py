@@ -0,0 +1,258 @@
+"""
+在工作进程中执行Qwen Coder生成的提取代码（--code_workers）
+
+生成的 extract_info_list 以前在主进程中 exec，一个死循环或灾难性回溯的正则就能让整个评估卡住。现在：
+- 代码在常驻的工作进程中执行，多个任务并行
+- 每个任务有墙钟超时：超时后直接杀掉工作进程并补一个新的（C实现的正则匹配无法被信号打断，只能杀进程）
+- 每个任务有CPU时间上限（RLIMIT_CPU软限制，超出时抛出异常），工作进程有内存上限（RLIMIT_AS）
+- 代码在受限的命名空间中执行：去掉 open、exec 等I/O和动态执行的内置函数，只能导入 ALLOWED_MODULES 中的模块
+
+受限命名空间只是防止生成代码误操作，不是安全边界；隔离主要靠独立进程和资源限制。
+"""
+
+import builtins
+import multiprocessing
+import queue
+import re
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import resource
+except ImportError:
+    # 没有resource模块的系统（Windows）上不设置CPU和内存限制，只有墙钟超时
+    resource = None
+
+# 默认的工作进程数、单个任务的超时（秒）和每个工作进程可额外使用的内存（MB）
+DEFAULT_CODE_WORKERS = 4
+DEFAULT_CODE_TIMEOUT = 5.0
+DEFAULT_CODE_MEMORY_MB = 512
+
+# 生成代码可以导入的模块（纯计算的标准库模块）
+ALLOWED_MODULES = frozenset({
+    "re", "json", "string", "collections", "itertools", "functools", "math", "unicodedata", "typing", "textwrap",
+    "ast", "operator", "copy", "bisect", "heapq", "statistics", "decimal", "fractions", "html", "difflib", "enum",
+    "dataclasses", "datetime", "random",
+})
+
+# 生成代码不能使用的内置函数：文件和终端I/O、动态执行代码、退出进程（其余内置函数和异常与原来在主进程中执行时相同）
+BLOCKED_BUILTINS = frozenset({
+    "open", "input", "breakpoint", "help", "exit", "quit", "exec", "eval", "compile", "__import__", "__loader__",
+    "__spec__",
+})
+
+# 进程池，未启动时为None（在主进程中执行，即原来的方式）
+_sandbox = None
+
+
+def _restricted_import(name, globals=None, locals=None, fromlist=(), level=0):
+    if level != 0 or name.split(".")[0] not in ALLOWED_MODULES:
+        raise ImportError(f"import of '{name}' is not allowed in extraction code")
+    return builtins.__import__(name, globals, locals, fromlist, level)
+
+
+def _restricted_globals():
+    safe_builtins = {name: value for name, value in vars(builtins).items() if name not in BLOCKED_BUILTINS}
+    safe_builtins["__import__"] = _restricted_import
+    # 生成代码里的调试输出直接丢弃
+    safe_builtins["print"] = lambda *args, **kwargs: None
+    # 提示词中的示例代码直接使用 re，不写import
+    return {"__builtins__": safe_builtins, "__name__": "extraction_code", "re": re}
+
+
+def run_extraction_code(code_in_str, model_response):
+    """在受限命名空间中执行生成的代码，返回 extract_info_list(model_response) 的结果"""
+    code_in_str = re.sub(r'```python(.*?)```', r'\1', code_in_str, flags=re.DOTALL)
+    namespace = _restricted_globals()
+    exec(code_in_str, namespace)
+    return namespace["extract_info_list"](model_response)
+
+
+def _cpu_exceeded(signum, frame):
+    raise TimeoutError("CPU time limit exceeded")
+
+
+def _limit_memory(memory_mb):
+    """在工作进程当前地址空间的基础上最多再使用memory_mb"""
+    if resource is None or not memory_mb:
+        return
+    try:
+        with open("/proc/self/statm") as f:
+            current = int(f.read().split()[0]) * resource.getpagesize()
+    except (OSError, ValueError):
+        current = 0
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    limit = current + int(memory_mb * 1024 * 1024)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _limit_cpu(cpu_seconds):
+    """把CPU时间的软限制设为已用时间 + cpu_seconds（硬限制不动，否则之后无法再调高）"""
+    if resource is None or not cpu_seconds:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = int(usage.ru_utime + usage.ru_stime + cpu_seconds) + 1
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _worker_main(conn, memory_mb, cpu_seconds):
+    """工作进程：逐个接收 (代码, 模型回复)，返回 ("ok", 结果) 或 ("error", 错误信息)，收到None时退出"""
+    # 中断由主进程处理，工作进程在主进程退出时随之结束
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if resource is not None:
+        signal.signal(signal.SIGXCPU, _cpu_exceeded)
+    _limit_memory(memory_mb)
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        code_in_str, model_response = task
+        try:
+            _limit_cpu(cpu_seconds)
+            result = ("ok", run_extraction_code(code_in_str, model_response))
+        except BaseException as e:
+            result = ("error", f"{type(e).__name__}: {e}")
+        try:
+            conn.send(result)
+        except Exception as e:
+            # 结果无法序列化
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+class CodeSandbox:
+    """常驻的工作进程池，每个任务独占一个工作进程，超时的工作进程被杀掉并替换"""
+
+    def __init__(self, workers=DEFAULT_CODE_WORKERS, timeout=DEFAULT_CODE_TIMEOUT, memory_mb=DEFAULT_CODE_MEMORY_MB):
+        self.workers = workers
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        # 主进程中已有llm_client的事件循环线程和流水线线程，直接fork可能继承被其他线程持有的锁；
+        # 改用forkserver（由单线程的服务进程fork出工作进程），不支持时用spawn
+        self.method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        self._context = multiprocessing.get_context(self.method)
+        if self.method == "forkserver":
+            # 服务进程只预先导入本模块，不导入主程序（主程序导入时会初始化各个客户端）
+            self._context.set_forkserver_preload([__name__])
+        self._idle = queue.Queue()
+        for _ in range(workers):
+            self._idle.put(self._start_worker())
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="code-sandbox")
+        self._lock = threading.Lock()
+        self._stats = {"tasks": 0, "errors": 0, "timeouts": 0, "restarts": 0}
+
+    def _start_worker(self):
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(target=_worker_main, args=(child_conn, self.memory_mb, self.timeout), daemon=True)
+        process.start()
+        child_conn.close()
+        return process, parent_conn
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def _run_one(self, task):
+        process, conn = self._idle.get()
+        self._count("tasks")
+        try:
+            conn.send(task)
+            if conn.poll(self.timeout):
+                status, value = conn.recv()
+            else:
+                status, value = "error", f"timed out after {self.timeout:g} seconds"
+                self._count("timeouts")
+                process, conn = self._restart_worker(process, conn)
+        except (EOFError, OSError) as e:
+            # 工作进程意外退出（例如超出内存被系统杀掉）
+            status, value = "error", f"worker exited: {e!r}"
+            process, conn = self._restart_worker(process, conn)
+        finally:
+            self._idle.put((process, conn))
+        if status != "ok":
+            self._count("errors")
+        return status, value
+
+    def _restart_worker(self, process, conn):
+        process.kill()
+        process.join()
+        conn.close()
+        self._count("restarts")
+        return self._start_worker()
+
+    def run(self, tasks):
+        """
+        并行执行一批 (代码, 模型回复)
+
+        Returns:
+            与tasks顺序一致的 (状态, 结果或错误信息) 列表，状态为 "ok" 或 "error"
+        """
+        return list(self._executor.map(self._run_one, tasks))
+
+    def close(self):
+        self._executor.shutdown()
+        while not self._idle.empty():
+            process, conn = self._idle.get()
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+            process.join(1)
+            if process.is_alive():
+                process.kill()
+                process.join()
+            conn.close()
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+
+def start_code_workers(workers=DEFAULT_CODE_WORKERS, timeout=DEFAULT_CODE_TIMEOUT, memory_mb=DEFAULT_CODE_MEMORY_MB):
+    """
+    启动执行提取代码的进程池
+
+    Args:
+        workers: 工作进程数，小于等于0时不启动（在主进程中执行）
+        timeout: 单个任务的墙钟超时和CPU时间上限（秒）
+        memory_mb: 每个工作进程可额外使用的内存（MB），0表示不限制
+    """
+    global _sandbox
+    stop_code_workers()
+    if workers <= 0:
+        return
+    _sandbox = CodeSandbox(workers, timeout, memory_mb)
+    print(f"🧰 Started {workers} extraction code workers ({_sandbox.method}, {timeout:g}s timeout"
+          + (f", {memory_mb} MB memory limit)" if memory_mb else ")"))
+
+
+def stop_code_workers():
+    """关闭执行提取代码的进程池"""
+    global _sandbox
+    if _sandbox is None:
+        return
+    _sandbox.close()
+    _sandbox = None
+
+
+def get_code_sandbox():
+    """返回当前的进程池，未启动时返回None"""
+    return _sandbox
+
+
+def print_code_sandbox_stats():
+    """打印提取代码的执行统计"""
+    if _sandbox is None:
+        return
+    stats = _sandbox.stats()
+    if stats["tasks"]:
+        print(f"🧰 Extraction code: {stats['tasks']} runs, {stats['errors']} errors, {stats['timeouts']} timeouts, "
+              f"{stats['restarts']} worker restarts")
@@ -16,20 +16,67 @@ else:
     # 尝试从当前工作目录加载
     load_dotenv()
 
+# *_BASE_URL 可以是逗号分隔的多个相同副本，请求优先发往在途请求最少的副本
+
 # Qwen API配置
 QWEN_API_KEY = os.getenv('QWEN_API_KEY', 'your-qwen-api-key')
 QWEN_BASE_URL = os.getenv('QWEN_BASE_URL', 'http://10.164.51.197:8080')
 QWEN_MODEL = os.getenv('QWEN_MODEL', 'qwen-model')
+QWEN_MAX_CONCURRENCY = int(os.getenv('QWEN_MAX_CONCURRENCY', '64'))
+# 限流：每秒请求数 / 每分钟token数，0表示不限制
+QWEN_REQUESTS_PER_SECOND = float(os.getenv('QWEN_REQUESTS_PER_SECOND', '0'))
+QWEN_TOKENS_PER_MINUTE = int(os.getenv('QWEN_TOKENS_PER_MINUTE', '0'))
+# 价格：每百万prompt / completion token，用于统计费用，0表示不计费
+QWEN_PROMPT_PRICE = float(os.getenv('QWEN_PROMPT_PRICE', '0'))
+QWEN_COMPLETION_PRICE = float(os.getenv('QWEN_COMPLETION_PRICE', '0'))
 
 # Qwen Coder API配置
 QWEN_CODER_API_KEY = os.getenv('QWEN_CODER_API_KEY', 'your-qwen-coder-api-key')
 QWEN_CODER_BASE_URL = os.getenv('QWEN_CODER_BASE_URL', 'http://10.166.176.56:8080')
 QWEN_CODER_MODEL = os.getenv('QWEN_CODER_MODEL', 'qwen-coder-model')
+QWEN_CODER_MAX_CONCURRENCY = int(os.getenv('QWEN_CODER_MAX_CONCURRENCY', '64'))
+# 限流：每秒请求数 / 每分钟token数，0表示不限制
+QWEN_CODER_REQUESTS_PER_SECOND = float(os.getenv('QWEN_CODER_REQUESTS_PER_SECOND', '0'))
+QWEN_CODER_TOKENS_PER_MINUTE = int(os.getenv('QWEN_CODER_TOKENS_PER_MINUTE', '0'))
+# 价格：每百万prompt / completion token，用于统计费用，0表示不计费
+QWEN_CODER_PROMPT_PRICE = float(os.getenv('QWEN_CODER_PROMPT_PRICE', '0'))
+QWEN_CODER_COMPLETION_PRICE = float(os.getenv('QWEN_CODER_COMPLETION_PRICE', '0'))
 
 # Tested Model API配置
 TESTED_MODEL_API_KEY = os.getenv('TESTED_MODEL_API_KEY', 'your-tested-model-api-key')
 TESTED_MODEL_BASE_URL = os.getenv('TESTED_MODEL_BASE_URL', 'http://10.164.51.197:8080')
 TESTED_MODEL_NAME = os.getenv('TESTED_MODEL_NAME', 'default-model')
+TESTED_MODEL_MAX_CONCURRENCY = int(os.getenv('TESTED_MODEL_MAX_CONCURRENCY', '64'))
+# 限流：每秒请求数 / 每分钟token数，0表示不限制
+TESTED_MODEL_REQUESTS_PER_SECOND = float(os.getenv('TESTED_MODEL_REQUESTS_PER_SECOND', '0'))
+TESTED_MODEL_TOKENS_PER_MINUTE = int(os.getenv('TESTED_MODEL_TOKENS_PER_MINUTE', '0'))
+# 价格：每百万prompt / completion token，用于统计费用，0表示不计费
+TESTED_MODEL_PROMPT_PRICE = float(os.getenv('TESTED_MODEL_PROMPT_PRICE', '0'))
+TESTED_MODEL_COMPLETION_PRICE = float(os.getenv('TESTED_MODEL_COMPLETION_PRICE', '0'))
+
+# 单个prompt遇到429/5xx/连接错误时的最大重试次数
+LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', '5'))
+
+# 三个endpoint共用的HTTP连接池：每个源站的最大连接数、keep-alive连接数、空闲过期秒数、是否启用HTTP/2
+LLM_MAX_CONNECTIONS_PER_HOST = int(os.getenv('LLM_MAX_CONNECTIONS_PER_HOST', '256'))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv('LLM_MAX_KEEPALIVE_CONNECTIONS', '256'))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv('LLM_KEEPALIVE_EXPIRY', '60'))
+LLM_HTTP2 = os.getenv('LLM_HTTP2', '0').lower() in ('1', 'true', 'yes')
+
+# 提取和评估prompt的排布：inline（整个模板一条user消息）或 prefix（固定部分放进system消息，便于前缀缓存）
+LLM_PROMPT_LAYOUT = os.getenv('LLM_PROMPT_LAYOUT', 'inline')
+
+# token预算：评估回复的max_tokens；提取回复的max_tokens为模型回复token数的倍数（0表示不限制）
+LLM_JUDGE_MAX_TOKENS = int(os.getenv('LLM_JUDGE_MAX_TOKENS', '1024'))
+LLM_EXTRACTION_TOKEN_RATIO = float(os.getenv('LLM_EXTRACTION_TOKEN_RATIO', '1.5'))
+
+# 评估方式：analysis（自由格式分析）、json（结构化输出 {"verdict", "reason"}）、verdict（只输出verdict）
+LLM_JUDGE_MODE = os.getenv('LLM_JUDGE_MODE', 'analysis')
+
+# 执行生成的提取代码的工作进程数（0表示在主进程中执行）、单个任务的超时秒数、每个工作进程的内存上限（MB）
+CODE_WORKERS = int(os.getenv('CODE_WORKERS', '4'))
+CODE_TIMEOUT = float(os.getenv('CODE_TIMEOUT', '5'))
+CODE_MEMORY_MB = int(os.getenv('CODE_MEMORY_MB', '512'))
 
 def print_config():
     """打印当前配置（隐藏敏感信息）"""
@@ -37,11 +84,17 @@ def print_config():
     print(f"   - Qwen API Key: {'*' * 10}{QWEN_API_KEY[-4:] if len(QWEN_API_KEY) > 4 else '****'}")
     print(f"   - Qwen Base URL: {QWEN_BASE_URL}")
     print(f"   - Qwen Model: {QWEN_MODEL}")
+    print(f"   - Qwen Max Concurrency: {QWEN_MAX_CONCURRENCY}")
+    print(f"   - Qwen Rate Limit: {QWEN_REQUESTS_PER_SECOND or 'unlimited'} req/s, {QWEN_TOKENS_PER_MINUTE or 'unlimited'} tokens/min")
     print()
     print(f"   - Qwen Coder API Key: {'*' * 10}{QWEN_CODER_API_KEY[-4:] if len(QWEN_CODER_API_KEY) > 4 else '****'}")
     print(f"   - Qwen Coder Base URL: {QWEN_CODER_BASE_URL}")
     print(f"   - Qwen Coder Model: {QWEN_CODER_MODEL}")
+    print(f"   - Qwen Coder Max Concurrency: {QWEN_CODER_MAX_CONCURRENCY}")
+    print(f"   - Qwen Coder Rate Limit: {QWEN_CODER_REQUESTS_PER_SECOND or 'unlimited'} req/s, {QWEN_CODER_TOKENS_PER_MINUTE or 'unlimited'} tokens/min")
     print()
     print(f"   - Tested Model API Key: {'*' * 10}{TESTED_MODEL_API_KEY[-4:] if len(TESTED_MODEL_API_KEY) > 4 else '****'}")
     print(f"   - Tested Model Base URL: {TESTED_MODEL_BASE_URL}")
-    print(f"   - Tested Model Name: {TESTED_MODEL_NAME}")
\ No newline at end of file
+    print(f"   - Tested Model Name: {TESTED_MODEL_NAME}")
+    print(f"   - Tested Model Max Concurrency: {TESTED_MODEL_MAX_CONCURRENCY}")
+    print(f"   - Tested Model Rate Limit: {TESTED_MODEL_REQUESTS_PER_SECOND or 'unlimited'} req/s, {TESTED_MODEL_TOKENS_PER_MINUTE or 'unlimited'} tokens/min")
\ No newline at end of file
@@ -0,0 +1,102 @@
+"""
+可复用的提取程序（--reuse_extraction_code）
+
+#CODE# 类型的抓取对象原来每个 (条目, 抓取对象) 都让Qwen Coder写一段新的 extract_info_list，
+而同一条抓取指令会在很多条目、每一轮中重复出现。启用后：
+- 每个不同的 (category, 抓取指令) 只生成一个程序：用其中一个条目的prompt生成，再在几个样例回复上验证
+- 验证通过的程序保存在磁盘上（每个程序一个JSON文件），之后的条目和轮次直接执行，不再调用模型
+- 程序对某条回复抛出异常或返回空结果时，这条回复退回到原来的逐条生成
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+# 验证新程序时使用的样例回复数
+VALIDATION_SAMPLES = 3
+
+# 当前的程序库，未启用时为None
+_program_store = None
+
+
+def program_key(category, instruction):
+    """根据 category 和抓取指令生成程序的键"""
+    payload = json.dumps([category, instruction], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def is_usable_result(result):
+    """程序的结果是否可以直接使用：没有失败，且不是空结果"""
+    if isinstance(result, str):
+        return not result.startswith("INVALID") and bool(result.strip())
+    return bool(result)
+
+
+class ProgramStore:
+    """保存在磁盘上的提取程序，每个程序一个JSON文件"""
+
+    def __init__(self, program_dir):
+        self.program_dir = program_dir
+        os.makedirs(program_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        # 键 -> 程序记录，None表示磁盘上没有
+        self._programs = {}
+        self._stats = {"reused": 0, "generated": 0, "rejected": 0, "fallbacks": 0}
+
+    def _path(self, key):
+        return os.path.join(self.program_dir, f"{key}.json")
+
+    def get(self, key):
+        """返回程序代码，没有时返回None"""
+        with self._lock:
+            if key not in self._programs:
+                try:
+                    with open(self._path(key), "r", encoding="utf-8") as f:
+                        self._programs[key] = json.load(f)
+                except (OSError, ValueError):
+                    self._programs[key] = None
+            record = self._programs[key]
+        return record["code"] if record else None
+
+    def put(self, key, category, instruction, code, samples):
+        """保存验证通过的程序（先写临时文件再改名，避免留下写了一半的文件）"""
+        record = {"category": category, "instruction": instruction, "code": code, "validated_samples": samples}
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._programs[key] = record
+
+    def count(self, key, amount=1):
+        with self._lock:
+            self._stats[key] += amount
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+
+def enable_program_reuse(program_dir):
+    """启用可复用的提取程序"""
+    global _program_store
+    _program_store = ProgramStore(program_dir)
+    return _program_store
+
+
+def get_program_store():
+    """返回当前的程序库，未启用时返回None"""
+    return _program_store
+
+
+def print_program_stats():
+    """打印提取程序的复用统计"""
+    if _program_store is None:
+        return
+    stats = _program_store.stats()
+    if any(stats.values()):
+        print(f"🧩 Extraction programs: {stats['reused']} tasks answered by reusable programs, "
+              f"{stats['generated']} programs generated, {stats['rejected']} rejected in validation, "
+              f"{stats['fallbacks']} tasks fell back to per-item code")
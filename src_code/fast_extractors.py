@@ -0,0 +1,228 @@
+"""
+本地的列表提取（--fast_extract）
+
+很多普通抓取对象只是“按照python list的格式，一一抓取模型回复生成的每条评论/文案、抓取每个自然段”，
+模型回复本身就是一个编号、项目符号、引号或逐行的列表，却每次都要调用一次提取模型。启用后：
+- 只处理多对象模板（normal_multi）、抓取指令是“抓取全部条目”且没有附加条件（只提取、不要、标题……）的任务
+- 编号或项目符号列表：列表内部的每个非空行都必须是同一种标记的条目，前后可以有用空行隔开的开场白和结束语；
+  编号用 remove_index 去掉，与提取prompt的要求（“1. 你好”只抓取“你好”）一致
+- 没有标记的回复：每个非空行（自然段类指令为每个空行分隔的段落）都必须是条目，不能有开场白、结束语或小标题，
+  也不能有一行是整句而其余不是
+- 条目带“评论一：”之类的标签、列表中间夹着小标题或说明、混合标记、编号不连续等任何拿不准的情况，都交给提取模型
+"""
+
+import re
+import threading
+
+from utils import remove_index
+
+# 至少要有这么多条目才认为是列表
+MIN_ITEMS = 2
+
+# 抓取全部条目的指令：模型回复的每条/所有 评论、文案、诗句、名字……，以及每个自然段
+_LINE_INSTRUCTION = re.compile(
+    r"(一一|逐一|逐条)?抓取模型回复(生成)?的(每条|每一条|所有|每个|每一个|每一行)?(评论|文案|回复|诗句|词语|词|名字)"
+)
+_PARAGRAPH_INSTRUCTION = re.compile(r"抓取(模型回复(生成)?的)?(每个|所有)自然段")
+
+# 带附加条件的指令交给提取模型
+_RESTRICTIONS = (
+    "不要", "不提取", "不需要", "不抓", "只提取", "只需要", "只抓取", "除了", "去除", "清理", "注释", "标注",
+    "index", "title", "标题", "例如", "比如", "【", "[", "#",
+)
+
+# 与 remove_index 对应的编号（remove_index 能完整去掉的形式）
+_NUMBERED = re.compile(r"^(\d+[.、]|\(\d+\)|\[\d+\]|\{\d+\})")
+_BULLETED = re.compile(r"^[-*•·]\s+")
+# 其他像编号的行首（remove_index 的其余形式），出现时交给提取模型
+_OTHER_INDEX = re.compile(r"^((\d+|[a-zA-Z]|[ivxIVX]+)[.)\]}、]|[(\[{][0-9a-zA-Z]+[)\]}])")
+_QUOTES = {'"': '"', "“": "”", "「": "」", "『": "』", "'": "'"}
+# 自然段应以句末标点结束，否则可能是标题或署名
+_SENTENCE_END = tuple("。！？!?.…”\"」』)）")
+# 开场白、结束语常见的说法（没有标记的回复中出现时交给提取模型）
+_LEAD_IN = re.compile(
+    r"^(好的|好，|当然|以下|下面|这是|这些是|为您|为你|给您|给你|根据|希望|如果|sure|here|okay|ok[,.!]|certainly|of course|hope)"
+    r"|以下|如下|(below|following)[:：]?$",
+    re.IGNORECASE,
+)
+# 条目前的短标签，如“评论一：”“口语：”
+_LABEL = re.compile(r"^[^\s:：，,。]{1,8}[:：]")
+
+# 未启用时不处理任何任务
+_enabled = False
+
+_lock = threading.Lock()
+_stats = {"tasks": 0, "hits": 0, "numbered": 0, "bulleted": 0, "quoted": 0, "lines": 0, "paragraphs": 0}
+
+
+def enable_fast_extract(enabled=True):
+    """启用（或关闭）本地列表提取"""
+    global _enabled
+    _enabled = enabled
+
+
+def _count(shape=None):
+    with _lock:
+        _stats["tasks"] += 1
+        if shape is not None:
+            _stats["hits"] += 1
+            _stats[shape] += 1
+
+
+def instruction_unit(extraction_prompt):
+    """抓取指令要求的切分单位："lines"、"paragraphs"，不能本地处理时返回None"""
+    if any(word in extraction_prompt for word in _RESTRICTIONS):
+        return None
+    if _PARAGRAPH_INSTRUCTION.search(extraction_prompt):
+        return "paragraphs"
+    if _LINE_INSTRUCTION.search(extraction_prompt):
+        return "lines"
+    return None
+
+
+def _unquote(items):
+    """所有条目都被同一种引号整个括起来时去掉引号，否则返回None"""
+    for item in items:
+        if len(item) < 3 or _QUOTES.get(item[0]) != item[-1]:
+            return None
+    return [item[1:-1].strip() for item in items]
+
+
+def _split_numbered(blocks):
+    """每块都以连续的编号开头时，返回去掉编号的条目"""
+    items = []
+    previous = None
+    for block in blocks:
+        match = _NUMBERED.match(block)
+        if not match:
+            return None
+        number = int(re.search(r"\d+", match.group()).group())
+        if previous is not None and number != previous + 1:
+            return None
+        previous = number
+        item = remove_index(block)
+        # remove_index 与上面识别的编号不一致时不处理
+        if item != block[match.end():].lstrip():
+            return None
+        items.append(item)
+    return items
+
+
+def _looks_like_item(block):
+    """排除小标题、开场白（以冒号结尾）和markdown格式"""
+    return not (block.startswith(("#", "**", "```", ">", "|")) or block.endswith((":", "：")))
+
+
+def _peer_lines(items):
+    """没有标记的各行是否都像同级条目：首尾不是开场白或结束语，也不是只有首行或末行以句末标点结束"""
+    if _LEAD_IN.search(items[0]) or _LEAD_IN.search(items[-1]):
+        return False
+    ends = [item.endswith(_SENTENCE_END) for item in items]
+    if not any(ends[1:]) and ends[0] or not any(ends[:-1]) and ends[-1]:
+        return False
+    return True
+
+
+def _marker(line):
+    """行首的列表标记：numbered、bulleted 或 None"""
+    if _NUMBERED.match(line):
+        return "numbered"
+    if _BULLETED.match(line):
+        return "bulleted"
+    return None
+
+
+def _marked_region(lines):
+    """
+    找出回复中编号或项目符号列表所在的行
+
+    列表之前可以有开场白（最后一行以冒号结尾，或与列表之间有空行），之后可以有与列表空行隔开的结束语；
+    列表内部的非空行必须都是同一种标记的条目。
+
+    Returns:
+        (形状, 条目行列表)，拿不准时返回 (None, None)，没有列表时返回 ("lines", None)
+    """
+    marked = [index for index, line in enumerate(lines) if _marker(line.strip())]
+    if not marked:
+        return "lines", None
+    first, last = marked[0], marked[-1]
+    shape = _marker(lines[first].strip())
+    items = [line.strip() for line in lines[first:last + 1] if line.strip()]
+    if any(_marker(item) != shape for item in items):
+        return None, None
+
+    before = [line.strip() for line in lines[:first]]
+    intro = [line for line in before if line]
+    if intro and before[-1] and not intro[-1].endswith((":", "：")):
+        return None, None
+    after = [line.strip() for line in lines[last + 1:]]
+    if any(after) and after[0]:
+        return None, None
+    return shape, items
+
+
+def split_list(model_response, unit="lines"):
+    """
+    把模型回复切成条目
+
+    Returns:
+        (形状, 条目列表)，形状为 numbered / bulleted / quoted / lines / paragraphs；拿不准时返回 (None, None)
+    """
+    text = model_response.strip()
+    if unit == "paragraphs":
+        shape = "paragraphs"
+        blocks = [block.strip() for block in re.split(r"\n\s*\n", text) if block.strip()]
+        # 段落内部的换行保留，与提取模型复制原文一致
+        items = blocks if all(_looks_like_item(block) and block.endswith(_SENTENCE_END) for block in blocks) else None
+        if items and (_LEAD_IN.search(items[0]) or _LEAD_IN.search(items[-1])):
+            items = None
+    else:
+        lines = text.splitlines()
+        shape, items = _marked_region(lines)
+        if shape == "numbered":
+            items = _split_numbered(items)
+        elif shape == "bulleted":
+            items = [_BULLETED.sub("", item) for item in items]
+        elif shape == "lines":
+            # 没有标记的回复只接受每一行都是条目的情况
+            items = [line.strip() for line in lines if line.strip()]
+            if not all(_looks_like_item(item) and not _OTHER_INDEX.match(item) for item in items) \
+                    or not _peer_lines(items):
+                items = None
+    if not items or len(items) < MIN_ITEMS or not all(items) or any(_LABEL.match(item) for item in items):
+        return None, None
+
+    unquoted = _unquote(items)
+    if unquoted is not None and all(unquoted):
+        return ("quoted" if shape == "lines" else shape), unquoted
+    return shape, items
+
+
+def fast_extract(task):
+    """
+    尝试在本地完成一个普通提取任务
+
+    Returns:
+        条目列表；任务不适用或拿不准时返回None（交给提取模型）
+    """
+    if not _enabled or task['template'] != "normal_multi":
+        return None
+    unit = instruction_unit(task['extraction_prompt'])
+    if unit is None:
+        _count()
+        return None
+    shape, items = split_list(task['item']["model_response"], unit)
+    _count(shape)
+    return items
+
+
+def print_fast_extract_stats():
+    """打印本地列表提取的命中统计"""
+    with _lock:
+        stats = dict(_stats)
+    if stats["tasks"]:
+        shapes = ", ".join(f"{stats[shape]} {shape}" for shape in ("numbered", "bulleted", "quoted", "lines", "paragraphs")
+                           if stats[shape])
+        print(f"⚡ Fast extraction: {stats['hits']}/{stats['tasks']} normal tasks answered locally "
+              f"({stats['hits'] / stats['tasks'] * 100:.1f}%){': ' + shapes if shapes else ''}, "
+              f"{stats['tasks'] - stats['hits']} sent to the extractor model")
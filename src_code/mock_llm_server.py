@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+本地模拟的 OpenAI 兼容服务（Chat Completions），用于在没有真实模型的情况下压测评估流程
+
+    python src_code/mock_llm_server.py --port 8000 --latency_dist lognormal --latency_mean 0.5 --rate_limit_rate 0.05
+    python src_code/run_with_defaults.py --qwen_base_url http://127.0.0.1:8000/v1 \\
+        --qwen_coder_base_url http://127.0.0.1:8000/v1 --tested_model_base_url http://127.0.0.1:8000/v1 ...
+
+按prompt中模板的固定标记识别调用类型，返回能走通后续流程的回复：
+- 评估（General_Evaluator，含"判断：是/否"）：分析：✅ ... 判断：是/否（按prompt哈希确定，--judge_yes_rate 控制比例）
+- 代码提取（Coding_Extractor，含"extract_info_list(model_response)"）：按行分割的 extract_info_list 函数
+- 普通提取（General_Extractor，含"【评测对象】"）：把prompt中的模型回复按行分割成JSON列表
+- 合并提取（General_Extractor_MultiKey）：每个抓取对象名称对应同样的JSON列表
+- 其他（被测模型）：固定回复（canned）或原样返回问题（echo）
+
+可以模拟延迟分布、5xx错误、429限流（带Retry-After）和服务端每秒请求数上限；
+GET /stats 返回各类请求的计数和平均延迟，Ctrl-C 或 kill 退出时也会打印一次。
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import signal
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 固定回复（被测模型）
+CANNED_RESPONSE = "床前明月光\n疑是地上霜\n举头望明月\n低头思故乡"
+
+# 合并提取prompt的标记，以及其中每个抓取对象的名称
+MULTI_KEY_MARKER = "本次的【抓取对象】有多个"
+MULTI_KEY_NAME = re.compile(r'^- ("(?:[^"\\]|\\.)*")：', re.MULTILINE)
+
+# 代码提取的回复：按行分割，去掉空行
+EXTRACTION_CODE = '''```python
+def extract_info_list(model_response):
+    return [line.strip() for line in model_response.split('\\n') if line.strip()]
+```'''
+
+
+class MockState:
+    """服务配置与统计（多个处理线程共享）"""
+
+    def __init__(self, args):
+        self.args = args
+        self.random = random.Random(args.seed)
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.counts = {}
+        self.latency_total = {}
+        self.injected = {"429": 0, "5xx": 0, "rps_limited": 0}
+        # --max_rps 的令牌桶
+        self.tokens = float(args.max_rps or 0)
+        self.updated = time.monotonic()
+
+    def draw(self):
+        with self.lock:
+            return self.random.random()
+
+    def latency(self):
+        """按配置的分布抽取一次基础延迟（秒）"""
+        args = self.args
+        with self.lock:
+            if args.latency_dist == "fixed":
+                value = args.latency_mean
+            elif args.latency_dist == "uniform":
+                value = self.random.uniform(max(0.0, args.latency_mean - args.latency_std),
+                                            args.latency_mean + args.latency_std)
+            elif args.latency_dist == "exponential":
+                value = self.random.expovariate(1 / args.latency_mean) if args.latency_mean > 0 else 0.0
+            else:
+                # 对数正态：按给定的均值和标准差换算参数，长尾更接近真实推理服务
+                if args.latency_mean <= 0:
+                    value = 0.0
+                else:
+                    sigma2 = math.log(1 + (args.latency_std / args.latency_mean) ** 2)
+                    value = self.random.lognormvariate(math.log(args.latency_mean) - sigma2 / 2, math.sqrt(sigma2))
+        return max(0.0, value)
+
+    def take_rps_token(self):
+        """服务端每秒请求数上限，超出时返回False"""
+        if not self.args.max_rps:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.args.max_rps, self.tokens + (now - self.updated) * self.args.max_rps)
+            self.updated = now
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+    def record(self, kind, latency):
+        with self.lock:
+            self.counts[kind] = self.counts.get(kind, 0) + 1
+            self.latency_total[kind] = self.latency_total.get(kind, 0.0) + latency
+
+    def inject(self, kind):
+        with self.lock:
+            self.injected[kind] += 1
+
+    def stats(self):
+        with self.lock:
+            elapsed = time.time() - self.started
+            total = sum(self.counts.values())
+            return {
+                "uptime": round(elapsed, 2),
+                "requests": total,
+                "requests_per_second": round(total / elapsed, 2) if elapsed else 0.0,
+                "by_kind": {
+                    kind: {"count": count, "avg_latency": round(self.latency_total[kind] / count, 4)}
+                    for kind, count in self.counts.items()
+                },
+                "injected": dict(self.injected),
+            }
+
+
+def classify(prompt):
+    """根据模板标记判断调用类型"""
+    if "判断：是/否" in prompt:
+        return "judge"
+    if "extract_info_list(model_response)" in prompt:
+        return "extract_code"
+    if MULTI_KEY_MARKER in prompt:
+        return "extract_multi"
+    if "【评测对象】" in prompt:
+        return "extract_normal"
+    return "generation"
+
+
+def embedded_response(prompt):
+    """取出普通提取prompt中 ---your turn--- 之后的【模型回复】"""
+    start = prompt.rfind("【模型回复】")
+    end = prompt.find("【抓取对象】", start)
+    if start == -1 or end <= start:
+        return ""
+    return prompt[start + len("【模型回复】"):end].strip()
+
+
+def stable_fraction(text):
+    """把文本映射到[0, 1)，同一prompt总是得到同样的判断，重跑时结果可复现"""
+    return int(hashlib.md5(text.encode("utf-8")).hexdigest()[:8], 16) / 0x100000000
+
+
+def make_reply(kind, prompt, args, response_format=None):
+    if kind == "judge" and response_format is not None:
+        # 结构化评估：按JSON schema中的字段回复
+        passed = stable_fraction(prompt) < args.judge_yes_rate
+        schema = (response_format.get("json_schema") or {}).get("schema") or {}
+        verdict = {"verdict": passed}
+        if "reason" in schema.get("properties", {}):
+            verdict["reason"] = "模拟评估，模型回复满足要求。" if passed else "模拟评估，模型回复不满足要求。"
+        return json.dumps(verdict, ensure_ascii=False)
+    if kind == "judge":
+        if stable_fraction(prompt) < args.judge_yes_rate:
+            return "分析：✅ 模拟评估，模型回复满足要求。\n判断：是"
+        return "分析：❌ 模拟评估，模型回复不满足要求。\n判断：否"
+    if kind == "extract_code":
+        return EXTRACTION_CODE
+    if kind in ("extract_normal", "extract_multi"):
+        lines = [line.strip() for line in embedded_response(prompt).split("\n") if line.strip()]
+        if kind == "extract_multi":
+            targets = prompt[prompt.find("【抓取对象】", prompt.rfind("【模型回复】")):]
+            names = [json.loads(name) for name in MULTI_KEY_NAME.findall(targets)]
+            return json.dumps({name: lines for name in names}, ensure_ascii=False)
+        return json.dumps(lines, ensure_ascii=False)
+    if args.generation == "echo":
+        return prompt
+    return CANNED_RESPONSE
+
+
+def estimate_tokens(text):
+    ascii_count = sum(1 for char in text if ord(char) < 128)
+    return ascii_count // 4 + (len(text) - ascii_count) + 1
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state = None
+
+    def log_message(self, format, *args):
+        if self.state.args.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip("/") in ("/stats", "/v1/stats"):
+            self._send_json(200, self.state.stats())
+        elif self.path.rstrip("/") in ("/models", "/v1/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": "mock-model", "object": "model", "owned_by": "mock"}]})
+        else:
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length)
+        if self.path.rstrip("/") not in ("/chat/completions", "/v1/chat/completions"):
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+        try:
+            body = json.loads(raw)
+            # 模板可能放在system消息中，按全部消息拼接后识别
+            prompt = "\n".join(message.get("content") or "" for message in body["messages"])
+        except (json.JSONDecodeError, KeyError, IndexError, TypeError) as e:
+            self._send_json(400, {"error": {"message": f"Invalid request: {e}"}})
+            return
+
+        args = self.state.args
+        response_format = body.get("response_format")
+        if response_format is not None and args.no_response_format:
+            self._send_json(400, {"error": {"message": "response_format is not supported by this server"}})
+            return
+        if not self.state.take_rps_token():
+            self.state.inject("rps_limited")
+            self._send_json(429, {"error": {"message": "Too many requests (max_rps)"}},
+                            {"Retry-After": f"{1 / args.max_rps:.3f}"})
+            return
+        draw = self.state.draw()
+        if draw < args.rate_limit_rate:
+            self.state.inject("429")
+            self._send_json(429, {"error": {"message": "Rate limit exceeded (injected)"}},
+                            {"Retry-After": str(args.retry_after)})
+            return
+        if draw < args.rate_limit_rate + args.error_rate:
+            self.state.inject("5xx")
+            self._send_json(503, {"error": {"message": "Service unavailable (injected)"}})
+            return
+
+        kind = classify(prompt)
+        content = make_reply(kind, prompt, args, response_format)
+        prompt_tokens = sum(estimate_tokens(m.get("content") or "") for m in body["messages"])
+        completion_tokens = estimate_tokens(content)
+        # 超过max_tokens时按比例截断，与真实服务一样返回 finish_reason="length"
+        finish_reason = "stop"
+        max_tokens = body.get("max_tokens")
+        if isinstance(max_tokens, int) and 0 < max_tokens < completion_tokens:
+            content = content[:len(content) * max_tokens // completion_tokens]
+            completion_tokens = max_tokens
+            finish_reason = "length"
+        latency = self.state.latency() + completion_tokens * args.token_latency / 1000
+        time.sleep(latency)
+        self.state.record(kind, latency)
+
+        self._send_json(200, {
+            "id": f"chatcmpl-mock-{time.time_ns()}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "mock-model"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": finish_reason,
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        })
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # 压测时同时建立的连接很多，加大监听队列
+    request_queue_size = 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description='本地模拟的OpenAI兼容服务，用于压测评估流程')
+    parser.add_argument('--host', default='127.0.0.1', help='监听地址 (默认: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8000, help='监听端口 (默认: 8000)')
+    parser.add_argument('--latency_dist', choices=['fixed', 'uniform', 'exponential', 'lognormal'], default='lognormal',
+                        help='基础延迟的分布 (默认: lognormal)')
+    parser.add_argument('--latency_mean', type=float, default=0.2, help='基础延迟均值，秒 (默认: 0.2)')
+    parser.add_argument('--latency_std', type=float, default=0.1, help='基础延迟标准差（uniform为半宽），秒 (默认: 0.1)')
+    parser.add_argument('--token_latency', type=float, default=0.0, help='每个生成token额外的延迟，毫秒 (默认: 0)')
+    parser.add_argument('--error_rate', type=float, default=0.0, help='返回503的比例 (默认: 0)')
+    parser.add_argument('--rate_limit_rate', type=float, default=0.0, help='返回429的比例 (默认: 0)')
+    parser.add_argument('--retry_after', type=float, default=1.0, help='429响应中Retry-After的秒数 (默认: 1)')
+    parser.add_argument('--max_rps', type=float, default=0.0, help='服务端每秒请求数上限，超出返回429，0表示不限制 (默认: 0)')
+    parser.add_argument('--judge_yes_rate', type=float, default=1.0, help='评估请求回答"是"的比例，按prompt哈希确定 (默认: 1.0)')
+    parser.add_argument('--generation', choices=['canned', 'echo'], default='canned',
+                        help='被测模型请求的回复：固定文本或原样返回问题 (默认: canned)')
+    parser.add_argument('--no_response_format', action='store_true', help='模拟不支持结构化输出的服务：带response_format的请求返回400')
+    parser.add_argument('--seed', type=int, default=None, help='随机数种子（延迟和错误注入）')
+    parser.add_argument('--verbose', action='store_true', help='打印每个请求的访问日志')
+    args = parser.parse_args()
+
+    MockHandler.state = MockState(args)
+    server = MockServer((args.host, args.port), MockHandler)
+    # 后台运行时收不到Ctrl-C，kill（SIGTERM）同样按正常退出处理并打印统计
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    print(f"🧪 Mock LLM server listening on http://{args.host}:{args.port}/v1")
+    print(f"   - Latency: {args.latency_dist} mean {args.latency_mean}s std {args.latency_std}s"
+          + (f" + {args.token_latency}ms/token" if args.token_latency else ""))
+    print(f"   - Injected errors: 429 {args.rate_limit_rate:.1%} (Retry-After {args.retry_after}s), 503 {args.error_rate:.1%}"
+          + (f", max {args.max_rps} req/s" if args.max_rps else ""))
+    print(f"   - Stats: http://{args.host}:{args.port}/stats")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print()
+        print("📊 Mock server stats:")
+        print(json.dumps(MockHandler.state.stats(), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+重量级NLP后端的延迟加载
+
+规则模块以前在导入时就检查/安装依赖并加载模型（camel_tools、russtress、verbecc、pyphen词典……），
+即使本次只评估一种语言，也要为所有语言付出几十秒的启动时间。
+
+现在每个后端用一个加载函数登记：
+
+    @backend("pymorphy2")
+    def _load_pymorphy2():
+        ...
+        return pymorphy2.MorphAnalyzer()
+
+模块导入时只登记，不加载；第一次调用 _load_pymorphy2() 时才执行加载函数，结果在进程内缓存，
+之后的调用直接返回。加载函数在依赖不可用时返回None，由规则自己决定如何降级。
+"""
+
+import importlib
+import subprocess
+import sys
+import threading
+import time
+
+# 自动安装时使用的pip镜像（清华）
+PIP_MIRROR = "https://pypi.tuna.tsinghua.edu.cn/simple"
+
+# 后端名称 -> Backend
+_backends = {}
+
+
+class Backend:
+    """一个延迟加载的后端，调用时返回加载结果"""
+
+    def __init__(self, name, loader):
+        self.name = name
+        self.loader = loader
+        self.value = None
+        self.loaded = False
+        self.load_time = None
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        if not self.loaded:
+            with self._lock:
+                if not self.loaded:
+                    start_time = time.time()
+                    try:
+                        self.value = self.loader()
+                    except Exception as e:
+                        print(f"❌ {self.name} 加载失败: {e}")
+                        self.value = None
+                    self.load_time = time.time() - start_time
+                    self.loaded = True
+        return self.value
+
+    def __repr__(self):
+        state = f"loaded in {self.load_time:.2f}s" if self.loaded else "not loaded"
+        return f"Backend({self.name!r}, {state})"
+
+
+def backend(name):
+    """装饰器：把加载函数登记为名为name的后端，返回Backend对象"""
+    def decorator(loader):
+        if name in _backends:
+            raise ValueError(f"Backend '{name}' already registered")
+        _backends[name] = Backend(name, loader)
+        return _backends[name]
+    return decorator
+
+
+def get_backend(name):
+    """按名称加载并返回后端，未登记时抛出KeyError"""
+    return _backends[name]()
+
+
+def warm_up(names=None):
+    """
+    预先加载后端
+
+    Args:
+        names: 后端名称列表，为None时加载所有已登记的后端
+    """
+    for name in (_backends if names is None else names):
+        _backends[name]()
+
+
+def loaded_backends():
+    """返回已加载的后端及其加载耗时（秒）：{名称: 耗时}"""
+    return {name: b.load_time for name, b in _backends.items() if b.loaded}
+
+
+def list_backends():
+    """返回所有已登记的后端名称"""
+    return sorted(_backends)
+
+
+def import_or_install(module, package=None, pip_args=(), mirror=True):
+    """
+    导入模块，未安装时尝试用pip自动安装后再导入
+
+    Args:
+        module: 模块名，例如 "pymorphy2"
+        package: pip包名，默认与模块名相同
+        pip_args: 额外的pip参数，例如 ("--no-dependencies",)
+        mirror: 是否使用清华镜像
+
+    Returns:
+        模块对象；安装或导入失败时返回None
+    """
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        pass
+    package = package or module
+    print(f"{module}库未安装，正在自动安装...")
+    try:
+        command = [sys.executable, "-m", "pip", "install", package, *pip_args]
+        if mirror:
+            command += ["-i", PIP_MIRROR]
+        subprocess.check_call(command)
+        print(f"{module}库安装成功，正在导入...")
+        imported = importlib.import_module(module)
+        print(f"✅ {module}库已成功导入")
+        return imported
+    except Exception as e:
+        print(f"❌ 自动安装失败: {e}")
+        print(f"请手动运行: pip install {package}")
+        return None
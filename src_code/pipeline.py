@@ -0,0 +1,142 @@
+"""
+流水线式的轮次执行
+
+默认模式下，一轮评估是三个串行的全量阶段：所有条目获取回复 -> 所有条目提取 -> 所有条目评估，
+网络阶段运行时规则评估闲置，反之亦然。
+流水线模式下，每个阶段由若干工作线程组成，阶段之间用有界队列连接：
+一个条目拿到被测模型回复后立即进入提取阶段，提取完成后立即进入评估阶段。
+整轮耗时趋近于最慢的那个阶段，而不是所有阶段之和。
+"""
+
+import queue
+import threading
+import time
+
+# 队列结束标记
+_DONE = object()
+
+
+class Stage:
+    """流水线中的一个阶段"""
+
+    def __init__(self, name, func, workers=1, batch_size=1):
+        """
+        Args:
+            name: 阶段名称
+            func: 处理函数，接收一个条目列表并原地修改这些条目
+            workers: 工作线程数
+            batch_size: 每个工作线程一次最多从队列中取出的条目数
+        """
+        self.name = name
+        self.func = func
+        self.workers = max(1, int(workers))
+        self.batch_size = max(1, int(batch_size))
+        self.processed = 0
+        self.busy_time = 0.0
+
+
+def _take_batch(in_queue, batch_size):
+    """阻塞取一个条目，再非阻塞地取出队列中已就绪的条目，凑成一个小批次"""
+    first = in_queue.get()
+    if first is _DONE:
+        return None
+    batch = [first]
+    while len(batch) < batch_size:
+        try:
+            item = in_queue.get_nowait()
+        except queue.Empty:
+            break
+        if item is _DONE:
+            # 把结束标记放回去，留给同阶段的其他线程
+            in_queue.put(_DONE)
+            break
+        batch.append(item)
+    return batch
+
+
+def run_pipeline(items, stages, queue_size=64):
+    """
+    以流水线方式让所有条目依次经过各个阶段
+
+    Args:
+        items: 条目列表（原地修改）
+        stages: Stage列表，按执行顺序排列
+        queue_size: 阶段之间队列的容量
+
+    Returns:
+        原条目列表（保持原有顺序）
+    """
+    queues = [queue.Queue(maxsize=queue_size) for _ in range(len(stages) + 1)]
+    errors = []
+    lock = threading.Lock()
+    remaining_workers = [stage.workers for stage in stages]
+
+    def worker(stage_index):
+        stage = stages[stage_index]
+        in_queue, out_queue = queues[stage_index], queues[stage_index + 1]
+        while True:
+            batch = _take_batch(in_queue, stage.batch_size)
+            if batch is None:
+                in_queue.put(_DONE)
+                break
+            start_time = time.time()
+            try:
+                stage.func(batch)
+            except Exception as e:
+                # 出错的条目不再进入后续阶段，整轮结束后再抛出
+                print(f"❌ Pipeline stage '{stage.name}' failed: {e}")
+                with lock:
+                    errors.append(e)
+                continue
+            with lock:
+                stage.processed += len(batch)
+                stage.busy_time += time.time() - start_time
+            for item in batch:
+                out_queue.put(item)
+
+        # 本阶段最后一个线程退出时，通知下一个阶段
+        with lock:
+            remaining_workers[stage_index] -= 1
+            is_last = remaining_workers[stage_index] == 0
+        if is_last:
+            out_queue.put(_DONE)
+
+    threads = []
+    for stage_index, stage in enumerate(stages):
+        for worker_index in range(stage.workers):
+            thread = threading.Thread(
+                target=worker,
+                args=(stage_index,),
+                name=f"pipeline-{stage.name}-{worker_index}",
+                daemon=True
+            )
+            thread.start()
+            threads.append(thread)
+
+    # 最后一个队列只用于计数，单独开一个线程消费，避免阻塞最后一个阶段
+    finished = [0]
+
+    def drain():
+        while queues[-1].get() is not _DONE:
+            finished[0] += 1
+
+    drain_thread = threading.Thread(target=drain, name="pipeline-drain", daemon=True)
+    drain_thread.start()
+
+    start_time = time.time()
+    for item in items:
+        queues[0].put(item)
+    queues[0].put(_DONE)
+
+    for thread in threads:
+        thread.join()
+    drain_thread.join()
+    elapsed = time.time() - start_time
+
+    print(f"🚰 Pipeline finished {finished[0]}/{len(items)} items in {elapsed:.2f} seconds")
+    for stage in stages:
+        print(f"   - {stage.name}: {stage.processed} items, busy {stage.busy_time:.2f}s across {stage.workers} workers")
+
+    if errors:
+        raise errors[0]
+    return items
@@ -1,16 +1,64 @@
+import json
 import re
+import threading
 from prompts.General_Extractor_Multi import EXTRACTION_PROMPT_MULTI
 from prompts.General_Extractor_Single import EXTRACTION_PROMPT_SINGLE
+from prompts.General_Extractor_MultiKey import MULTI_KEY_TARGET, multi_key_template
 from prompts.Coding_Extractor import EXTRACTION_PROMPT_BY_CODING
 from prompts.Coding_Extractor_Single import EXTRACTION_PROMPT_BY_CODING_SINGLE
 from LLM_APIs.qwen_coder_api import call_coder_model
 from LLM_APIs.qwen_api import call_model
+from LLM_APIs.batch_io import BatchPending
+from LLM_APIs.llm_client import DEFAULT_MAX_TOKENS, estimate_tokens
 from utils import txt_to_json, get_json_info_by_key, str_to_lists
+from checkpoint import restore_extraction, record_extraction
+from prompt_layout import render_prompt
+from code_sandbox import get_code_sandbox
+from extraction_programs import VALIDATION_SAMPLES, get_program_store, program_key, is_usable_result
+from fast_extractors import fast_extract
 
 """
 每条数据都会有一个词条叫：corresponding_parts
 """
-def extract_by_coding(code_in_str, model_response):
+
+# 提取回复的token预算：评测对象是从模型回复中摘出来的，长度以回复为上限，
+# 预算取回复token数的倍数再加上列表格式的余量；编程提取另加写函数的余量。0表示不限制（使用默认max_tokens）
+EXTRACTION_TOKEN_RATIO = 1.5
+EXTRACTION_BASE_TOKENS = 512
+CODING_EXTRA_TOKENS = 1024
+
+# 合并提取（--multi_key_extraction）使用的模板：输出格式换成JSON对象，仍以【评测对象】结尾
+MULTI_KEY_PROMPT_MULTI = multi_key_template(EXTRACTION_PROMPT_MULTI)
+MULTI_KEY_PROMPT_SINGLE = multi_key_template(EXTRACTION_PROMPT_SINGLE)
+
+_extraction_token_ratio = EXTRACTION_TOKEN_RATIO
+
+# 同一条目的多个普通抓取对象是否合并成一次调用
+_multi_key_extraction = False
+
+
+def set_extraction_token_ratio(ratio):
+    """设置提取回复的token预算倍数，0表示不限制"""
+    global _extraction_token_ratio
+    _extraction_token_ratio = max(0.0, float(ratio))
+
+
+def set_multi_key_extraction(enabled):
+    """设置是否把同一条目的多个普通抓取对象合并成一次调用"""
+    global _multi_key_extraction
+    _multi_key_extraction = bool(enabled)
+
+
+def extraction_max_tokens(model_response, is_coding):
+    """按模型回复的长度估计提取回复的max_tokens，不限制时返回None"""
+    if not _extraction_token_ratio:
+        return None
+    budget = int(estimate_tokens(model_response) * _extraction_token_ratio) + EXTRACTION_BASE_TOKENS
+    if is_coding:
+        budget += CODING_EXTRA_TOKENS
+    return min(DEFAULT_MAX_TOKENS, budget)
+
+def extract_by_coding(code_in_str, model_response, verbose=True):
     code_in_str = re.sub(r'```python(.*?)```', r'\1', code_in_str, flags=re.DOTALL)
     try:
         # 创建一个局部命名空间字典
@@ -22,18 +70,60 @@ def extract_by_coding(code_in_str, model_response):
         # 调用函数并返回结果
         return extract_info_list(model_response)
     except Exception as e:
-        print("invalid code: ")
-        print(code_in_str)
-        print(f"提取失败: {e}")
+        if verbose:
+            print("invalid code: ")
+            print(code_in_str)
+            print(f"提取失败: {e}")
         return "INVALID"
-def extract_content(data, batch_size=5):
+
+def extract_by_coding_batch(codes, model_responses, verbose=True):
     """
-    重构的内容提取函数，修复了批处理逻辑和潜在的无限循环问题
+    执行一批生成的提取代码，返回结果列表（失败的为"INVALID"）
+
+    启动了代码进程池（--code_workers）时并行执行，有超时和内存限制；否则在主进程中逐个执行
     """
-    # 初始化提取结果
+    sandbox = get_code_sandbox()
+    if sandbox is None:
+        return [extract_by_coding(code, model_response, verbose) for code, model_response in zip(codes, model_responses)]
+    results = []
+    for code, (status, value) in zip(codes, sandbox.run(list(zip(codes, model_responses)))):
+        if status == "ok":
+            results.append(value)
+            continue
+        results.append("INVALID")
+        if not verbose:
+            continue
+        print("invalid code: ")
+        print(code)
+        print(f"提取失败: {value}")
+    return results
+
+def set_extraction_result(data, task, result, code=None):
+    """写入某个抓取对象的提取结果（同时记入断点日志）"""
+    item = data[task['data_index']]
+    item["extraction_results"][task['key']] = result
+    if code is not None:
+        item.setdefault("extraction_code", {})[task['key']] = code
+    record_extraction(item, task['key'], result, code)
+
+def init_extraction_results(data):
+    """初始化提取结果：提取前每个抓取对象的值是它的抓取指令"""
     for item in data:
         if "corresponding_parts" in item:
             item["extraction_results"] = item["corresponding_parts"].copy()
+
+
+def extract_content(data, batch_size=5, keys=None):
+    """
+    重构的内容提取函数，修复了批处理逻辑和潜在的无限循环问题
+
+    Args:
+        keys: 只提取这些抓取对象，{条目在data中的序号: 抓取对象名称集合}；
+              用于按需提取，此时不重新初始化 extraction_results（由 init_extraction_results 初始化）
+    """
+    # 初始化提取结果
+    if keys is None:
+        init_extraction_results(data)
     
     # 收集所有需要处理的任务
     all_tasks = []
@@ -42,23 +132,35 @@ def extract_content(data, batch_size=5):
             continue
             
         for key, extraction_prompt in item["corresponding_parts"].items():
+            if keys is not None and key not in keys.get(data_index, ()):
+                continue
+
+            # 断点续跑：日志中已有结果的任务直接跳过
+            if restore_extraction(item, key):
+                continue
+
             # 判断任务类型
             is_coding = "#CODE#" in extraction_prompt
             is_JSON = "#JSONSCHEMA#" in extraction_prompt
             is_list = "#LISTSCHEMA#" in extraction_prompt
             
             # 准备prompt
+            template = None
             if is_coding:
+                template = "coding_single" if "single" in item["category"] else "coding_multi"
                 coding_prompt = EXTRACTION_PROMPT_BY_CODING_SINGLE if "single" in item["category"] else EXTRACTION_PROMPT_BY_CODING
-                prompt = coding_prompt.format(
+                prompt = render_prompt(
+                    coding_prompt,
                     model_response=item["model_response"].replace("\n", ""), 
                     instruction=extraction_prompt.replace("#CODE#", "")
                 )
             elif is_JSON or is_list:
                 prompt = None  # JSON和LIST类型不需要调用模型
             else:
+                template = "normal_single" if "single" in item["category"] else "normal_multi"
                 general_prompt = EXTRACTION_PROMPT_SINGLE if "single" in item["category"] else EXTRACTION_PROMPT_MULTI
-                prompt = general_prompt.format(
+                prompt = render_prompt(
+                    general_prompt,
                     input_instruction=item["question"],
                     model_response=item["model_response"],
                     extraction_prompt=extraction_prompt
@@ -68,6 +170,8 @@ def extract_content(data, batch_size=5):
                 'data_index': data_index,
                 'key': key,
                 'prompt': prompt,
+                'template': template,
+                'max_tokens': extraction_max_tokens(item["model_response"], is_coding) if prompt is not None else None,
                 'extraction_prompt': extraction_prompt,
                 'is_coding': is_coding,
                 'is_JSON': is_JSON,
@@ -77,9 +181,10 @@ def extract_content(data, batch_size=5):
     
     print(f"Total tasks to process: {len(all_tasks)}")
     
-    # 分离不同类型的任务
-    coding_tasks = [task for task in all_tasks if task['is_coding']]
-    normal_tasks = [task for task in all_tasks if not task['is_coding'] and not task['is_JSON'] and not task['is_list']]
+    # 分离不同类型的任务；同一模板的请求排在一起发送，便于服务端的前缀缓存复用
+    coding_tasks = sorted((task for task in all_tasks if task['is_coding']), key=lambda task: task['template'])
+    normal_tasks = sorted((task for task in all_tasks if not task['is_coding'] and not task['is_JSON'] and not task['is_list']),
+                          key=lambda task: task['template'])
     json_tasks = [task for task in all_tasks if task['is_JSON']]
     list_tasks = [task for task in all_tasks if task['is_list']]
     
@@ -91,10 +196,10 @@ def extract_content(data, batch_size=5):
                 task['item']["model_response"], 
                 task['extraction_prompt'].replace("#JSONSCHEMA#", "")
             ))
-            data[task['data_index']]["extraction_results"][task['key']] = [result]
+            set_extraction_result(data, task, [result])
         except Exception as e:
             print(f"JSON extraction failed for task {task['key']}: {e}")
-            data[task['data_index']]["extraction_results"][task['key']] = "INVALID JSON"
+            set_extraction_result(data, task, "INVALID JSON")
     
     # 处理LIST任务（不需要调用模型）
     print(f"Processing {len(list_tasks)} LIST tasks...")
@@ -106,16 +211,26 @@ def extract_content(data, batch_size=5):
                 task['item']["model_response"],
                 task['extraction_prompt'].replace("#LISTSCHEMA#", "")
             )
-            data[task['data_index']]["extraction_results"][task['key']] = result
+            set_extraction_result(data, task, result)
         except Exception as e:
             print(f"LIST extraction failed for task {task['key']}: {e}")
-            data[task['data_index']]["extraction_results"][task['key']] = "INVALID LIST"
+            set_extraction_result(data, task, "INVALID LIST")
     
+    # 可复用的提取程序能处理的CODING任务不再逐条生成代码
+    coding_tasks = apply_extraction_programs(coding_tasks, data)
+
     # 批处理CODING任务
     if coding_tasks:
         print(f"Processing {len(coding_tasks)} coding tasks in batches of {batch_size}...")
         process_coding_tasks_in_batches(coding_tasks, data, batch_size)
     
+    # 本地能切分的列表不再调用提取模型
+    normal_tasks = apply_fast_extract(normal_tasks, data)
+
+    # 同一条目的多个普通抓取对象合并成一次调用，解析失败的抓取对象再单独提取
+    if _multi_key_extraction:
+        normal_tasks = process_multi_key_tasks(normal_tasks, data, batch_size)
+
     # 批处理普通任务
     if normal_tasks:
         print(f"Processing {len(normal_tasks)} normal tasks in batches of {batch_size}...")
@@ -124,91 +239,309 @@ def extract_content(data, batch_size=5):
     return data
 
 
+# 按需提取时因依赖不成立而没有提取的抓取对象的值
+SKIPPED_EXTRACTION = "SKIPPED"
+
+# 本轮按需提取的统计：抓取对象总数、实际提取数
+_lazy_stats = {"parts": 0, "extracted": 0}
+_lazy_lock = threading.Lock()
+
+
+class LazyExtraction:
+    """
+    按需提取（--lazy_extraction）：不在评估前提取所有抓取对象，而是评估到某一依赖层级时，
+    只提取这一层中依赖仍然成立的规则子问题用到的抓取对象。
+    第0层模型评估的子问题（例如“是否写了一首诗”）不成立时，依赖它的规则子问题会被直接判为失败，
+    它们的抓取对象也就不再提取。
+    """
+
+    def __init__(self, data, batch_size=5):
+        self.data = data
+        self.batch_size = batch_size
+        self._index = {id(item): data_index for data_index, item in enumerate(data)}
+        self._extracted = set()
+        init_extraction_results(data)
+
+    def __call__(self, sub_questions):
+        """提取这些子问题用到的、尚未提取的抓取对象"""
+        keys = {}
+        for sub_q in sub_questions:
+            item = sub_q["_item"]
+            key = sub_q.get("corresponding_part")
+            data_index = self._index.get(id(item))
+            if data_index is None or key not in item.get("corresponding_parts", {}):
+                continue
+            if (data_index, key) not in self._extracted:
+                self._extracted.add((data_index, key))
+                keys.setdefault(data_index, set()).add(key)
+        if keys:
+            extract_content(self.data, batch_size=self.batch_size, keys=keys)
+
+    def finish(self):
+        """把没有提取的抓取对象标记为SKIPPED，并计入本轮统计"""
+        parts = 0
+        for data_index, item in enumerate(self.data):
+            for key in item.get("corresponding_parts", {}):
+                parts += 1
+                if (data_index, key) not in self._extracted:
+                    item["extraction_results"][key] = SKIPPED_EXTRACTION
+        with _lazy_lock:
+            _lazy_stats["parts"] += parts
+            _lazy_stats["extracted"] += len(self._extracted)
+
+
+def print_lazy_extraction_stats():
+    """打印本轮按需提取跳过的抓取对象数，并清零"""
+    with _lazy_lock:
+        stats = dict(_lazy_stats)
+        _lazy_stats.update(parts=0, extracted=0)
+    if stats["parts"]:
+        skipped = stats["parts"] - stats["extracted"]
+        print(f"💤 Lazy extraction: {skipped}/{stats['parts']} corresponding parts skipped "
+              f"({skipped / stats['parts'] * 100:.1f}%), not needed by any rule check whose dependencies held")
+
+
+def set_call_failure(data, task, error):
+    """
+    重试后仍失败（或已导出到批处理文件）的请求：本轮记为INVALID，但不写入断点日志，--resume 时会重新提取
+    """
+    if not isinstance(error, BatchPending):
+        print(f"    Extraction call failed for task {task['key']}: {error}")
+    data[task['data_index']]["extraction_results"][task['key']] = "INVALID"
+
+
+def apply_fast_extract(normal_tasks, data):
+    """本地列表提取（--fast_extract）：处理编号、项目符号、引号或逐行的列表，返回仍需调用提取模型的任务"""
+    remaining = []
+    for task in normal_tasks:
+        result = fast_extract(task)
+        if result is None:
+            remaining.append(task)
+        else:
+            set_extraction_result(data, task, result)
+    if len(remaining) < len(normal_tasks):
+        print(f"Answered {len(normal_tasks) - len(remaining)} normal tasks locally (fast extraction)")
+    return remaining
+
+
+def apply_extraction_programs(coding_tasks, data):
+    """
+    可复用的提取程序（--reuse_extraction_code）：每个 (category, 抓取指令) 只生成一个程序，在所有匹配的回复上执行
+
+    Returns:
+        仍需逐条生成代码的任务（没有可用的程序，或程序对这条回复失败、返回空结果）
+    """
+    store = get_program_store()
+    if store is None or not coding_tasks:
+        return coding_tasks
+
+    groups = {}
+    for task in coding_tasks:
+        key = program_key(task['item']["category"], task['extraction_prompt'].replace("#CODE#", ""))
+        groups.setdefault(key, []).append(task)
+
+    # 还没有程序的组：用第一个任务的prompt生成（与逐条生成的prompt相同，退回逐条生成时命中缓存或合并在途请求）
+    missing = [key for key in groups if store.get(key) is None]
+    if missing:
+        print(f"  Generating {len(missing)} reusable extraction programs...")
+        results = call_coder_model([groups[key][0]['prompt'] for key in missing], return_exceptions=True,
+                                   stage="extraction-code", max_tokens=[groups[key][0]['max_tokens'] for key in missing])
+        candidates = []
+        for key, code in zip(missing, results):
+            if isinstance(code, BatchPending):
+                # 离线推理的结果导入后再生成程序，这一组本轮都按调用失败处理
+                for task in groups.pop(key):
+                    set_call_failure(data, task, code)
+            elif not isinstance(code, BaseException):
+                candidates.append((key, code))
+
+        # 在前几个样例回复上验证：都能得到非空结果的程序才保存
+        samples = [(key, code, task) for key, code in candidates for task in groups[key][:VALIDATION_SAMPLES]]
+        sample_results = extract_by_coding_batch([code for _, code, _ in samples],
+                                                 [task['item']["model_response"] for _, _, task in samples], verbose=False)
+        rejected = {key for (key, _, _), result in zip(samples, sample_results) if not is_usable_result(result)}
+        for key, code in candidates:
+            if key in rejected:
+                store.count("rejected")
+                continue
+            first_task = groups[key][0]
+            store.put(key, first_task['item']["category"], first_task['extraction_prompt'].replace("#CODE#", ""), code,
+                      min(len(groups[key]), VALIDATION_SAMPLES))
+            store.count("generated")
+
+    # 用程序处理所有匹配的任务
+    applied = [(task, store.get(key)) for key, tasks in groups.items() if store.get(key) is not None for task in tasks]
+    extracted_results = extract_by_coding_batch([code for _, code in applied],
+                                                [task['item']["model_response"] for task, _ in applied], verbose=False)
+    done = set()
+    for (task, code), extracted_result in zip(applied, extracted_results):
+        if not is_usable_result(extracted_result):
+            store.count("fallbacks")
+            continue
+        set_extraction_result(data, task, extracted_result, code=code)
+        store.count("reused")
+        done.add(id(task))
+
+    pending = set(id(task) for tasks in groups.values() for task in tasks)
+    return [task for task in coding_tasks if id(task) in pending and id(task) not in done]
+
+
 def process_coding_tasks_in_batches(coding_tasks, data, batch_size):
-    """批处理编程任务"""
+    """批处理编程任务（单个请求失败只影响对应的任务）"""
     for i in range(0, len(coding_tasks), batch_size):
         batch_tasks = coding_tasks[i:i+batch_size]
         batch_prompts = [task['prompt'] for task in batch_tasks]
         
         print(f"  Processing coding batch {i//batch_size + 1}/{(len(coding_tasks)-1)//batch_size + 1} ({len(batch_tasks)} tasks)")
         
-        try:
-            # 批量调用
-            batch_results = call_coder_model(batch_prompts)
-            
-            # 处理结果
-            for j, (result, task) in enumerate(zip(batch_results, batch_tasks)):
-                try:
-                    extracted_result = extract_by_coding(result, task['item']["model_response"])
-                    data[task['data_index']]["extraction_results"][task['key']] = extracted_result
-                    data[task['data_index']].setdefault("extraction_code", {})[task['key']] = result
-                except Exception as e:
-                    print(f"    Coding extraction failed for task {task['key']}: {e}")
-                    data[task['data_index']]["extraction_results"][task['key']] = "INVALID"
-                    
-        except Exception as e:
-            print(f"  Batch coding call failed: {e}")
-            # 回退到逐个处理
-            print("  Falling back to individual processing...")
-            for task in batch_tasks:
-                try:
-                    result = call_coder_model([task['prompt']])[0]
-                    extracted_result = extract_by_coding(result, task['item']["model_response"])
-                    data[task['data_index']]["extraction_results"][task['key']] = extracted_result
-                except Exception as e:
-                    print(f"    Individual coding extraction failed for task {task['key']}: {e}")
-                    data[task['data_index']]["extraction_results"][task['key']] = "INVALID"
+        # 批量调用，失败的prompt已在llm_client中单独重试过
+        batch_results = call_coder_model(batch_prompts, return_exceptions=True, stage="extraction-code",
+                                         max_tokens=[task['max_tokens'] for task in batch_tasks])
+        
+        # 调用失败的任务直接标记，其余的代码一起执行
+        coded = []
+        for result, task in zip(batch_results, batch_tasks):
+            if isinstance(result, BaseException):
+                set_call_failure(data, task, result)
+                continue
+            coded.append((result, task))
+        extracted_results = extract_by_coding_batch([result for result, _ in coded],
+                                                    [task['item']["model_response"] for _, task in coded])
+
+        # 处理结果
+        for (result, task), extracted_result in zip(coded, extracted_results):
+            try:
+                set_extraction_result(data, task, extracted_result, code=result)
+            except Exception as e:
+                print(f"    Coding extraction failed for task {task['key']}: {e}")
+                set_extraction_result(data, task, "INVALID")
+
+
+def set_normal_result(data, task, json_result):
+    """写入普通提取解析后的结果，ALL表示整个模型回复"""
+    if json_result == "ALL":
+        final_result = task['item']["model_response"]
+    else:
+        final_result = json_result
+    set_extraction_result(data, task, final_result)
+
+
+def multi_key_prompt(tasks):
+    """把同一条目的多个普通抓取对象拼成一个提取prompt"""
+    item = tasks[0]['item']
+    general_prompt = MULTI_KEY_PROMPT_SINGLE if tasks[0]['template'] == "normal_single" else MULTI_KEY_PROMPT_MULTI
+    targets = "\n".join(
+        MULTI_KEY_TARGET.format(name=json.dumps(task['key'], ensure_ascii=False), instruction=task['extraction_prompt'])
+        for task in tasks
+    )
+    return render_prompt(
+        general_prompt,
+        input_instruction=item["question"],
+        model_response=item["model_response"],
+        extraction_prompt=targets
+    )
+
+
+def parse_multi_key_result(result, tasks):
+    """
+    解析合并提取的回复
+
+    Returns:
+        {抓取对象名称: 评测对象}，只包含值为list或ALL的抓取对象
+    """
+    try:
+        parsed = txt_to_json(result)
+    except Exception:
+        return {}
+    if not isinstance(parsed, dict):
+        return {}
+    values = {}
+    for task in tasks:
+        value = parsed.get(task['key'])
+        if isinstance(value, list) or value == "ALL":
+            values[task['key']] = value
+    return values
+
+
+def process_multi_key_tasks(normal_tasks, data, batch_size):
+    """
+    合并提取（--multi_key_extraction）：同一条目有多个普通抓取对象时只调用一次提取模型，
+    在一个JSON对象中返回所有抓取对象的评测对象
+
+    Returns:
+        仍需单独提取的任务（条目只有一个普通抓取对象，或合并提取中该抓取对象缺失、无法解析）
+    """
+    groups = {}
+    for task in normal_tasks:
+        groups.setdefault(task['data_index'], []).append(task)
+    remaining = [tasks[0] for tasks in groups.values() if len(tasks) == 1]
+    groups = [tasks for tasks in groups.values() if len(tasks) > 1]
+    if not groups:
+        return normal_tasks
+
+    print(f"Processing {sum(len(tasks) for tasks in groups)} normal tasks of {len(groups)} items "
+          f"as multi-key extractions in batches of {batch_size}...")
+    retried = 0
+    for i in range(0, len(groups), batch_size):
+        batch_groups = groups[i:i+batch_size]
+        max_tokens = []
+        for tasks in batch_groups:
+            budgets = [task['max_tokens'] for task in tasks]
+            max_tokens.append(None if None in budgets else min(DEFAULT_MAX_TOKENS, sum(budgets)))
+
+        batch_results = call_coder_model([multi_key_prompt(tasks) for tasks in batch_groups], return_exceptions=True,
+                                         stage="extraction-normal", max_tokens=max_tokens)
+
+        for result, tasks in zip(batch_results, batch_groups):
+            if isinstance(result, BatchPending):
+                # 已导出到批处理文件，导入结果后重新运行时命中缓存
+                for task in tasks:
+                    set_call_failure(data, task, result)
+                continue
+            if isinstance(result, BaseException):
+                # 合并请求失败时逐个抓取对象单独提取
+                print(f"    Multi-key extraction call failed for item {tasks[0]['data_index']}: {result}")
+                remaining.extend(tasks)
+                retried += len(tasks)
+                continue
+            values = parse_multi_key_result(result, tasks)
+            for task in tasks:
+                if task['key'] not in values:
+                    remaining.append(task)
+                    retried += 1
+                    continue
+                set_normal_result(data, task, values[task['key']])
+
+    if retried:
+        print(f"  {retried} tasks not answered by multi-key extraction will be extracted individually")
+    # 保持原来的模板顺序，便于服务端的前缀缓存复用
+    return sorted(remaining, key=lambda task: task['template'])
 
 
 def process_normal_tasks_in_batches(normal_tasks, data, batch_size):
-    """批处理普通任务"""
+    """批处理普通任务（单个请求失败只影响对应的任务）"""
     for i in range(0, len(normal_tasks), batch_size):
         batch_tasks = normal_tasks[i:i+batch_size]
         batch_prompts = [task['prompt'] for task in batch_tasks]
         
         print(f"  Processing normal batch {i//batch_size + 1}/{(len(normal_tasks)-1)//batch_size + 1} ({len(batch_tasks)} tasks)")
         
-        try:
-            # 批量调用
-            batch_results = call_coder_model(batch_prompts)
-            
-            # 处理结果
-            for result, task in zip(batch_results, batch_tasks):
-                try:
-                    # 转换为JSON格式
-                    json_result = txt_to_json(result)
-                    
-                    if json_result == "ALL":
-                        final_result = task['item']["model_response"]
-                    else:
-                        final_result = json_result
-                        
-                    data[task['data_index']]["extraction_results"][task['key']] = final_result
-                    
-                except Exception as e:
-                    print(f"    Normal extraction failed for task {task['key']}: {e}")
-                    print(f"    Raw result: {result}")
-                    data[task['data_index']]["extraction_results"][task['key']] = "INVALID"
-                    
-        except Exception as e:
-            print(f"  Batch normal call failed: {e}")
-            # 回退到逐个处理
-            print("  Falling back to individual processing...")
-            for task in batch_tasks:
-                try:
-                    result = call_coder_model([task['prompt']])[0]
-                    json_result = txt_to_json(result)
-                    
-                    if json_result == "ALL":
-                        final_result = task['item']["model_response"]
-                    else:
-                        final_result = json_result
-                        
-                    data[task['data_index']]["extraction_results"][task['key']] = final_result
-                    
-                except Exception as e:
-                    print(f"    Individual normal extraction failed for task {task['key']}: {e}")
-                    data[task['data_index']]["extraction_results"][task['key']] = "INVALID"
+        # 批量调用，失败的prompt已在llm_client中单独重试过
+        batch_results = call_coder_model(batch_prompts, return_exceptions=True, stage="extraction-normal",
+                                         max_tokens=[task['max_tokens'] for task in batch_tasks])
+        
+        # 处理结果
+        for result, task in zip(batch_results, batch_tasks):
+            if isinstance(result, BaseException):
+                set_call_failure(data, task, result)
+                continue
+            try:
+                # 转换为JSON格式
+                set_normal_result(data, task, txt_to_json(result))
+            except Exception as e:
+                print(f"    Normal extraction failed for task {task['key']}: {e}")
+                print(f"    Raw result: {result}")
+                set_extraction_result(data, task, "INVALID")
                     
 # def extract_content(data, batch_size=BATCH_SIZE):
 #     for item in data:
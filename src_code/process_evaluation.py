@@ -1,6 +1,139 @@
 import re
+import sys
+import json
+import multiprocessing
+from openai import APIStatusError
 from prompts.General_Evaluator import EVALUATION_PROMPT
+from prompts.General_Evaluator_Structured import JSON_VERDICT_SUFFIX, VERDICT_ONLY_SUFFIX
+from prompt_layout import render_prompt
 from LLM_APIs.qwen_api import call_model
+from checkpoint import restore_eval, record_eval
+
+# 评估回复只需要简短的"分析：…判断：是/否"，限制max_tokens避免失控的生成长时间占用服务端；0表示不限制
+JUDGE_MAX_TOKENS = 1024
+_judge_max_tokens = JUDGE_MAX_TOKENS
+
+# 评估方式（--judge_mode）：
+# - analysis：原来的prompt，自由格式的"分析：…判断：是/否"，用正则取判断
+# - json：通过response_format（JSON schema，vLLM/SGLang以guided decoding实现）要求 {"verdict": ..., "reason": ...}
+# - verdict：只要 {"verdict": ...}，输出只有几个token
+# 服务端不支持response_format、或回复无法解析时，对应的子问题改用analysis方式重新评估
+JUDGE_MODES = ("analysis", "json", "verdict")
+_judge_mode = "analysis"
+# 服务端拒绝过response_format后不再尝试结构化评估
+_structured_supported = True
+
+# verdict方式的max_tokens，{"verdict": false} 只有几个token
+VERDICT_MAX_TOKENS = 32
+
+JSON_VERDICT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "verdict": {"type": "boolean"},
+        "reason": {"type": "string"},
+    },
+    "required": ["verdict", "reason"],
+    "additionalProperties": False,
+}
+VERDICT_ONLY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "verdict": {"type": "boolean"},
+    },
+    "required": ["verdict"],
+    "additionalProperties": False,
+}
+
+# 规则评估进程池（--rule_workers），为None时在主进程中串行评估
+_rule_pool = None
+_rule_workers = 0
+
+# 工作进程中的规则评估函数，由 _init_rule_worker 设置
+_worker_rule_func = None
+
+
+def set_judge_max_tokens(max_tokens):
+    """设置评估回复的max_tokens，0表示不限制"""
+    global _judge_max_tokens
+    _judge_max_tokens = max(0, int(max_tokens))
+
+
+def set_judge_mode(mode):
+    """设置评估方式：analysis、json 或 verdict"""
+    global _judge_mode, _structured_supported
+    if mode not in JUDGE_MODES:
+        raise ValueError(f"Unknown judge mode '{mode}', expected one of: {', '.join(JUDGE_MODES)}")
+    _judge_mode = mode
+    _structured_supported = True
+
+
+def _init_rule_worker(rule_based_evaluate_func):
+    """工作进程初始化：导入并预热规则评估模块，每个进程只做一次"""
+    global _worker_rule_func
+    _worker_rule_func = rule_based_evaluate_func
+    warm_up = getattr(sys.modules.get(rule_based_evaluate_func.__module__), "warm_up", None)
+    if warm_up is not None:
+        warm_up()
+
+
+def _evaluate_rule_task(task):
+    """在工作进程中评估一条规则，task为 (item, rule, model_response)"""
+    item, rule, model_response = task
+    return _worker_rule_func(item, rule, model_response)
+
+
+def start_rule_workers(workers, rule_based_evaluate_func):
+    """
+    启动规则评估进程池
+
+    Args:
+        workers: 工作进程数，小于等于0时不启动（串行评估）
+        rule_based_evaluate_func: 规则评估函数（必须是模块级函数）
+    """
+    global _rule_pool, _rule_workers
+    stop_rule_workers()
+    if workers <= 0:
+        return
+    # Linux下用fork，工作进程直接继承主进程中已导入的NLP模块
+    method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+    context = multiprocessing.get_context(method)
+    _rule_pool = context.Pool(workers, initializer=_init_rule_worker, initargs=(rule_based_evaluate_func,))
+    _rule_workers = workers
+    print(f"⚙️  Started {workers} rule evaluation workers ({method})")
+
+
+def stop_rule_workers():
+    """关闭规则评估进程池"""
+    global _rule_pool, _rule_workers
+    if _rule_pool is None:
+        return
+    _rule_pool.close()
+    _rule_pool.join()
+    _rule_pool = None
+    _rule_workers = 0
+
+
+def run_rule_tasks(tasks, rule_based_evaluate_func):
+    """
+    评估一批规则，返回结果列表（顺序与tasks一致）
+
+    启用进程池时把任务按块分发给工作进程，否则在主进程中串行评估。
+    """
+    pool = _rule_pool
+    if pool is None or len(tasks) <= 1:
+        return [rule_based_evaluate_func(item, rule, model_response) for item, rule, model_response in tasks]
+    # 每个进程分到约4块，兼顾负载均衡和进程间通信开销
+    chunksize = max(1, -(-len(tasks) // (_rule_workers * 4)))
+    return pool.map(_evaluate_rule_task, tasks, chunksize=chunksize)
+
+
+def _item_for_rule(item, cache):
+    """发往工作进程的条目视图：去掉sub_questions（其中的_item会形成循环引用），同一条目只构造一次"""
+    view = cache.get(id(item))
+    if view is None:
+        view = {key: value for key, value in item.items() if key != "sub_questions"}
+        cache[id(item)] = view
+    return view
 
 # 查看依赖项
 def check_dependencies(sub_question, item):
@@ -10,20 +143,133 @@ def check_dependencies(sub_question, item):
                 return False
     return True
 
+# 模型评估调用失败（重试后仍失败，或已导出到批处理文件）时的eval_method
+API_ERROR_METHOD = "api error"
+
+def has_unevaluated_dependencies(sub_question, item):
+    """依赖的子问题因调用失败尚无结果时返回True"""
+    for sub_q in item["sub_questions"]:
+        if sub_q["point_id"] in sub_question["dep"] and sub_q.get("eval_method") == API_ERROR_METHOD:
+            return True
+    return False
+
+def parse_verdict(raw_res):
+    """
+    解析结构化评估的回复
+
+    Returns:
+        (eval_result, eval_explanation)，无法解析时返回None；
+        eval_explanation 仍写成"分析：…判断：是/否"，多轮评估据此生成下一轮的修改意见
+    """
+    text = re.sub(r'^```(?:json)?\s*|\s*```$', '', raw_res.strip())
+    try:
+        verdict = json.loads(text)
+    except ValueError:
+        match = re.search(r'\{.*\}', text, flags=re.DOTALL)
+        if match is None:
+            return None
+        try:
+            verdict = json.loads(match.group(0))
+        except ValueError:
+            return None
+    if not isinstance(verdict, dict) or not isinstance(verdict.get("verdict"), bool):
+        return None
+    passed = verdict["verdict"]
+    reason = str(verdict.get("reason") or "").strip()
+    explanation = f"判断：{'是' if passed else '否'}"
+    if reason:
+        explanation = f"分析：{'✅' if passed else '❌'} {reason}\n" + explanation
+    return int(passed), explanation
+
+
+def is_structured_output_unsupported(error):
+    """服务端因为response_format拒绝请求（400/422且错误信息提到结构化输出）"""
+    if not isinstance(error, APIStatusError) or error.status_code not in (400, 422):
+        return False
+    message = str(error).lower()
+    return any(word in message for word in ("response_format", "json_schema", "guided", "structured"))
+
+
+def structured_evaluation(sub_questions):
+    """
+    用结构化输出评估子问题（json / verdict方式）
+
+    Returns:
+        需要改用analysis方式重新评估的子问题（服务端不支持或回复无法解析）
+    """
+    global _structured_supported
+    verdict_only = _judge_mode == "verdict"
+    suffix = VERDICT_ONLY_SUFFIX if verdict_only else JSON_VERDICT_SUFFIX
+    schema = VERDICT_ONLY_SCHEMA if verdict_only else JSON_VERDICT_SCHEMA
+    response_format = {
+        "type": "json_schema",
+        "json_schema": {"name": "judge_verdict", "schema": schema, "strict": True},
+    }
+    max_tokens = VERDICT_MAX_TOKENS if verdict_only else (_judge_max_tokens or None)
+
+    prompts = [render_prompt(
+        EVALUATION_PROMPT + suffix,
+        input=sub_q['_item']["question"],
+        output=sub_q['_item']["model_response"],
+        question=sub_q["question"]
+    ) for sub_q in sub_questions]
+    raw_results = call_model(prompts, return_exceptions=True, stage="judge", max_tokens=max_tokens,
+                             response_format=response_format)
+
+    fallback = []
+    for sub_question, raw_res in zip(sub_questions, raw_results):
+        if isinstance(raw_res, BaseException):
+            if is_structured_output_unsupported(raw_res):
+                if _structured_supported:
+                    print(f"⚠️  Judge endpoint does not support response_format, falling back to analysis judge: {raw_res}")
+                _structured_supported = False
+                fallback.append(sub_question)
+                continue
+            sub_question["eval_result"] = 0
+            sub_question["eval_explanation"] = f"API ERROR: {raw_res}"
+            sub_question["eval_method"] = API_ERROR_METHOD
+            continue
+        parsed = parse_verdict(raw_res)
+        if parsed is None:
+            fallback.append(sub_question)
+            continue
+        sub_question["eval_result"], sub_question["eval_explanation"] = parsed
+        sub_question["eval_method"] = "pure model evaluation"
+    return fallback
+
+
 def model_evaluation(sub_questions):
+    """评估不带规则的子问题：结构化方式优先，不支持或无法解析的改用原来的prompt"""
+    if _judge_mode != "analysis" and _structured_supported:
+        sub_questions_left = structured_evaluation(sub_questions)
+    else:
+        sub_questions_left = sub_questions
+    if sub_questions_left:
+        analysis_evaluation(sub_questions_left)
+    return sub_questions
+
+
+def analysis_evaluation(sub_questions):
     # try:
         # 为每个sub_question准备prompt
-    prompts = [EVALUATION_PROMPT.format(
+    # 同一条数据的子问题在批次中相邻，prefix排布下连同原问题和模型回复一起共享前缀
+    prompts = [render_prompt(
+        EVALUATION_PROMPT,
         input=sub_q['_item']["question"],
         output=sub_q['_item']["model_response"],
         question=sub_q["question"]
     ) for sub_q in sub_questions]
     
-    # 批量调用模型
-    raw_results = call_model(prompts)
+    # 批量调用模型，单个prompt重试后仍失败时只影响对应的子问题
+    raw_results = call_model(prompts, return_exceptions=True, stage="judge", max_tokens=_judge_max_tokens or None)
     
     # 处理每个结果
     for sub_question, raw_res in zip(sub_questions, raw_results):
+        if isinstance(raw_res, BaseException):
+            sub_question["eval_result"] = 0
+            sub_question["eval_explanation"] = f"API ERROR: {raw_res}"
+            sub_question["eval_method"] = API_ERROR_METHOD
+            continue
         try:
             re_result = re.findall(r'判断：是|判断：否', raw_res)
             if "是" in re_result[0]:
@@ -40,30 +286,36 @@ def model_evaluation(sub_questions):
 
 def get_mixed_evaluation(sub_questions, rule_based_evaluate_func):
     """使用传入的rule_based_evaluate函数进行评估"""
+    # 先收集需要执行规则的子问题，再统一评估（串行或进程池）
+    tasks = []
+    evaluated = []
+    item_views = {}
     for sub_q in sub_questions:
         item = sub_q["_item"]
         if sub_q['rule'].startswith("SCHEMA"):
             # SCHEMA规则返回多个验证点的列表，直接赋值给eval_result
-            sub_q["eval_result"] = rule_based_evaluate_func(
-                item, 
-                sub_q["rule"], 
-                item["model_response"]
-            )
-            sub_q["eval_method"] = "rule evaluation"
+            response = item["model_response"]
         else:
             corresponding_part = item["extraction_results"][sub_q["corresponding_part"]]
             if corresponding_part == "INVALID":  # 抓取的部分有问题这样
                 sub_q["eval_result"] = 0
                 sub_q['eval_explanation'] = "MODEL ERROR"
-            else:
-                # print(sub_q["question"], sub_q["rule"], corresponding_part)
-                sub_q["eval_result"], sub_q['eval_explanation'] = rule_based_evaluate_func(
-                    item, 
-                    sub_q["rule"], 
-                    corresponding_part
-                )
-                    
-            sub_q["eval_method"] = "rule evaluation"
+                sub_q["eval_method"] = "rule evaluation"
+                continue
+            response = corresponding_part
+        # print(sub_q["question"], sub_q["rule"], response)
+        item_view = _item_for_rule(item, item_views) if _rule_pool is not None else item
+        tasks.append((item_view, sub_q["rule"], response))
+        evaluated.append(sub_q)
+
+    results = run_rule_tasks(tasks, rule_based_evaluate_func)
+
+    for sub_q, result in zip(evaluated, results):
+        if sub_q['rule'].startswith("SCHEMA"):
+            sub_q["eval_result"] = result
+        else:
+            sub_q["eval_result"], sub_q['eval_explanation'] = result
+        sub_q["eval_method"] = "rule evaluation"
     return sub_questions
 
 def get_dependency_level(questions_dict, sub_q):
@@ -106,19 +358,48 @@ def collect_questions_by_level(items):
     
     return questions_by_level
 
-def process_all_items(items, batch_size=5, rule_based_evaluate_func=None):
+def needs_extraction(sub_q, level):
+    """规则子问题在本层是否会被评估（依赖成立），需要它的抓取对象"""
+    if sub_q.get("rule") is None or sub_q["rule"].startswith("SCHEMA"):
+        return False
+    if level == 0:
+        return True
+    return not has_unevaluated_dependencies(sub_q, sub_q["_item"]) and check_dependencies(sub_q, sub_q["_item"])
+
+def process_all_items(items, batch_size=5, rule_based_evaluate_func=None, extract_func=None):
+    """
+    按依赖层级评估所有子问题
+
+    Args:
+        extract_func: 按需提取（--lazy_extraction）时传入，每层评估前用这一层仍需评估的规则子问题调用，
+                      只提取它们用到的抓取对象
+    """
     print(f"Starting to process {len(items)} items...")
     questions_by_level = collect_questions_by_level(items)
+    if not questions_by_level:
+        return items
     max_level = max(questions_by_level.keys())
     
     # 保存原始的item引用关系
     original_items = {id(item): item for item in items}
+
+    # 断点续跑：回填日志中已有的评估结果，这些子问题不再重复评估
+    restored_ids = set()
+    for item in items:
+        for sub_q in item["sub_questions"]:
+            if restore_eval(sub_q, item):
+                restored_ids.add(id(sub_q))
     
     # 按层级处理问题
     for level in range(max_level + 1):
         print(f"\nProcessing level {level} questions...")
         level_questions = questions_by_level[level]
-        processed_count = 0
+        processed_count = len([sub_q for sub_q in level_questions if id(sub_q) in restored_ids])
+        level_questions = [sub_q for sub_q in level_questions if id(sub_q) not in restored_ids]
+
+        # 按需提取：上一层的结果已确定，只提取依赖仍然成立的子问题用到的抓取对象
+        if extract_func is not None:
+            extract_func([sub_q for sub_q in level_questions if needs_extraction(sub_q, level)])
         
         # 处理当前层级的问题
         for i in range(0, len(level_questions), batch_size):
@@ -127,7 +408,13 @@ def process_all_items(items, batch_size=5, rule_based_evaluate_func=None):
             
             # 检查依赖
             for sub_q in batch:
-                if level == 0 or check_dependencies(sub_q, sub_q["_item"]):
+                if level > 0 and has_unevaluated_dependencies(sub_q, sub_q["_item"]):
+                    # 依赖还没有真正的结果，本轮记为失败但不写入断点日志，--resume 时重新评估
+                    sub_q["eval_result"] = 0
+                    sub_q["eval_explanation"] = "Dependencies not evaluated (API error)"
+                    sub_q["eval_method"] = API_ERROR_METHOD
+                    processed_count += 1
+                elif level == 0 or check_dependencies(sub_q, sub_q["_item"]):
                     valid_batch.append(sub_q)
                 else:
                     sub_q["eval_result"] = 0
@@ -145,7 +432,12 @@ def process_all_items(items, batch_size=5, rule_based_evaluate_func=None):
                 if non_rule_batch:
                     model_evaluation(non_rule_batch)
             processed_count += len(valid_batch)
-            print(f"Processed {processed_count}/{len(level_questions)} level {level} questions")
+
+            for sub_q in batch:
+                # 调用失败的子问题不写入断点日志，--resume 时重新评估
+                if sub_q.get("eval_method") != API_ERROR_METHOD:
+                    record_eval(sub_q, sub_q["_item"])
+            print(f"Processed {processed_count}/{len(questions_by_level[level])} level {level} questions")
         
         # 在处理完当前层后，更新剩余层级的item引用
         if level < max_level:
@@ -0,0 +1,65 @@
+"""
+提取和评估prompt的排布方式（--prompt_layout）
+
+EVALUATION_PROMPT、EXTRACTION_PROMPT_MULTI/SINGLE 和两个编程提取模板都是几KB的固定说明和示例，
+后面跟着 "---your turn---" 和本条数据的内容。
+
+- inline（默认）：整个模板 .format() 后作为一条user消息，system消息为空
+- prefix：分隔符之前的固定部分放进system消息，分隔符和本条数据放进后面的user消息。
+  同一模板的所有请求有完全相同的前缀，vLLM / SGLang 的自动前缀缓存可以复用这部分的KV
+
+两种排布的messages不同，响应缓存互不命中。
+"""
+
+PROMPT_LAYOUTS = ("inline", "prefix")
+
+# 模板中固定部分和本条数据之间的分隔符
+TURN_SEPARATOR = "---your turn---"
+
+_layout = "inline"
+
+# 模板 -> (system前缀, 剩余模板)，没有分隔符或固定部分含占位符时为None
+_split_templates = {}
+
+
+def set_prompt_layout(layout):
+    """设置prompt排布方式：inline 或 prefix"""
+    global _layout
+    if layout not in PROMPT_LAYOUTS:
+        raise ValueError(f"Unknown prompt layout '{layout}', expected one of: {', '.join(PROMPT_LAYOUTS)}")
+    _layout = layout
+
+
+def get_prompt_layout():
+    """返回当前的prompt排布方式"""
+    return _layout
+
+
+def _split_template(template):
+    if template not in _split_templates:
+        split = None
+        index = template.find(TURN_SEPARATOR)
+        if index > 0:
+            try:
+                # 固定部分不应含占位符，.format() 只用来还原转义的花括号
+                split = (template[:index].rstrip().format(), template[index:])
+            except (KeyError, IndexError, ValueError):
+                split = None
+        _split_templates[template] = split
+    return _split_templates[template]
+
+
+def render_prompt(template, **fields):
+    """
+    按当前排布方式填充模板
+
+    Returns:
+        inline：prompt字符串
+        prefix：(system前缀, user内容) 元组；模板没有分隔符时退回prompt字符串
+    """
+    if _layout == "prefix":
+        split = _split_template(template)
+        if split is not None:
+            prefix, rest = split
+            return prefix, rest.format(**fields)
+    return template.format(**fields)
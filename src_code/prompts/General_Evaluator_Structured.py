@@ -0,0 +1,14 @@
+# 结构化评估（--judge_mode json / verdict）：接在 EVALUATION_PROMPT 之后，替换原来的输出格式要求。
+# 与 EVALUATION_PROMPT 拼接后仍按 .format() 填充，JSON示例中的花括号需要转义。
+
+JSON_VERDICT_SUFFIX = """
+注意：忽略上面的输出格式，改为只输出一个JSON对象，不要输出任何其他内容：
+{{"verdict": true/false, "reason": "简短的分析"}}
+verdict为true表示【次问题】成立（判断：是），false表示不成立（判断：否）。reason用中文，一两句话即可。
+"""
+
+VERDICT_ONLY_SUFFIX = """
+注意：忽略上面的输出格式，不要输出分析，只输出一个JSON对象：
+{{"verdict": true/false}}
+verdict为true表示【次问题】成立（判断：是），false表示不成立（判断：否）。
+"""
@@ -0,0 +1,17 @@
+# 一次提取同一条目的多个抓取对象（--multi_key_extraction）：替换 EXTRACTION_PROMPT_MULTI / SINGLE 最后的输出格式要求和【评测对象】两行，
+# 仍以【评测对象】结尾。{extraction_prompt} 填入 MULTI_KEY_TARGET 逐行拼成的抓取对象列表；与模板拼接后仍按 .format() 填充，JSON示例中的花括号需要转义。
+
+MULTI_KEY_TARGET = "- {name}：{instruction}"
+
+MULTI_KEY_OUTPUT = """注意：本次的【抓取对象】有多个，每行一个，冒号前的JSON字符串是它的名称。请对每个【抓取对象】分别按照上面的要求抽取评测对象。
+JSON对象的键必须与【抓取对象】的名称完全一致，每个【抓取对象】都要有；值为该对象的评测对象，格式与上面的要求相同（python list，或ALL）：
+{{"名称1": ["对象1", "对象2"], "名称2": ["对象1"]}}
+**请只输出一个是valid JSON的对象，不要输出任何其他解释备注或任何其他内容！**
+【评测对象】
+"""
+
+
+def multi_key_template(general_prompt):
+    """把单对象提取模板最后的输出格式要求和【评测对象】两行换成 MULTI_KEY_OUTPUT"""
+    lines = general_prompt.rstrip("\n").split("\n")
+    return "\n".join(lines[:-2]) + "\n" + MULTI_KEY_OUTPUT
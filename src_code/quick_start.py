@@ -33,6 +33,7 @@ from multi_round_template_added import multi_round_template_added
 from LLM_APIs.qwen_api import set_qwen_config
 from LLM_APIs.qwen_coder_api import set_qwen_coder_config
 from LLM_APIs.tested_model_api import set_tested_model_config, call_tested_model
+from LLM_APIs.llm_client import run_coroutine
 
 
 def test_single_api(client, model_name, api_name):
@@ -40,7 +41,9 @@ def test_single_api(client, model_name, api_name):
     print(f"🔗 Testing {api_name} with model: {model_name}")
 
     try:
-        response = client.chat.completions.create(
+        # 客户端为AsyncOpenAI，在共享的后台事件循环中执行；
+        # llm_client关闭了客户端自带的重试，连通性测试单独允许重试两次，避免偶发的429/5xx误判
+        response = run_coroutine(client.with_options(max_retries=2).chat.completions.create(
             model=model_name,
             messages=[
                 {"role": "system", "content": ""},
@@ -49,7 +52,7 @@ def test_single_api(client, model_name, api_name):
             max_tokens=50,
             temperature=0.00,
             timeout=30
-        )
+        ))
         
         if response.choices and len(response.choices) > 0:
             print(f"✅ {api_name} is working")
@@ -135,22 +138,18 @@ def process_in_batches(data, batch_size=BATCH_SIZE):
         # Print processing progress
         print(f"📊 Processing items {batch_start}-{batch_end-1} out of {total_items} total items...")
 
-        try:
-            # Batch get questions and call model
-            batch_questions = [item["question"] for item in current_batch]
-            batch_responses = call_tested_model(batch_questions)
-
-            # Assign responses back to data items
-            for item, response in zip(current_batch, batch_responses):
-                item["model_response"] = response
-
-        except Exception as e:
-            print(f"❌ Error occurred while processing batch {batch_start}-{batch_end-1}: {str(e)}")
-            print("⚠️  Setting empty responses for failed batch...")
-            # 确保即使API调用失败，也给每个item添加model_response字段
-            for item in current_batch:
-                if "model_response" not in item:
-                    item["model_response"] = ""  # 设置为空字符串，避免后续KeyError
+        # Batch get questions and call model（失败的prompt已在llm_client中单独重试过）
+        batch_questions = [item["question"] for item in current_batch]
+        batch_responses = call_tested_model(batch_questions, return_exceptions=True, stage="generation")
+
+        # Assign responses back to data items
+        for index, (item, response) in enumerate(zip(current_batch, batch_responses)):
+            if isinstance(response, BaseException):
+                print(f"❌ Error occurred while processing item {batch_start + index}: {str(response)}")
+                # 设置为空字符串，避免后续KeyError，同批其他条目不受影响
+                item["model_response"] = ""
+                continue
+            item["model_response"] = response
 
 def iferror(item):
     """检查是否有评估错误"""
@@ -0,0 +1,298 @@
+"""
+规则注册表
+
+rule_based_evaluate 原先用一长串 if/elif rule.startswith(...) 分发规则：
+每个子问题都要从头比较到命中为止，并且靠分支顺序决定优先级，
+短前缀写在前面时会吞掉长前缀（例如 has_dakuten_count 吞掉 has_dakuten_count_range）。
+
+现在每条规则用装饰器登记自己的规则头和参数解析器：
+
+    @RULES.register("any_keywords", int_param(1), list_param)
+    def _any_keywords(item, model_response, num, values):
+        ...
+
+分发时在前缀树上对规则字符串做最长前缀匹配，耗时只与规则字符串长度有关，与规则数量无关，
+也不再依赖登记顺序。亚洲语言和英语/多语言两个前端各自持有一个RuleRegistry实例，共用同一套机制。
+
+同一条规则字符串会在成千上万个子问题中重复出现，因此规则先被编译成CompiledRule
+（规则头、数字参数、列表参数、语言）并按字符串缓存，参数只解析一次。
+数据加载时可以用 check_rules() 预先编译所有规则，格式错误的规则直接报出来。
+"""
+
+import copy
+import re
+import threading
+from collections import Counter
+
+from .utils import txt_to_json_og
+
+# 注册表名称 -> RuleRegistry
+_registries = {}
+
+# 前缀树中标记"此处是一个完整规则头"的键
+_END = ""
+
+
+def raw_rule(rule, head):
+    """参数解析器：原样传入规则字符串"""
+    return rule
+raw_rule.kind = "raw"
+
+
+def list_param(rule, head):
+    """参数解析器：规则中的列表参数，例如 each_length:[5,5] -> [5, 5]"""
+    return txt_to_json_og(rule)
+list_param.kind = "list"
+
+
+def suffix_param(rule, head):
+    """参数解析器：第一个冒号之后的全部内容，例如 arabic_dual_noun_total:[2,5] -> "[2,5]"，没有冒号时为空串"""
+    parts = rule.split(":", 1)
+    return parts[1] if len(parts) > 1 else ""
+suffix_param.kind = "raw"
+
+
+def language_param(rule, head):
+    """参数解析器：规则头后的语言段，例如 mixed_language_each_length:english:[10,20] -> "english" """
+    return rule.split(":")[1]
+language_param.kind = "language"
+
+
+def int_param(default, sep=""):
+    """
+    参数解析器工厂：规则头后面紧跟的整数
+
+    例如 int_param(1) 解析 word_freq3 -> 3，int_param(0, ":") 解析 has_xxx:2 -> 2，
+    没有写数字时返回default。
+    """
+    def parse(rule, head):
+        match = re.search(re.escape(head) + re.escape(sep) + r'(\d+)', rule)
+        return int(match.group(1)) if match else default
+    parse.__name__ = f"int_param({default}, {sep!r})"
+    parse.kind = "number"
+    return parse
+
+
+class UnknownRuleError(KeyError):
+    """规则字符串没有匹配到任何已登记的规则头"""
+
+
+class RuleSpec:
+    """一条已登记的规则"""
+
+    def __init__(self, head, func, parsers, exact=False, ignore_case=False):
+        self.head = head
+        self.func = func
+        self.parsers = parsers
+        self.exact = exact
+        self.ignore_case = ignore_case
+
+    def compile(self, rule):
+        """解析规则参数，返回CompiledRule；解析失败时把异常记录在CompiledRule.error中"""
+        try:
+            args = tuple(parser(rule, self.head) for parser in self.parsers)
+        except Exception as e:
+            return CompiledRule(rule, self, error=e)
+        return CompiledRule(rule, self, args)
+
+
+class CompiledRule:
+    """
+    编译后的规则
+
+    Attributes:
+        rule: 原始规则字符串
+        head: 命中的规则头
+        args: 传给规则函数的全部参数（按解析器顺序）
+        numbers: 数字参数，例如 word_freq3 -> (3,)
+        lists: 列表参数，例如 each_length:[5,5] -> ([5, 5],)
+        language: 语言参数，例如 mixed_language_each_length:english:[10,20] -> "english"
+        error: 参数解析失败时的异常，否则为None
+    """
+
+    __slots__ = ("rule", "spec", "args", "error", "numbers", "lists", "language")
+
+    def __init__(self, rule, spec, args=(), error=None):
+        self.rule = rule
+        self.spec = spec
+        self.args = args
+        self.error = error
+        self.numbers = ()
+        self.lists = ()
+        self.language = None
+        if error is None:
+            kinds = [getattr(parser, "kind", "raw") for parser in spec.parsers]
+            self.numbers = tuple(arg for kind, arg in zip(kinds, args) if kind == "number")
+            self.lists = tuple(arg for kind, arg in zip(kinds, args) if kind == "list")
+            self.language = next((arg for kind, arg in zip(kinds, args) if kind == "language"), None)
+
+    @property
+    def head(self):
+        return self.spec.head
+
+    def __call__(self, item, model_response):
+        if self.error is not None:
+            # 重新解析一次，让异常带着解析器自己的堆栈抛出
+            for parser in self.spec.parsers:
+                parser(self.rule, self.head)
+            raise self.error
+        # 列表参数在多个子问题间共享，复制一份，避免规则函数原地修改后污染缓存
+        args = [copy.deepcopy(arg) if isinstance(arg, (list, dict)) else arg for arg in self.args]
+        return self.spec.func(item, model_response, *args)
+
+    def __repr__(self):
+        return (f"CompiledRule(head={self.head!r}, numbers={self.numbers!r}, "
+                f"lists={self.lists!r}, language={self.language!r})")
+
+
+class RuleRegistry:
+    """规则头 -> 规则函数 的注册表，按最长前缀分发"""
+
+    def __init__(self, name):
+        self.name = name
+        self._rules = {}
+        self._exact = {}
+        self._trie = {}
+        self._trie_lower = {}
+        self._lock = threading.Lock()
+        # 规则字符串 -> CompiledRule
+        self._compiled = {}
+        # 每个规则头被分发的次数，可直接用于统计规则分布
+        self.counts = Counter()
+        _registries[name] = self
+
+    def register(self, head, *parsers, exact=False, ignore_case=False):
+        """
+        装饰器：登记一条规则
+
+        Args:
+            head: 规则头，例如 "each_length"
+            *parsers: 参数解析器，依次对规则字符串求值，结果按顺序作为位置参数传给规则函数
+            exact: 规则字符串必须与head完全相同
+            ignore_case: 前缀匹配时忽略大小写
+        """
+        def decorator(func):
+            if head in self._rules:
+                raise ValueError(f"Rule '{head}' already registered in '{self.name}'")
+            spec = RuleSpec(head, func, parsers, exact, ignore_case)
+            self._rules[head] = spec
+            if exact:
+                self._exact[head] = spec
+            else:
+                node = self._trie_lower if ignore_case else self._trie
+                for char in (head.lower() if ignore_case else head):
+                    node = node.setdefault(char, {})
+                node[_END] = spec
+            return func
+        return decorator
+
+    @staticmethod
+    def _longest_prefix(trie, rule):
+        node, found = trie, None
+        for char in rule:
+            node = node.get(char)
+            if node is None:
+                break
+            if _END in node:
+                found = node[_END]
+        return found
+
+    def lookup(self, rule):
+        """返回匹配规则字符串的RuleSpec，未登记时返回None"""
+        spec = self._exact.get(rule)
+        if spec is not None:
+            return spec
+        spec = self._longest_prefix(self._trie, rule)
+        if self._trie_lower:
+            spec_lower = self._longest_prefix(self._trie_lower, rule.lower())
+            if spec_lower is not None and (spec is None or len(spec_lower.head) > len(spec.head)):
+                spec = spec_lower
+        return spec
+
+    def dispatch(self, item, rule, model_response):
+        """
+        分发并执行一条规则
+
+        Returns:
+            规则函数的返回值
+
+        Raises:
+            UnknownRuleError: 规则未登记
+        """
+        compiled = self.compile(rule)
+        if compiled is None:
+            raise UnknownRuleError(rule)
+        with self._lock:
+            self.counts[compiled.head] += 1
+        return compiled(item, model_response)
+
+    def compile(self, rule):
+        """
+        编译规则字符串（结果按字符串缓存）
+
+        Returns:
+            CompiledRule；规则未登记时返回None
+        """
+        compiled = self._compiled.get(rule, False)
+        if compiled is not False:
+            return compiled
+        spec = self.lookup(rule)
+        compiled = spec.compile(rule) if spec is not None else None
+        self._compiled[rule] = compiled
+        return compiled
+
+    def check_rules(self, rules):
+        """
+        预先编译一批规则，返回有问题的规则
+
+        Args:
+            rules: 规则字符串的可迭代对象（可以重复）
+
+        Returns:
+            [(规则字符串, 错误描述), ...]，全部合法时为空列表
+        """
+        problems = []
+        seen = set()
+        for rule in rules:
+            if not isinstance(rule, str):
+                problems.append((rule, f"规则必须是字符串，实际为 {type(rule).__name__}"))
+                continue
+            if rule in seen:
+                continue
+            seen.add(rule)
+            compiled = self.compile(rule)
+            if compiled is None:
+                problems.append((rule, "未识别的规则"))
+            elif compiled.error is not None:
+                problems.append((rule, f"参数解析失败: {type(compiled.error).__name__}: {compiled.error}"))
+        return problems
+
+    def list_rules(self):
+        """返回所有已登记的规则头（按字母序）"""
+        return sorted(self._rules)
+
+    def __contains__(self, head):
+        return head in self._rules
+
+    def __len__(self):
+        return len(self._rules)
+
+
+def get_registry(name):
+    """按名称返回注册表，未创建时返回None"""
+    return _registries.get(name)
+
+
+def list_rules(name=None):
+    """
+    列出已登记的规则
+
+    Args:
+        name: 注册表名称，为None时列出所有注册表
+
+    Returns:
+        {注册表名称: [规则头, ...]}
+    """
+    if name is not None:
+        return {name: _registries[name].list_rules()}
+    return {registry_name: registry.list_rules() for registry_name, registry in _registries.items()}
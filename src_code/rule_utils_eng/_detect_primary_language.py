@@ -1,34 +1,24 @@
 # 需要安装: pip install lingua-language-detector
 import re
 
-try:
-    from lingua import Language, LanguageDetectorBuilder
-    lingua_AVAILABLE = True
-except ImportError:
-    lingua_AVAILABLE = False
-    print("lingua库未安装，正在自动安装...")
-    try:
-        import subprocess
-        import sys
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "lingua-language-detector"])
-        print("lingua库安装成功，正在导入...")
-        from lingua import Language, LanguageDetectorBuilder
-        lingua_AVAILABLE = True
-        print("✅ lingua库已成功导入")
-    except Exception as e:
-        print(f"❌ 自动安装失败: {e}")
-        print("请手动运行: pip install lingua-language-detector")
-        lingua_AVAILABLE = False
+from src_code.nlp_backends import backend, import_or_install
+
 
 # 创建语言检测器
-if lingua_AVAILABLE:
+@backend("lingua")
+def _load_detector():
+    """lingua 语言检测器"""
+    if import_or_install("lingua", "lingua-language-detector", mirror=False) is None:
+        return None
+    from lingua import Language, LanguageDetectorBuilder
     languages = [
         Language.CHINESE, Language.JAPANESE, Language.KOREAN, 
         Language.ARABIC, Language.RUSSIAN, Language.ENGLISH,
         Language.SPANISH, Language.FRENCH, Language.ITALIAN, 
         Language.PORTUGUESE, Language.GERMAN
     ]
-    detector = LanguageDetectorBuilder.from_languages(*languages).build()
+    return LanguageDetectorBuilder.from_languages(*languages).build()
+
 
 def detect_primary_language(text):
     """
@@ -44,7 +34,8 @@ def detect_primary_language(text):
             return 'en'
         return result
     
-    if not lingua_AVAILABLE:
+    detector = _load_detector()
+    if detector is None:
         result = detect_by_character_features(text)
         if result in ['zh', 'ar']:
             return 'en'
@@ -61,6 +52,7 @@ def detect_primary_language(text):
             return result
         
         # 映射到我们支持的语言代码
+        from lingua import Language
         lang_mapping = {
             Language.CHINESE: 'zh',
             Language.JAPANESE: 'ja',
@@ -1,59 +1,6 @@
 import re
 
-# 尝试导入 HanTa 库
-try:
-    from HanTa import HanoverTagger as ht
-    tagger = ht.HanoverTagger('morphmodel_ger.pgz')
-    HANTA_AVAILABLE = True
-except ImportError:
-    HANTA_AVAILABLE = False
-    print("HanTa库未安装，正在自动安装...")
-    try:
-        import subprocess
-        import sys
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "HanTa", "-i", "https://pypi.tuna.tsinghua.edu.cn/simple"])
-        print("HanTa库安装成功，正在导入...")
-        from HanTa import HanoverTagger as ht
-        tagger = ht.HanoverTagger('morphmodel_ger.pgz')
-        HANTA_AVAILABLE = True
-        print("✅ HanTa库已成功导入")
-    except Exception as e:
-        print(f"❌ HanTa自动安装失败: {e}")
-        print("请手动运行: pip install HanTa")
-        HANTA_AVAILABLE = False
-        tagger = None
-except Exception as e:
-    print(f"❌ HanTa初始化失败: {e}")
-    HANTA_AVAILABLE = False
-    tagger = None
-
-# 使用 HanTa 或正则表达式来分割词汇
-
-def split_words(text):
-    """
-    使用 HanTa 库或正则表达式分割德语文本为单词
-    HanTa 可以更准确地识别德语单词边界
-    """
-    if HANTA_AVAILABLE and tagger is not None:
-        try:
-            # 使用 HanTa 进行分词
-            # HanTa 返回 (word, lemma, pos_tag) 三元组列表
-            tokens = tagger.tag_sent(text.split())
-            # 提取单词部分
-            words = []
-            for token in tokens:
-                if isinstance(token, tuple) and len(token) >= 1:
-                    words.append(token[0])  # 第一个元素是原始单词
-                else:
-                    words.append(str(token))
-            return words
-        except Exception as e:
-            # 如果 HanTa 失败，回退到正则表达式
-            pass
-    
-    # 备用方法：使用正则表达式匹配单词（包括带连字符的复合词）
-    words = re.findall(r'\b[\w\-]+\b', text, re.UNICODE)
-    return words
+from rule_utils_eng.german_morphology import split_words, is_available, tag_sent
 
 def check_imperative_sentence(expected_count, model_response):
     imperative_count = 0  # 用于统计祈使句的数量
@@ -118,7 +65,7 @@ def check_formal_imperative_sentence(expected_count, model_response):
     """
     valid_formal_imperative_sentences = set()  # 用于存储符合尊称祈使句的句子
     
-    if HANTA_AVAILABLE and tagger is not None:
+    if is_available():
         # 使用 HanTa 库进行词性标注
         for sentence in model_response:
             try:
@@ -129,7 +76,7 @@ def check_formal_imperative_sentence(expected_count, model_response):
                 
                 # 对句子进行分词和标注
                 words = sentence.split()
-                tags = tagger.tag_sent(words)
+                tags = tag_sent(words)
                 
                 # 过滤掉标点符号
                 non_punct_tags = []
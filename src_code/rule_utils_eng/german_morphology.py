@@ -0,0 +1,87 @@
+"""
+德语形态分析服务（HanTa）
+
+以前每个德语规则模块在导入时各自创建一个 HanoverTagger，
+加载 morphmodel_ger.pgz 要好几秒，八个模块就加载八次；
+而同一条回答又会被连续几条德语规则重复标注。
+
+现在整个进程只在第一次需要时创建一个 tagger，所有德语规则模块共用，
+tag_sent 的结果按句子（单词序列）缓存。
+"""
+
+import re
+from functools import lru_cache
+
+from src_code.nlp_backends import backend, import_or_install
+
+# tag_sent 缓存的句子数
+TAG_CACHE_SIZE = 8192
+
+
+@backend("hanta")
+def _load_tagger():
+    """创建 HanoverTagger，HanTa 未安装时尝试自动安装"""
+    if import_or_install("HanTa") is None:
+        return None
+    from HanTa import HanoverTagger as ht
+    return ht.HanoverTagger('morphmodel_ger.pgz')
+
+
+def get_tagger():
+    """返回共享的 HanoverTagger，HanTa 不可用时返回None"""
+    return _load_tagger()
+
+
+def is_available():
+    """HanTa 是否可用（第一次调用时会创建 tagger）"""
+    return get_tagger() is not None
+
+
+@lru_cache(maxsize=TAG_CACHE_SIZE)
+def _tag_sent_cached(words):
+    return tuple(get_tagger().tag_sent(list(words)))
+
+
+def tag_sent(words):
+    """
+    对单词序列做词性标注，结果按单词序列缓存
+
+    Args:
+        words: 单词列表
+
+    Returns:
+        [(word, lemma, pos_tag), ...]，每次返回新列表，调用方可以随意修改
+
+    Raises:
+        RuntimeError: HanTa 不可用
+    """
+    if get_tagger() is None:
+        raise RuntimeError("HanTa不可用")
+    return list(_tag_sent_cached(tuple(words)))
+
+
+def split_words(text):
+    """
+    使用 HanTa 库或正则表达式分割德语文本为单词
+    HanTa 可以更准确地识别德语单词边界
+    """
+    if is_available():
+        try:
+            # 使用 HanTa 进行分词
+            # HanTa 返回 (word, lemma, pos_tag) 三元组列表
+            tokens = tag_sent(text.split())
+            # 提取单词部分
+            words = []
+            for token in tokens:
+                if isinstance(token, tuple) and len(token) >= 1:
+                    words.append(token[0])  # 第一个元素是原始单词
+                else:
+                    words.append(str(token))
+            return words
+        except Exception as e:
+            # 如果 HanTa 失败，回退到正则表达式
+            pass
+
+    # 备用方法：使用正则表达式匹配单词（包括带连字符的复合词）
+    words = re.findall(r'\b[\w\-]+\b', text, re.UNICODE)
+    return words
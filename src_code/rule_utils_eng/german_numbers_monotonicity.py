@@ -151,34 +151,35 @@ def check_number_monotonicity(model_response):
         # 提供更详细的错误信息
         return False, f"❌ 数字既不是递增也不是递减。序列为：{numbers}"
 
-# 示例：模型输出的数字书写形式列表
-# # (递增)
-model_response1 = [
-    "einunddreißig",  # 31 
-    "einundzwanzigtausenddreihundertfünfundvierzig", # 21345 
-    "einhunderteinundzwanzigtausenddreihundertneunundsechzig"  # 121369
-]
+if __name__ == "__main__":
+    # 示例：模型输出的数字书写形式列表
+    # # (递增)
+    model_response1 = [
+        "einunddreißig",  # 31 
+        "einundzwanzigtausenddreihundertfünfundvierzig", # 21345 
+        "einhunderteinundzwanzigtausenddreihundertneunundsechzig"  # 121369
+    ]
 
-# 递减
-model_response2 = [
-    "Einhunderteinundzwanzigtausenddreihundertneunundsechzig",  # 121369 
-    "einundzwanzigtausenddreihundertfünfundvierzig",  # 21345 
-    "einunddreißig"  # 31
-]
+    # 递减
+    model_response2 = [
+        "Einhunderteinundzwanzigtausenddreihundertneunundsechzig",  # 121369 
+        "einundzwanzigtausenddreihundertfünfundvierzig",  # 21345 
+        "einunddreißig"  # 31
+    ]
 
-# 不单调
-model_response3 = [
-    "einunddreißig",  # 31
-    "Einhunderteinundzwanzigtausenddreihundertneunundsechzig",  # 121369 
-    "einundzwanzigtausenddreihundertfünfundvierzig",  # 21345
-    "neunhunderteinsundzwanzigtausendsechshundertachtundzwanzig" 
-]
+    # 不单调
+    model_response3 = [
+        "einunddreißig",  # 31
+        "Einhunderteinundzwanzigtausenddreihundertneunundsechzig",  # 121369 
+        "einundzwanzigtausenddreihundertfünfundvierzig",  # 21345
+        "neunhunderteinsundzwanzigtausendsechshundertachtundzwanzig" 
+    ]
 
-# 调用函数进行单调性检查
-is_monotonic1 = check_number_monotonicity(model_response1)
-is_monotonic2 = check_number_monotonicity(model_response2)
-is_monotonic3 = check_number_monotonicity(model_response3)
+    # 调用函数进行单调性检查
+    is_monotonic1 = check_number_monotonicity(model_response1)
+    is_monotonic2 = check_number_monotonicity(model_response2)
+    is_monotonic3 = check_number_monotonicity(model_response3)
 
-print("检查结果1:", is_monotonic1)
-print("检查结果2:", is_monotonic2)
-print("检查结果3:", is_monotonic3)
+    print("检查结果1:", is_monotonic1)
+    print("检查结果2:", is_monotonic2)
+    print("检查结果3:", is_monotonic3)
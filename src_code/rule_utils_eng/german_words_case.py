@@ -18,12 +18,11 @@ def check_words_case(expected_count, model_response):
     valid_word_str = ", ".join(valid_words)
     return True, f"✅ 全部单词符合阳性弱变化名词的第二、三、四格形态：{valid_word_str}"
 
-# 测试数据
-word_list = ["Arzten", "Krankenpflegern", "Apotheker"]  # 示例单词，注意 Apothekern 不符合
-expected_count = [3,3]  # 期望的数量
-
-# 检查列表中的所有单词是否都以"n"结尾，且数量正确
-result = check_words_case(expected_count, word_list)
-print(result)
-
+if __name__ == "__main__":
+    # 测试数据
+    word_list = ["Arzten", "Krankenpflegern", "Apotheker"]  # 示例单词，注意 Apothekern 不符合
+    expected_count = [3,3]  # 期望的数量
 
+    # 检查列表中的所有单词是否都以"n"结尾，且数量正确
+    result = check_words_case(expected_count, word_list)
+    print(result)
@@ -3,237 +3,11 @@ import unicodedata
 from math import gcd
 from collections import Counter,defaultdict
 
-import sys
-
-import subprocess
 import os
-# ===== 第一部分：先安装 transformers 4.51.3（最高优先级） =====
-try:
-    import transformers
-    required_version = "4.51.3"
-    current_version = transformers.__version__
-    
-    if current_version == required_version:
-        transformers_AVAILABLE = True
-        print(f"✅ transformers库已安装，版本: {current_version}")
-    else:
-        print(f"⚠️ transformers版本不匹配，当前: {current_version}，需要: {required_version}")
-        raise ImportError("版本不匹配")
-        
-except ImportError:
-    transformers_AVAILABLE = False
-    print("transformers库未安装或版本不匹配，正在自动安装...")
-    try:
-        # 卸载旧版本
-        print("正在卸载旧版本...")
-        subprocess.run([
-            sys.executable, "-m", "pip", "uninstall", 
-            "transformers", "tokenizers", "-y"
-        ], check=False, capture_output=True)
-        
-        # 安装新版本
-        print("正在安装transformers==4.51.3...")
-        subprocess.check_call([
-            sys.executable, "-m", "pip", "install",
-            "transformers==4.51.3",
-            "tokenizers==0.19.1",
-            "--no-cache-dir",
-            "--force-reinstall",
-            "-i", "https://pypi.tuna.tsinghua.edu.cn/simple"
-        ])
-        
-        # 清除模块缓存
-        print("正在清除模块缓存...")
-        modules_to_remove = [key for key in sys.modules.keys() if 'transformers' in key or 'tokenizers' in key]
-        for module in modules_to_remove:
-            del sys.modules[module]
-        
-        # 重新导入
-        print("正在重新导入transformers...")
-        import transformers
-        import importlib
-        importlib.reload(transformers)
-        
-        new_version = transformers.__version__
-        if new_version == "4.51.3":
-            transformers_AVAILABLE = True
-            print(f"✅ transformers库已成功更新，版本: {new_version}")
-        else:
-            print(f"⚠️ 版本仍然不匹配: {new_version}")
-            print("请重启Python运行时后再次运行此代码")
-            transformers_AVAILABLE = False
-            
-    except Exception as e:
-        print(f"❌ 自动安装失败: {e}")
-        print("请手动运行: pip install transformers==4.51.3 tokenizers==0.19.1")
-        print("然后重启Python运行时")
-        transformers_AVAILABLE = False
-
 
-# ===== 第二部分：安装 camel_tools（使用 --no-dependencies） =====
-try:
-    import camel_tools
-    camel_tools_AVAILABLE = True
-    print(f"✅ camel_tools已安装，版本: {camel_tools.__version__}")
-except ImportError:
-    camel_tools_AVAILABLE = False
-    print("camel_tools库未安装，正在自动安装...")
-    try:
-        # 关键：使用 --no-dependencies 避免降级 transformers
-        subprocess.check_call([
-            sys.executable, "-m", "pip", "install", 
-            "camel-tools", 
-            "--no-dependencies",
-            "-i", "https://pypi.tuna.tsinghua.edu.cn/simple"
-        ])
-        print("camel_tools库安装成功")
-        import camel_tools
-        camel_tools_AVAILABLE = True
-    except Exception as e:
-        print(f"❌ 自动安装失败: {e}")
-        camel_tools_AVAILABLE = False
+from src_code.nlp_backends import backend, import_or_install
 
-try:
-    import tqdm
-    tqdm_AVAILABLE = True
-    print(f"✅ tqdm已安装，当前版本: {tqdm.__version__}")
-    
-    # 如果需要强制安装特定版本
-    required_version = "4.64.0"
-    if tqdm.__version__ != required_version:
-        print(f"⚠️ 版本不匹配，正在安装 {required_version}...")
-        raise ImportError("需要重新安装")
-        
-except ImportError:
-    tqdm_AVAILABLE = False
-    print("正在安装 tqdm==4.64.0...")
-    try:
-        subprocess.check_call([
-            sys.executable, "-m", "pip", "install", 
-            "tqdm==4.64.0",
-            "--no-dependencies",
-            "--force-reinstall",  # 强制重装
-            "-i", "https://pypi.tuna.tsinghua.edu.cn/simple"
-        ])
-        print("✅ tqdm==4.64.0 安装成功")
-        import tqdm
-        tqdm_AVAILABLE = True
-    except Exception as e:
-        print(f"❌ 自动安装失败: {e}")
-        tqdm_AVAILABLE = False
-
-
-# ===== 第三部分：手动安装 camel_tools 的所有依赖（除了 transformers） =====
-if camel_tools_AVAILABLE:
-    print("\n检查并安装 camel_tools 依赖...")
-    
-    # camel_tools 的完整依赖列表（从你的 pip install 输出中提取）
-    camel_deps = {
-        'future': 'future',
-        'six': 'six',
-        'docopt': 'docopt',
-        'cachetools': 'cachetools<=6.0.0',
-        'numpy': 'numpy<2',
-        'scipy': 'scipy',
-        'pandas': 'pandas',
-        'sklearn': 'scikit-learn',
-        'dill': 'dill',
-        'torch': 'torch>=2.0',
-        'editdistance': 'editdistance',
-        'requests': 'requests',
-        'emoji': 'emoji',
-        'pyrsistent': 'pyrsistent',
-        'tabulate': 'tabulate',
-        'tqdm': 'tqdm',
-        'muddler': 'muddler',
-        'camel_kenlm': 'camel-kenlm<=2025.09.16',
-    }
-    
-    missing_deps = []
-    for module_name, package_spec in camel_deps.items():
-        try:
-            if module_name == 'sklearn':
-                __import__('sklearn')
-            elif module_name == 'camel_kenlm':
-                __import__('camel_kenlm')
-            else:
-                __import__(module_name)
-        except ImportError:
-            missing_deps.append(package_spec)
-    
-    if missing_deps:
-        print(f"发现缺失的依赖: {', '.join(missing_deps)}")
-        print("正在安装...")
-        
-        try:
-            subprocess.check_call([
-                sys.executable, "-m", "pip", "install",
-                *missing_deps,
-                "-i", "https://pypi.tuna.tsinghua.edu.cn/simple"
-            ])
-            print("✅ 依赖安装完成")
-        except Exception as e:
-            print(f"⚠️ 部分依赖安装失败: {e}")
-            print("请手动安装: pip install " + " ".join(missing_deps))
-    else:
-        print("✅ 所有依赖已满足")
-
-
-# ===== 第四部分：验证 transformers 版本未被降级 =====
-print("\n验证 transformers 版本...")
-try:
-    import transformers
-    current_version = transformers.__version__
-    if current_version == "4.51.3":
-        print(f"✅ transformers 版本正确: {current_version}")
-    else:
-        print(f"⚠️ transformers 版本被降级为: {current_version}")
-        print("需要重新安装 transformers 4.51.3")
-        
-        # 重新安装
-        subprocess.run([
-            sys.executable, "-m", "pip", "uninstall", 
-            "transformers", "tokenizers", "-y"
-        ], check=False, capture_output=True)
-        
-        subprocess.check_call([
-            sys.executable, "-m", "pip", "install",
-            "transformers==4.51.3",
-            "tokenizers==0.19.1",
-            "--force-reinstall",
-            "-i", "https://pypi.tuna.tsinghua.edu.cn/simple"
-        ])
-        print("✅ transformers 已重新安装为 4.51.3")
-        print("⚠️ 请重启 Python 运行时")
-except Exception as e:
-    print(f"❌ 验证失败: {e}")
-
-
-# ===== 第五部分：安装 naftawayh =====
-try:
-    import naftawayh
-    naftawayh_AVAILABLE = True
-    print("✅ naftawayh库已安装")
-except ImportError:
-    naftawayh_AVAILABLE = False
-    print("naftawayh库未安装，正在自动安装...")
-    try:
-        subprocess.check_call([
-            sys.executable, "-m", "pip", "install", 
-            "naftawayh", 
-            "-i", "https://pypi.tuna.tsinghua.edu.cn/simple"
-        ])
-        print("naftawayh库安装成功，正在导入...")
-        import naftawayh
-        naftawayh_AVAILABLE = True
-        print("✅ naftawayh库已成功导入")
-    except Exception as e:
-        print(f"❌ 自动安装失败: {e}")
-        print("请手动运行: pip install naftawayh")
-        naftawayh_AVAILABLE = False
-
-
-# ===== 第六部分：配置 Camel 数据库路径 =====
+# ===== 配置 Camel 数据库路径 =====
 # 自动检测多个可能的路径，兼容不同用户环境
 def get_camel_data_base():
     """自动检测 Camel Tools 数据库路径"""
@@ -262,7 +36,6 @@ CAMEL_DATA_BASE = get_camel_data_base()
 MORPHOLOGY_DB_FILE = os.path.join(CAMEL_DATA_BASE, "data/morphology_db/calima-msa-r13/morphology.db")
 DISAMBIG_MODEL_FILE = os.path.join(CAMEL_DATA_BASE, "data/disambig_mle/calima-msa-r13/model.json")
 
-print(f"\n配置的数据库基础路径: {CAMEL_DATA_BASE}")
 
 
 def verify_camel_data():
@@ -298,10 +71,6 @@ def verify_camel_data():
 
 def load_camel_components():
     """加载 Camel Tools 组件"""
-    if not camel_tools_AVAILABLE:
-        print("❌ camel_tools 库未成功导入，无法加载组件")
-        return None, None, None
-    
     try:
         from camel_tools.morphology.database import MorphologyDB
         from camel_tools.morphology.analyzer import Analyzer
@@ -380,57 +149,46 @@ def test_camel_tools(analyzer, disambiguator):
         return False
 
 
-# ===== 主执行流程 =====
-print("\n" + "="*60)
-print("初始化流程")
-print("="*60)
+# ===== 主执行流程（第一次使用阿语规则时执行） =====
+# transformers、tqdm 等 camel_tools 依赖的版本由 install_deps.sh 负责安装
+@backend("camel_tools")
+def _camel_components():
+    """检查 camel_tools、验证数据库文件并加载组件，返回 (morphology_db, analyzer, disambiguator)"""
+    if import_or_install("camel_tools", "camel-tools", pip_args=("--no-dependencies",)) is None:
+        return None, None, None
 
-morphology_db = None
-analyzer = None
-disambiguator = None
+    print(f"\n配置的数据库基础路径: {CAMEL_DATA_BASE}")
+    print("\n" + "="*60)
+    print("初始化流程")
+    print("="*60)
 
-data_files_exist = verify_camel_data()
+    if not verify_camel_data():
+        print("\n❌ 数据库文件验证失败")
+        return None, None, None
 
-if data_files_exist:
-    morphology_db, analyzer, disambiguator = load_camel_components()
-    
-    if analyzer and disambiguator:
+    components = load_camel_components()
+    if components[1] and components[2]:
         print("\n✅ 初始化完成")
-        print("\n可用组件:")
-        print("  - morphology_db: 形态学数据库")
-        print("  - analyzer: 词形分析器")
-        print("  - disambiguator: 句子消歧器")
     else:
         print("\n❌ 组件加载失败")
-else:
-    print("\n❌ 数据库文件验证失败")
-
-__all__ = [
-    'camel_tools_AVAILABLE',
-    'transformers_AVAILABLE', 
-    'naftawayh_AVAILABLE',
-    'morphology_db',
-    'analyzer',
-    'disambiguator'
-]
+    return components
 
-from camel_tools.morphology.database import MorphologyDB
-from camel_tools.morphology.analyzer import Analyzer
-from camel_tools.disambig.mle import MLEDisambiguator
 
-
-print("\n" + "="*60)
-print("初始化脚本执行完毕")
-print("="*60)
+# ===== 全局数据库实例管理 =====
+def _camel_component(index):
+    """返回 _camel_components() 中的一个组件，加载失败时为None"""
+    components = _camel_components()
+    return components[index] if components else None
 
 
-# ===== 全局数据库实例管理 =====
 def get_morphology_db():
     """
     获取形态学数据库实例（单例模式）
     优先使用自定义路径，失败则回退到内置数据库
     """
     if not hasattr(get_morphology_db, '_db_instance'):
+        from camel_tools.morphology.database import MorphologyDB
+        morphology_db = _camel_component(0)
         try:
             # 尝试使用自定义路径
             if morphology_db is not None:
@@ -456,6 +214,8 @@ def get_analyzer():
     获取分析器实例（单例模式）
     """
     if not hasattr(get_analyzer, '_analyzer_instance'):
+        from camel_tools.morphology.analyzer import Analyzer
+        analyzer = _camel_component(1)
         try:
             # 优先使用全局analyzer
             if analyzer is not None:
@@ -479,6 +239,8 @@ def get_disambiguator():
     获取消歧器实例（单例模式）
     """
     if not hasattr(get_disambiguator, '_disambiguator_instance'):
+        from camel_tools.disambig.mle import MLEDisambiguator
+        disambiguator = _camel_component(2)
         try:
             # 优先使用全局disambiguator
             if disambiguator is not None:
@@ -1511,8 +1273,7 @@ def check_arabic_definite_article_core(corresponding_parts, rule_params, mode="t
     """检查阿拉伯语定冠词"ال"的使用"""
     
     # 初始化camel工具
-    db = get_morphology_db()
-    analyzer = Analyzer(db)
+    analyzer = get_analyzer()
     
     # ✅ 固定短语列表（只包含完整短语）
     FIXED_PHRASES_WITH_AL = {
@@ -2146,8 +1907,7 @@ def check_ar_present_third_masculine_singular_verb_fixed(corresponding_parts, ru
         
         try:
             if not hasattr(detect_present_verbs_fixed, 'analyzer'):
-                db = get_morphology_db()
-                detect_present_verbs_fixed.analyzer = Analyzer(db)
+                detect_present_verbs_fixed.analyzer = get_analyzer()
             
             analyzer = detect_present_verbs_fixed.analyzer
             found_verbs = []
@@ -2640,8 +2400,7 @@ def check_ar_broken_plurals_simple(corresponding_parts, rule_params, mode="total
     def analyze_broken_plurals(words):
         try:
             if not hasattr(analyze_broken_plurals, 'analyzer'):
-                db = get_morphology_db()
-                analyze_broken_plurals.analyzer = Analyzer(db)
+                analyze_broken_plurals.analyzer = get_analyzer()
             
             analyzer = analyze_broken_plurals.analyzer
         except:
@@ -3198,8 +2957,7 @@ def arabic_idafa_structure_v4(corresponding_parts, rule_params, mode="total"):
         
         # 初始化
         if not hasattr(analyze_definite_structure, 'analyzer'):
-            db = get_morphology_db()
-            analyze_definite_structure.analyzer = Analyzer(db)
+            analyze_definite_structure.analyzer = get_analyzer()
         
         analyzer = analyze_definite_structure.analyzer
         
@@ -8,84 +8,28 @@ from math import gcd
 
 
 
-try:
-    import verbecc
-    verbecc_AVAILABLE = True
-except ImportError:
-    verbecc_AVAILABLE = False
-    print("verbecc库未安装，正在自动安装...")
-    try:
-        import subprocess
-        import sys
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "verbecc"])
-        print("verbecc库安装成功，正在导入...")
-        import verbecc
-        verbecc_AVAILABLE = True
-        print("✅ verbecc库已成功导入")
-    except Exception as e:
-        print(f"❌ 自动安装失败: {e}")
-        print("请手动运行: pip install verbecc")
-        verbecc_AVAILABLE = False
-
-
-# 确保 verbecc 已成功导入后再执行后续代码
-if verbecc_AVAILABLE:
-    try:
-        from verbecc import Conjugator
-        print("✅ 所需Conjugator模块导入成功")
-    except ImportError as e:
-        print(f"❌ 导入Conjugator模块失败: {e}")
-else:
-    print("❌ verbecc 库未成功导入，无法继续执行后续代码")
-
-
-
-try:
-    import haspirater
-    haspirater_AVAILABLE = True
-except ImportError:
-    haspirater_AVAILABLE = False
-    print("haspirater库未安装，正在自动安装...")
-    try:
-        import subprocess
-        import sys
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "haspirater", "-i", "https://pypi.tuna.tsinghua.edu.cn/simple"])
-        print("haspirater库安装成功，正在导入...")
-        import haspirater
-        haspirater_AVAILABLE = True
-        print("✅ haspirater库已成功导入")
-    except Exception as e:
-        print(f"❌ 自动安装失败: {e}")
-        print("请手动运行: pip install haspirater")
-        haspirater_AVAILABLE = False
-
-
+from pathlib import Path
+from typing import List, Dict, Set, Tuple
 
-try:
-    import frhyme
-    frhyme_AVAILABLE = True
-except ImportError:
-    frhyme_AVAILABLE = False
-    print("frhyme库未安装，正在自动安装...")
-    try:
-        import subprocess
-        import sys
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "frhyme", "-i", "https://pypi.tuna.tsinghua.edu.cn/simple"])
-        print("frhyme库安装成功，正在导入...")
-        import frhyme
-        frhyme_AVAILABLE = True
-        print("✅ frhyme库已成功导入")
-    except Exception as e:
-        print(f"❌ 自动安装失败: {e}")
-        print("请手动运行: pip install frhyme")
-        frhyme_AVAILABLE = False
+from src_code.nlp_backends import backend, import_or_install
 
 
+@backend("verbecc")
+def _load_conjugator():
+    """verbecc 法语动词变位器（所有检测器共用一个实例）"""
+    if import_or_install("verbecc", mirror=False) is None:
+        return None
+    from verbecc import Conjugator
+    return Conjugator(lang='fr')
 
 
+def get_conjugator():
+    """返回共享的法语 Conjugator，verbecc 不可用时抛出 ImportError"""
+    conjugator = _load_conjugator()
+    if conjugator is None:
+        raise ImportError("verbecc Conjugator 不可用，请运行: pip install verbecc")
+    return conjugator
 
-from pathlib import Path
-from typing import List, Dict, Set, Tuple
 
 class VerbccIndex:
     """Verbcc 动词索引加载器"""
@@ -1604,7 +1548,7 @@ def check_single_vigesimal(text):
 class PronominalVerbDetector:
     def __init__(self):
         # self.cg = Conjugator(Lang.fr)
-        self.cg = Conjugator(lang='fr')
+        self.cg = get_conjugator()
         self.reflexive = ['me', "m'", 'te', "t'", 'se', "s'", 'nous', 'vous']
         self.subjects = {
             'je': ['me', "m'"], "j'": ['me', "m'"],
@@ -3132,7 +3076,7 @@ class PasseComposeDetector:
     """法语复合过去时检测器"""
     
     def __init__(self):
-        self.cg = Conjugator(lang='fr')
+        self.cg = get_conjugator()
         
         # avoir 的直陈式现在时变位
         self.avoir_present = {
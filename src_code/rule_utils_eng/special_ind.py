@@ -2,26 +2,6 @@
 印尼语特殊规则检测模块
 每个函数包含独立的词库和辅助函数，方便单独修改
 """
-try:
-    from spellchecker import SpellChecker
-    spellchecker_AVAILABLE = True
-except ImportError:
-    spellchecker_AVAILABLE = False
-    print("spellchecker库未安装，正在自动安装...")
-    try:
-        import subprocess
-        import sys
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "pyspellchecker", "-i", "https://pypi.tuna.tsinghua.edu.cn/simple"])
-        print("spellchecker库安装成功，正在导入...")
-        from spellchecker import SpellChecker
-        spellchecker_AVAILABLE = True
-        print("✅ spellchecker库已成功导入")
-    except Exception as e:
-        print(f"❌ 自动安装失败: {e}")
-        print("请手动运行: pip install pyspellchecker")
-        spellchecker_AVAILABLE = False
-
-        
 import re
 
 
@@ -33,7 +13,6 @@ def create_logger(debug):
     return log
 
 import re
-from spellchecker import SpellChecker
 
 # ==================== 印尼语专项规则集合 ====================
 # ==================== 高准确率外来词检测（英语+法语+荷兰语）- 支持首字母筛选 ====================
@@ -21,140 +21,71 @@ import os
 import inspect
 from collections import defaultdict
 from functools import lru_cache
-try:
-    import pymorphy2
-    pymorphy2_AVAILABLE = True
-except ImportError:
-    pymorphy2_AVAILABLE = False
-    print("pymorphy2库未安装，正在自动安装...")
-    try:
-        import subprocess
-        import sys
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "pymorphy2", "-i", "https://pypi.tuna.tsinghua.edu.cn/simple"])
-        print("pymorphy2库安装成功，正在导入...")
-        import pymorphy2
-        pymorphy2_AVAILABLE = True
-        print("✅ pymorphy2库已成功导入")
-    except Exception as e:
-        print(f"❌ 自动安装失败: {e}")
-        print("请手动运行: pip install pymorphy2")
-        pymorphy2_AVAILABLE = False
 
-try:
+from src_code.nlp_backends import backend, import_or_install
+
+# ==================== 版本标记 ====================
+__VERSION__ = "3.0.0"
+
+
+# ==================== 全局库管理器（统一管理外部依赖） ====================
+@backend("pymorphy2")
+def _load_morph():
+    """Pymorphy2 分析器"""
+    # 兼容性修复：pymorphy2 依赖已被移除的 inspect.getargspec
+    if not hasattr(inspect, 'getargspec'):
+        inspect.getargspec = inspect.getfullargspec
+    pymorphy2 = import_or_install("pymorphy2")
+    if pymorphy2 is None:
+        return None
+    return pymorphy2.MorphAnalyzer()
+
+
+@backend("russtress")
+def _load_stresser():
+    """Russtress 重音标注器（基于 TensorFlow）"""
+    os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
+    os.environ['TF_ENABLE_ONEDNN_OPTS'] = '0'
+
+    import tensorflow as tf
+    if hasattr(tf, 'compat') and hasattr(tf.compat, 'v1'):
+        tf.compat.v1.disable_eager_execution()
+
     import russtress
-    russtress_AVAILABLE = True
-    print("✅ russtress库已存在")
-except ImportError:
-    russtress_AVAILABLE = False
-    print("russtress库未安装，正在自动安装...")
+    return russtress.Accent()
+
+
+@backend("pyphen_ru")
+def _load_syllabifier():
+    """pyphen 俄语音节划分词典"""
     try:
-        import subprocess
-        import sys
-        
-        # 同时安装 russtress 和精确版本的 NumPy
-        subprocess.check_call([
-            sys.executable, "-m", "pip", "install", 
-            "russtress",
-            "numpy==1.25.0",  # 精确锁定为 1.25.0
-            "-i", "https://pypi.tuna.tsinghua.edu.cn/simple"
-        ])
-        
-        print("russtress库安装成功，正在导入...")
-        import russtress
-        import numpy as np
-        russtress_AVAILABLE = True
-        print(f"✅ russtress库已成功导入")
-        print(f"✅ NumPy 版本: {np.__version__}")
-        
-    except Exception as e:
-        print(f"❌ 自动安装失败: {e}")
-        print("请手动运行: pip install russtress numpy==1.25.0")
-        russtress_AVAILABLE = False
+        import pyphen
+    except ImportError:
+        print("⚠️  警告: pyphen 库未安装，将使用备用音节划分方法。建议运行: pip install pyphen")
+        return None
+    return pyphen.Pyphen(lang='ru_RU')
 
 
+class LibraryManager:
+    """统一管理 Pymorphy2 和 Russtress 的加载和缓存（第一次使用时加载）"""
 
-try:
-    import tensorflow
-    tensorflow_AVAILABLE = True
-except ImportError:
-    tensorflow_AVAILABLE = False
-    print("tensorflow库未安装，正在自动安装...")
-    try:
-        import subprocess
-        import sys
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "tensorflow", "-i", "https://pypi.tuna.tsinghua.edu.cn/simple"])
-        print("tensorflow库安装成功，正在导入...")
-        import tensorflow
-        tensorflow_AVAILABLE = True
-        print("✅ tensorflow库已成功导入")
-    except Exception as e:
-        print(f"❌ 自动安装失败: {e}")
-        print("请手动运行: pip install tensorflow")
-        tensorflow_AVAILABLE = False
-# ==================== 版本标记 ====================
-__VERSION__ = "3.0.0"
+    @staticmethod
+    def get_morph():
+        """获取 Pymorphy2 分析器，返回 (分析器, 是否可用)"""
+        morph = _load_morph()
+        return morph, morph is not None
 
-# ==================== 兼容性修复 ====================
-if not hasattr(inspect, 'getargspec'):
-    inspect.getargspec = inspect.getfullargspec
+    @staticmethod
+    def get_stresser():
+        """获取 Russtress 重音标注器，返回 (russtress.Accent对象, 是否可用)"""
+        stresser = _load_stresser()
+        return stresser, stresser is not None
 
 
-# ==================== 全局库管理器（统一管理外部依赖） ====================
-class LibraryManager:
-    """统一管理 Pymorphy2 和 Russtress 的加载和缓存"""
-    
-    _morph = None
-    _morph_available = None
-    _stresser = None
-    _stresser_available = None
-    
-    @classmethod
-    def get_morph(cls):
-        """获取 Pymorphy2 分析器（延迟加载+缓存）"""
-        if cls._morph_available is None:
-            try:
-                import pymorphy2
-                cls._morph = pymorphy2.MorphAnalyzer()
-                cls._morph_available = True
-            except ImportError:
-                cls._morph = None
-                cls._morph_available = False
-            except Exception as e:
-                print(f"[ERROR] Pymorphy2 加载失败: {e}")
-                cls._morph = None
-                cls._morph_available = False
-        
-        return cls._morph, cls._morph_available
-    
-    @classmethod
-    def get_stresser(cls):
-        """获取 Russtress 重音标注器（延迟加载+缓存）"""
-        if cls._stresser_available is None:
-            try:
-                os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
-                os.environ['TF_ENABLE_ONEDNN_OPTS'] = '0'
-                
-                import tensorflow as tf
-                if hasattr(tf, 'compat') and hasattr(tf.compat, 'v1'):
-                    tf.compat.v1.disable_eager_execution()
-                
-                import russtress
-                accent_marker = russtress.Accent()
-                
-                class StresserWrapper:
-                    def __init__(self, marker):
-                        self.marker = marker
-                    def stress(self, text):
-                        result = self.marker.put_stress(text)
-                        return result[0] if isinstance(result, list) and result else text
-                
-                cls._stresser = StresserWrapper(accent_marker)
-                cls._stresser_available = True
-            except Exception:
-                cls._stresser = None
-                cls._stresser_available = False
-        
-        return cls._stresser, cls._stresser_available
+def stress_text(stresser, text):
+    """用 Russtress 给文本标注重音，返回标注后的文本"""
+    result = stresser.put_stress(text)
+    return result[0] if isinstance(result, list) and result else result
 
 
 # ==================== 通用工具函数（所有规则共用） ====================
@@ -1246,42 +1177,6 @@ def _time6_remove_overlapping(expressions):
     return unique
 
 
-
-
-
-try:
-    import pyphen
-    RUSSIAN_SYLLABIFIER = pyphen.Pyphen(lang='ru_RU')
-    PYPHEN_AVAILABLE = True
-except ImportError:
-    RUSSIAN_SYLLABIFIER = None
-    PYPHEN_AVAILABLE = False
-    print("⚠️  警告: pyphen 库未安装，将使用备用音节划分方法。建议运行: pip install pyphen")
-
-
-# ==================== LibraryManager 类 ====================
-class LibraryManager:
-    """管理外部库的加载"""
-    _stresser = None
-    _stresser_available = None
-    
-    @classmethod
-    def get_stresser(cls):
-        """返回 (stresser对象, 是否可用)"""
-        if cls._stresser_available is not None:
-            return cls._stresser, cls._stresser_available
-        
-        try:
-            import russtress
-            cls._stresser = russtress.Accent()
-            cls._stresser_available = True
-        except ImportError:
-            cls._stresser = None
-            cls._stresser_available = False
-        
-        return cls._stresser, cls._stresser_available
-
-
 def create_logger(debug):
     """创建日志函数"""
     def log(msg):
@@ -1394,9 +1289,10 @@ def _meter_analyze_line(line, line_num, log):
 
 def _meter_split_syllables(word):
     """使用 pyphen 进行准确的音节划分"""
-    if PYPHEN_AVAILABLE and RUSSIAN_SYLLABIFIER:
+    syllabifier = _load_syllabifier()
+    if syllabifier:
         try:
-            syllables_str = RUSSIAN_SYLLABIFIER.inserted(word.lower(), hyphen='|')
+            syllables_str = syllabifier.inserted(word.lower(), hyphen='|')
             syllables = syllables_str.split('|')
             if syllables and all(syllables):
                 return syllables
@@ -2340,8 +2236,8 @@ def _mpl_discover_dynamic(text, morph, log):
                 stresser, available = LibraryManager.get_stresser()
                 if available and stresser:
                     try:
-                        stressed1 = stresser.stress(form1)
-                        stressed2 = stresser.stress(form2)
+                        stressed1 = stress_text(stresser, form1)
+                        stressed2 = stress_text(stresser, form2)
                         
                         if stressed1 != stressed2 and '́' in stressed1 and '́' in stressed2:
                             log(f"[DEBUG] 动态发现: {base_noun} -> {form1}({stressed1}) vs {form2}({stressed2})")
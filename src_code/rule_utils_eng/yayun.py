@@ -1,54 +1,17 @@
 import re
 from collections import Counter
 
-# 需要安装阿拉伯语处理库
-try:
-    import pyarabic.araby as araby
-    PYARABIC_AVAILABLE = True
-except ImportError:
-    PYARABIC_AVAILABLE = False
-    print("pyarabic库未安装，正在自动安装...")
-    try:
-        import subprocess
-        import sys
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "pyarabic"])
-        print("pyarabic库安装成功，正在导入...")
-        import pyarabic.araby as araby
-        PYARABIC_AVAILABLE = True
-        print("✅ pyarabic库已成功导入")
-    except Exception as e:
-        print(f"❌ 自动安装失败: {e}")
-        print("请手动运行: pip install pyarabic")
-        PYARABIC_AVAILABLE = False
-
-# 需要安装音节处理库
-try:
-    import pyphen
-    PYPHEN_AVAILABLE = True
-except ImportError:
-    PYPHEN_AVAILABLE = False
-    print("pyphen库未安装，正在自动安装...")
-    try:
-        import subprocess
-        import sys
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "pyphen"])
-        print("pyphen库安装成功，正在导入...")
-        import pyphen
-        PYPHEN_AVAILABLE = True
-        print("✅ pyphen库已成功导入")
-    except Exception as e:
-        print(f"❌ 自动安装失败: {e}")
-        print("请手动运行: pip install pyphen")
-        PYPHEN_AVAILABLE = False
-
-# 多语言音节分割器
-if PYPHEN_AVAILABLE:
-    pt_dic = pyphen.Pyphen(lang='pt_PT')  # 葡萄牙语
-    de_dic = pyphen.Pyphen(lang='de_DE')  # 德语
-    es_dic = pyphen.Pyphen(lang='es_ES')  # 西班牙语
-    fr_dic = pyphen.Pyphen(lang='fr_FR')  # 法语
-    id_dic = pyphen.Pyphen(lang='id_ID')  # 印尼语
-    ru_dic = pyphen.Pyphen(lang='ru_RU')  # 俄语
+from src_code.nlp_backends import backend, import_or_install
+
+
+@backend("pyphen_fr")
+def _load_fr_dic():
+    """法语音节分割词典"""
+    pyphen = import_or_install("pyphen", mirror=False)
+    if pyphen is None:
+        return None
+    return pyphen.Pyphen(lang='fr_FR')
+
 
 def clean_up_text(text):
     """
@@ -510,7 +473,8 @@ def get_french_rhyme_key(word):
     word = word.lower().strip()
     
     # 使用音节分割来找押韵部分
-    if PYPHEN_AVAILABLE:
+    fr_dic = _load_fr_dic()
+    if fr_dic:
         try:
             syllables = fr_dic.inserted(word).split('-')
             if syllables:
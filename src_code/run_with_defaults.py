@@ -19,15 +19,35 @@ def debug_print(*args, **kwargs):
 # 可选：替换全局 print（调试模式下）
 # builtins.print = debug_print
 
+# --profile-startup 要覆盖本文件自己的导入，必须在导入其他模块之前开始记录
+if '--profile-startup' in sys.argv or '--profile_startup' in sys.argv:
+    import startup_profile
+    startup_profile.start()
+
 import json
 import time
 import argparse
-from process_corresponding_parts import extract_content
-from process_evaluation import process_all_items
+from process_corresponding_parts import (extract_content, set_extraction_token_ratio, set_multi_key_extraction, LazyExtraction,
+                                         print_lazy_extraction_stats)
+from process_evaluation import (
+    process_all_items, start_rule_workers, stop_rule_workers, set_judge_max_tokens, set_judge_mode, JUDGE_MODES
+)
 from multi_round_template_added import multi_round_template_added
+from checkpoint import open_journal, close_journal, restore_response, record_response
+from pipeline import Stage, run_pipeline
+from prompt_layout import PROMPT_LAYOUTS, set_prompt_layout
+from code_sandbox import start_code_workers, stop_code_workers, print_code_sandbox_stats
+from extraction_programs import enable_program_reuse, print_program_stats
+from fast_extractors import enable_fast_extract, print_fast_extract_stats
 from LLM_APIs.qwen_api import set_qwen_config
 from LLM_APIs.qwen_coder_api import set_qwen_coder_config
 from LLM_APIs.tested_model_api import set_tested_model_config, call_tested_model
+from LLM_APIs.llm_client import run_coroutine
+from LLM_APIs.response_cache import enable_cache, get_cache, print_cache_stats, DEFAULT_MAX_SIZE_MB
+from LLM_APIs.http_pool import configure_pool, print_pool_stats
+from LLM_APIs.llm_client import dedup_stats, print_replica_stats
+from LLM_APIs.usage_stats import set_token_price, take_usage, usage_report, write_usage_report, print_usage_stats
+from LLM_APIs.batch_io import BatchPending, enable_batch_export, get_batch_export, import_batch_results
 
 
 def test_single_api(client, model_name, api_name):
@@ -35,7 +55,9 @@ def test_single_api(client, model_name, api_name):
     print(f"🔗 Testing {api_name} with model: {model_name}")
 
     try:
-        response = client.chat.completions.create(
+        # 客户端为AsyncOpenAI，在共享的后台事件循环中执行；
+        # llm_client关闭了客户端自带的重试，连通性测试单独允许重试两次，避免偶发的429/5xx误判
+        response = run_coroutine(client.with_options(max_retries=2).chat.completions.create(
             model=model_name,
             messages=[
                 {"role": "system", "content": ""},
@@ -44,7 +66,7 @@ def test_single_api(client, model_name, api_name):
             max_tokens=50,
             temperature=0.00,
             timeout=30
-        )
+        ))
         
         if response.choices and len(response.choices) > 0:
             print(f"✅ {api_name} is working")
@@ -110,9 +132,15 @@ def test_all_apis():
 
 # 导入配置
 from config import (
-    QWEN_API_KEY, QWEN_BASE_URL, QWEN_MODEL,
-    QWEN_CODER_API_KEY, QWEN_CODER_BASE_URL, QWEN_CODER_MODEL,
-    TESTED_MODEL_API_KEY, TESTED_MODEL_BASE_URL, TESTED_MODEL_NAME
+    QWEN_API_KEY, QWEN_BASE_URL, QWEN_MODEL, QWEN_MAX_CONCURRENCY,
+    QWEN_REQUESTS_PER_SECOND, QWEN_TOKENS_PER_MINUTE, QWEN_PROMPT_PRICE, QWEN_COMPLETION_PRICE,
+    QWEN_CODER_API_KEY, QWEN_CODER_BASE_URL, QWEN_CODER_MODEL, QWEN_CODER_MAX_CONCURRENCY,
+    QWEN_CODER_REQUESTS_PER_SECOND, QWEN_CODER_TOKENS_PER_MINUTE, QWEN_CODER_PROMPT_PRICE, QWEN_CODER_COMPLETION_PRICE,
+    TESTED_MODEL_API_KEY, TESTED_MODEL_BASE_URL, TESTED_MODEL_NAME, TESTED_MODEL_MAX_CONCURRENCY,
+    TESTED_MODEL_REQUESTS_PER_SECOND, TESTED_MODEL_TOKENS_PER_MINUTE, TESTED_MODEL_PROMPT_PRICE, TESTED_MODEL_COMPLETION_PRICE,
+    LLM_MAX_RETRIES, LLM_MAX_CONNECTIONS_PER_HOST, LLM_MAX_KEEPALIVE_CONNECTIONS, LLM_KEEPALIVE_EXPIRY, LLM_HTTP2,
+    LLM_PROMPT_LAYOUT, LLM_JUDGE_MAX_TOKENS, LLM_EXTRACTION_TOKEN_RATIO, LLM_JUDGE_MODE,
+    CODE_WORKERS, CODE_TIMEOUT, CODE_MEMORY_MB
 )
 
 # 默认配置 - 基于原始evaluate.py
@@ -121,20 +149,59 @@ DEFAULT_CONFIG = {
     'qwen_api_key': QWEN_API_KEY,
     'qwen_base_url': QWEN_BASE_URL,
     'qwen_model': QWEN_MODEL,
+    'qwen_max_concurrency': QWEN_MAX_CONCURRENCY,
+    'qwen_requests_per_second': QWEN_REQUESTS_PER_SECOND,
+    'qwen_tokens_per_minute': QWEN_TOKENS_PER_MINUTE,
+    'qwen_prompt_price': QWEN_PROMPT_PRICE,
+    'qwen_completion_price': QWEN_COMPLETION_PRICE,
     'qwen_coder_api_key': QWEN_CODER_API_KEY,
     'qwen_coder_base_url': QWEN_CODER_BASE_URL,
     'qwen_coder_model': QWEN_CODER_MODEL,
+    'qwen_coder_max_concurrency': QWEN_CODER_MAX_CONCURRENCY,
+    'qwen_coder_requests_per_second': QWEN_CODER_REQUESTS_PER_SECOND,
+    'qwen_coder_tokens_per_minute': QWEN_CODER_TOKENS_PER_MINUTE,
+    'qwen_coder_prompt_price': QWEN_CODER_PROMPT_PRICE,
+    'qwen_coder_completion_price': QWEN_CODER_COMPLETION_PRICE,
     'tested_model_api_key': TESTED_MODEL_API_KEY,
     'tested_model_base_url': TESTED_MODEL_BASE_URL,
     'tested_model_name': TESTED_MODEL_NAME,
-    'batch_size': 5,
+    'tested_model_max_concurrency': TESTED_MODEL_MAX_CONCURRENCY,
+    'tested_model_requests_per_second': TESTED_MODEL_REQUESTS_PER_SECOND,
+    'tested_model_tokens_per_minute': TESTED_MODEL_TOKENS_PER_MINUTE,
+    'tested_model_prompt_price': TESTED_MODEL_PROMPT_PRICE,
+    'tested_model_completion_price': TESTED_MODEL_COMPLETION_PRICE,
+    # 单个prompt遇到429/5xx/连接错误时的最大重试次数
+    'max_retries': LLM_MAX_RETRIES,
+    # 三个endpoint共用的HTTP连接池
+    'max_connections_per_host': LLM_MAX_CONNECTIONS_PER_HOST,
+    'max_keepalive_connections': LLM_MAX_KEEPALIVE_CONNECTIONS,
+    'keepalive_expiry': LLM_KEEPALIVE_EXPIRY,
+    'http2': LLM_HTTP2,
+    # 提取和评估prompt的排布方式
+    'prompt_layout': LLM_PROMPT_LAYOUT,
+    # token预算：评估回复的max_tokens，提取回复的max_tokens相对模型回复长度的倍数
+    'judge_max_tokens': LLM_JUDGE_MAX_TOKENS,
+    'extraction_token_ratio': LLM_EXTRACTION_TOKEN_RATIO,
+    # 评估方式
+    'judge_mode': LLM_JUDGE_MODE,
+    # 执行生成的提取代码的进程池
+    'code_workers': CODE_WORKERS,
+    'code_timeout': CODE_TIMEOUT,
+    'code_memory_mb': CODE_MEMORY_MB,
+    # 每批并发提交的请求数，实际同时在途的请求数由各endpoint的max_concurrency限制
+    'batch_size': 100,
     'rounds': 2,
     'data_path': os.path.join(os.path.dirname(os.path.dirname(__file__)), 'input_data/asia_data/raw_input'),
-    'output_dir': 'evaluation_results'
+    'output_dir': 'evaluation_results',
+    # LLM响应缓存目录，重跑时命中缓存的请求不会再发往服务端
+    'cache_dir': os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.llm_cache'),
+    'cache_max_size_mb': DEFAULT_MAX_SIZE_MB
 }
 
 def process_in_batches(data, batch_size=100):
     """批量处理数据，调用被测模型获取响应"""
+    # 断点续跑：日志中已有回复的条目不再调用被测模型
+    data = [item for item in data if not restore_response(item)]
     total_items = len(data)
     for batch_start in range(0, total_items, batch_size):
         batch_end = min(batch_start + batch_size, total_items)
@@ -143,18 +210,64 @@ def process_in_batches(data, batch_size=100):
         # Print processing progress
         print(f"📊 Processing items {batch_start}-{batch_end-1} out of {total_items} total items...")
 
-        try:
-            # Batch get questions and call model
-            batch_questions = [item["question"] for item in current_batch]
-            batch_responses = call_tested_model(batch_questions)  # 使用被测模型
-
-            # Assign responses back to data items
-            for item, response in zip(current_batch, batch_responses):
-                item["model_response"] = response
-
-        except Exception as e:
-            print(f"❌ Error occurred while processing batch {batch_start}-{batch_end-1}: {str(e)}")
-            # Add retry logic or error handling here
+        # Batch get questions and call model（失败的prompt已在llm_client中单独重试过）
+        batch_questions = [item["question"] for item in current_batch]
+        batch_responses = call_tested_model(batch_questions, return_exceptions=True, stage="generation")  # 使用被测模型
+
+        # Assign responses back to data items
+        for index, (item, response) in enumerate(zip(current_batch, batch_responses)):
+            if isinstance(response, BaseException):
+                # 重试后仍失败（或已导出到批处理文件）：本轮按空回复评估，不写入断点日志，--resume 时会重新请求
+                if not isinstance(response, BatchPending):
+                    print(f"❌ Error occurred while processing item {batch_start + index}: {str(response)}")
+                item["model_response"] = ""
+                continue
+            item["model_response"] = response
+            record_response(item)
+
+
+def print_dedup_ratio(stage, before):
+    """
+    打印一个阶段中与在途请求合并的调用比例
+
+    Args:
+        stage: 阶段名称
+        before: 阶段开始前的 dedup_stats()
+    """
+    for name, stats in dedup_stats().items():
+        calls = stats["calls"] - before.get(name, {}).get("calls", 0)
+        deduplicated = stats["deduplicated"] - before.get(name, {}).get("deduplicated", 0)
+        if calls:
+            print(f"🧬 {stage} dedup ({name}): {deduplicated}/{calls} calls shared an in-flight request "
+                  f"({deduplicated / calls * 100:.1f}%)")
+
+
+def stop_for_batch_export(round_num, stage):
+    """
+    批处理导出模式：本阶段有等待离线推理的请求时，写出Batch API文件并返回True（调用方应结束本次运行）
+    """
+    exporter = get_batch_export()
+    if exporter is None or not len(exporter):
+        return False
+    written = exporter.write(f"round_{round_num}_{stage}")
+    close_journal()
+    stop_rule_workers()
+    stop_code_workers()
+    print(f"📦 Exported {sum(written.values())} pending {stage} requests (round {round_num}):")
+    for path, count in written.items():
+        print(f"   - {path}: {count} requests")
+    print("💡 Run these files with the OpenAI Batch API or vLLM run_batch, then rerun with "
+          "--batch_import <result files> --resume to continue from this stage")
+    return True
+
+
+def evaluate_with_lazy_extraction(items, batch_size, rule_based_evaluate_func):
+    """按需提取（--lazy_extraction）：评估时逐层只提取依赖仍然成立的规则子问题用到的抓取对象"""
+    lazy_extraction = LazyExtraction(items, batch_size)
+    items = process_all_items(items, batch_size=batch_size, rule_based_evaluate_func=rule_based_evaluate_func,
+                              extract_func=lazy_extraction)
+    lazy_extraction.finish()
+    return items
 
 
 def iferror(item):
@@ -192,25 +305,69 @@ def main():
     
     # Qwen API配置
     parser.add_argument('--qwen_api_key', default=DEFAULT_CONFIG['qwen_api_key'], help='Qwen API密钥')
-    parser.add_argument('--qwen_base_url', default=DEFAULT_CONFIG['qwen_base_url'], help='Qwen API基础URL')
+    parser.add_argument('--qwen_base_url', default=DEFAULT_CONFIG['qwen_base_url'], help='Qwen API基础URL，多个相同副本用逗号分隔')
     parser.add_argument('--qwen_model', default=DEFAULT_CONFIG['qwen_model'], help='Qwen模型名称')
+    parser.add_argument('--qwen_max_concurrency', type=int, default=DEFAULT_CONFIG['qwen_max_concurrency'], help='Qwen API每个副本同时在途的最大请求数')
+    parser.add_argument('--qwen_requests_per_second', type=float, default=DEFAULT_CONFIG['qwen_requests_per_second'], help='Qwen API每秒请求数上限，0表示不限制')
+    parser.add_argument('--qwen_tokens_per_minute', type=int, default=DEFAULT_CONFIG['qwen_tokens_per_minute'], help='Qwen API每分钟token数上限，0表示不限制')
+    parser.add_argument('--qwen_prompt_price', type=float, default=DEFAULT_CONFIG['qwen_prompt_price'], help='Qwen API每百万prompt token的价格，用于统计费用')
+    parser.add_argument('--qwen_completion_price', type=float, default=DEFAULT_CONFIG['qwen_completion_price'], help='Qwen API每百万completion token的价格，用于统计费用')
     
     # Qwen Coder API配置
     parser.add_argument('--qwen_coder_api_key', default=DEFAULT_CONFIG['qwen_coder_api_key'], help='Qwen Coder API密钥')
-    parser.add_argument('--qwen_coder_base_url', default=DEFAULT_CONFIG['qwen_coder_base_url'], help='Qwen Coder API基础URL')
+    parser.add_argument('--qwen_coder_base_url', default=DEFAULT_CONFIG['qwen_coder_base_url'], help='Qwen Coder API基础URL，多个相同副本用逗号分隔')
     parser.add_argument('--qwen_coder_model', default=DEFAULT_CONFIG['qwen_coder_model'], help='Qwen Coder模型名称')
+    parser.add_argument('--qwen_coder_max_concurrency', type=int, default=DEFAULT_CONFIG['qwen_coder_max_concurrency'], help='Qwen Coder API每个副本同时在途的最大请求数')
+    parser.add_argument('--qwen_coder_requests_per_second', type=float, default=DEFAULT_CONFIG['qwen_coder_requests_per_second'], help='Qwen Coder API每秒请求数上限，0表示不限制')
+    parser.add_argument('--qwen_coder_tokens_per_minute', type=int, default=DEFAULT_CONFIG['qwen_coder_tokens_per_minute'], help='Qwen Coder API每分钟token数上限，0表示不限制')
+    parser.add_argument('--qwen_coder_prompt_price', type=float, default=DEFAULT_CONFIG['qwen_coder_prompt_price'], help='Qwen Coder API每百万prompt token的价格，用于统计费用')
+    parser.add_argument('--qwen_coder_completion_price', type=float, default=DEFAULT_CONFIG['qwen_coder_completion_price'], help='Qwen Coder API每百万completion token的价格，用于统计费用')
     
     # Tested Model API配置
     parser.add_argument('--tested_model_api_key', default=DEFAULT_CONFIG['tested_model_api_key'], help='被测模型API密钥')
-    parser.add_argument('--tested_model_base_url', default=DEFAULT_CONFIG['tested_model_base_url'], help='被测模型API基础URL')
+    parser.add_argument('--tested_model_base_url', default=DEFAULT_CONFIG['tested_model_base_url'], help='被测模型API基础URL，多个相同副本用逗号分隔')
     parser.add_argument('--tested_model_name', default=DEFAULT_CONFIG['tested_model_name'], help='被测模型名称')
+    parser.add_argument('--tested_model_max_concurrency', type=int, default=DEFAULT_CONFIG['tested_model_max_concurrency'], help='被测模型API每个副本同时在途的最大请求数')
+    parser.add_argument('--tested_model_requests_per_second', type=float, default=DEFAULT_CONFIG['tested_model_requests_per_second'], help='被测模型API每秒请求数上限，0表示不限制')
+    parser.add_argument('--tested_model_tokens_per_minute', type=int, default=DEFAULT_CONFIG['tested_model_tokens_per_minute'], help='被测模型API每分钟token数上限，0表示不限制')
+    parser.add_argument('--tested_model_prompt_price', type=float, default=DEFAULT_CONFIG['tested_model_prompt_price'], help='被测模型API每百万prompt token的价格，用于统计费用')
+    parser.add_argument('--tested_model_completion_price', type=float, default=DEFAULT_CONFIG['tested_model_completion_price'], help='被测模型API每百万completion token的价格，用于统计费用')
     
     # 其他配置
     parser.add_argument('--batch_size', type=int, default=DEFAULT_CONFIG['batch_size'], help=f'批处理大小 (默认: {DEFAULT_CONFIG["batch_size"]})')
+    parser.add_argument('--max_retries', '--max-retries', dest='max_retries', type=int, default=DEFAULT_CONFIG['max_retries'], help=f'单个prompt遇到429/5xx/连接错误时的最大重试次数 (默认: {DEFAULT_CONFIG["max_retries"]})')
+    parser.add_argument('--max_connections_per_host', type=int, default=DEFAULT_CONFIG['max_connections_per_host'], help=f'共享HTTP连接池中每个源站的最大连接数 (默认: {DEFAULT_CONFIG["max_connections_per_host"]})')
+    parser.add_argument('--max_keepalive_connections', type=int, default=DEFAULT_CONFIG['max_keepalive_connections'], help=f'共享HTTP连接池中每个源站保留的keep-alive连接数 (默认: {DEFAULT_CONFIG["max_keepalive_connections"]})')
+    parser.add_argument('--keepalive_expiry', type=float, default=DEFAULT_CONFIG['keepalive_expiry'], help=f'keep-alive连接空闲多少秒后关闭 (默认: {DEFAULT_CONFIG["keepalive_expiry"]})')
+    parser.add_argument('--http2', action='store_true', default=DEFAULT_CONFIG['http2'], help='共享HTTP连接池启用HTTP/2（需要安装h2）')
+    parser.add_argument('--prompt_layout', '--prompt-layout', dest='prompt_layout', choices=PROMPT_LAYOUTS, default=DEFAULT_CONFIG['prompt_layout'], help='提取和评估prompt的排布：inline为整个模板一条user消息，prefix把固定的说明和示例放进system消息，便于vLLM/SGLang的前缀缓存 (默认: %(default)s)')
+    parser.add_argument('--judge_max_tokens', '--judge-max-tokens', dest='judge_max_tokens', type=int, default=DEFAULT_CONFIG['judge_max_tokens'], help='评估回复的max_tokens，0表示不限制 (默认: %(default)s)')
+    parser.add_argument('--extraction_token_ratio', '--extraction-token-ratio', dest='extraction_token_ratio', type=float, default=DEFAULT_CONFIG['extraction_token_ratio'], help='提取回复的max_tokens相对模型回复token数的倍数，0表示不限制 (默认: %(default)s)')
+    parser.add_argument('--judge_mode', '--judge-mode', dest='judge_mode', choices=JUDGE_MODES, default=DEFAULT_CONFIG['judge_mode'], help='评估方式：analysis为原来的自由格式分析，json通过response_format要求{"verdict", "reason"}，verdict只输出verdict；服务端不支持时退回analysis (默认: %(default)s)')
     parser.add_argument('--rounds', type=int, default=DEFAULT_CONFIG['rounds'], help=f'评估轮数 (默认: {DEFAULT_CONFIG["rounds"]})')
     parser.add_argument('--data_path', default=DEFAULT_CONFIG['data_path'], help=f'数据文件路径 (默认: {DEFAULT_CONFIG["data_path"]})')
     parser.add_argument('--output_dir', default=DEFAULT_CONFIG['output_dir'], help=f'输出目录 (默认: {DEFAULT_CONFIG["output_dir"]})')
     parser.add_argument('--language_filter', default='', help='语言过滤器，多个语言用逗号分隔 (例如: 中文,日语 或 英语,德语)')
+    parser.add_argument('--cache_dir', '--cache-dir', dest='cache_dir', default=DEFAULT_CONFIG['cache_dir'], help=f'LLM响应缓存目录 (默认: {DEFAULT_CONFIG["cache_dir"]})')
+    parser.add_argument('--cache_max_size_mb', type=int, default=DEFAULT_CONFIG['cache_max_size_mb'], help=f'LLM响应缓存大小上限，超出后按LRU淘汰 (默认: {DEFAULT_CONFIG["cache_max_size_mb"]} MB)')
+    parser.add_argument('--no_cache', '--no-cache', dest='no_cache', action='store_true', help='禁用LLM响应缓存')
+    parser.add_argument('--batch_export', '--batch-export', dest='batch_export', default=None, help='离线批量推理：把未命中缓存的请求按阶段导出为OpenAI Batch API格式的JSONL到该目录，导出后退出')
+    parser.add_argument('--batch_import', '--batch-import', dest='batch_import', nargs='+', default=None, help='导入OpenAI Batch API / vLLM run_batch的结果文件（按custom_id写入响应缓存）')
+    parser.add_argument('--pipeline', action='store_true', help='流水线模式：条目拿到回复后立即提取、提取完成后立即评估，各阶段并行执行')
+    parser.add_argument('--pipeline_workers', type=int, default=8, help='流水线模式下每个阶段的工作线程数 (默认: 8)')
+    parser.add_argument('--pipeline_queue_size', type=int, default=64, help='流水线模式下阶段之间队列的容量 (默认: 64)')
+    parser.add_argument('--rule_workers', '--rule-workers', dest='rule_workers', type=int, default=0, help='规则评估的工作进程数，0表示在主进程中串行评估 (默认: 0)')
+    parser.add_argument('--code_workers', '--code-workers', dest='code_workers', type=int, default=DEFAULT_CONFIG['code_workers'], help='执行生成的提取代码的工作进程数，0表示在主进程中执行（没有超时和内存限制） (默认: %(default)s)')
+    parser.add_argument('--code_timeout', '--code-timeout', dest='code_timeout', type=float, default=DEFAULT_CONFIG['code_timeout'], help='单段提取代码的墙钟超时和CPU时间上限，秒 (默认: %(default)s)')
+    parser.add_argument('--code_memory_mb', '--code-memory-mb', dest='code_memory_mb', type=int, default=DEFAULT_CONFIG['code_memory_mb'], help='执行提取代码的工作进程可额外使用的内存，MB，0表示不限制 (默认: %(default)s)')
+    parser.add_argument('--reuse_extraction_code', '--reuse-extraction-code', dest='reuse_extraction_code', action='store_true', help='#CODE#提取的每个(category, 抓取指令)只生成一个程序，验证后保存到磁盘并应用到所有匹配的回复')
+    parser.add_argument('--program_dir', '--program-dir', dest='program_dir', default=None, help='可复用提取程序的保存目录 (默认: <cache_dir>/extraction_programs)')
+    parser.add_argument('--fast_extract', '--fast-extract', dest='fast_extract', action='store_true', help='普通提取中模型回复是编号、项目符号、引号或逐行列表时在本地切分，不调用提取模型；拿不准的仍交给模型')
+    parser.add_argument('--multi_key_extraction', '--multi-key-extraction', dest='multi_key_extraction', action='store_true', help='同一条目的多个普通抓取对象合并成一次提取调用，在一个JSON对象中返回，缺失或无法解析的抓取对象再单独提取')
+    parser.add_argument('--lazy_extraction', '--lazy-extraction', dest='lazy_extraction', action='store_true', help='按需提取：先评估第0层，每层只提取依赖仍然成立的规则子问题用到的抓取对象，依赖不成立的不再提取')
+    parser.add_argument('--resume', action='store_true', help='从输出目录中的轮次结果和断点日志继续上次中断的评估')
+    parser.add_argument('--list_rules', '--list-rules', dest='list_rules', action='store_true', help='列出所有已登记的评估规则后退出')
+    parser.add_argument('--profile_startup', '--profile-startup', dest='profile_startup', action='store_true', help='记录各模块的导入耗时和内存变化、加载所有NLP后端，把报告写入输出目录后退出')
     parser.add_argument('--use_defaults', action='store_true', help='使用所有默认配置，无需指定参数')
     parser.add_argument('--debug', action='store_true', help='启用调试模式，显示所有子模块的输出')
     parser.add_argument('--verbose', action='store_true', help='显示详细输出信息')
@@ -232,25 +389,106 @@ def main():
         for key, value in DEFAULT_CONFIG.items():
             setattr(args, key, value)
 
+    # 评估模块以 src_code 包的形式导入，需要把项目根目录加入 sys.path（--list_rules 也需要）
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+    # 只列出已登记的规则，不运行评估
+    if args.list_rules:
+        from src_code import process_rule_based_evaluate, process_rule_based_evaluate_eng
+        from src_code.rule_registry import list_rules
+        for registry_name, heads in list_rules().items():
+            print(f"📜 {registry_name}: {len(heads)} rules")
+            for head in heads:
+                print(f"   - {head}")
+        return
+
+    # 只分析启动耗时，不运行评估
+    if args.profile_startup:
+        from startup_profile import profile_rule_modules
+        profile_rule_modules(args.output_dir)
+        return
+
+    # 三个endpoint共用的HTTP连接池
+    configure_pool(
+        max_connections_per_host=args.max_connections_per_host,
+        max_keepalive_connections=args.max_keepalive_connections,
+        keepalive_expiry=args.keepalive_expiry,
+        http2=args.http2
+    )
+
     # 设置API配置
     set_qwen_config(
         api_key=args.qwen_api_key,
         base_url=args.qwen_base_url,
-        model_name=args.qwen_model
+        model_name=args.qwen_model,
+        max_concurrency=args.qwen_max_concurrency,
+        requests_per_second=args.qwen_requests_per_second,
+        tokens_per_minute=args.qwen_tokens_per_minute,
+        max_retries=args.max_retries
     )
     set_qwen_coder_config(
         api_key=args.qwen_coder_api_key,
         base_url=args.qwen_coder_base_url,
-        model_name=args.qwen_coder_model
+        model_name=args.qwen_coder_model,
+        max_concurrency=args.qwen_coder_max_concurrency,
+        requests_per_second=args.qwen_coder_requests_per_second,
+        tokens_per_minute=args.qwen_coder_tokens_per_minute,
+        max_retries=args.max_retries
     )
     set_tested_model_config(
         api_key=args.tested_model_api_key,
         base_url=args.tested_model_base_url,
-        model_name=args.tested_model_name
+        model_name=args.tested_model_name,
+        max_concurrency=args.tested_model_max_concurrency,
+        requests_per_second=args.tested_model_requests_per_second,
+        tokens_per_minute=args.tested_model_tokens_per_minute,
+        max_retries=args.max_retries
     )
 
-    # 测试API连接
-    if not test_all_apis():
+    set_prompt_layout(args.prompt_layout)
+    set_judge_max_tokens(args.judge_max_tokens)
+    set_judge_mode(args.judge_mode)
+    set_extraction_token_ratio(args.extraction_token_ratio)
+    set_multi_key_extraction(args.multi_key_extraction)
+
+    # 用量统计中的费用按各endpoint的价格计算
+    set_token_price("qwen", args.qwen_prompt_price, args.qwen_completion_price)
+    set_token_price("qwen_coder", args.qwen_coder_prompt_price, args.qwen_coder_completion_price)
+    set_token_price("tested_model", args.tested_model_prompt_price, args.tested_model_completion_price)
+
+    # 可复用的提取程序
+    if args.reuse_extraction_code:
+        enable_program_reuse(args.program_dir or os.path.join(args.cache_dir, "extraction_programs"))
+
+    # 本地列表提取
+    enable_fast_extract(args.fast_extract)
+
+    # 启用LLM响应缓存
+    if not args.no_cache:
+        enable_cache(args.cache_dir, args.cache_max_size_mb)
+
+    # 批处理导出/导入都以响应缓存为桥梁（custom_id即缓存键）
+    if (args.batch_export or args.batch_import) and args.no_cache:
+        print("❌ --batch_export / --batch_import 需要启用LLM响应缓存，不能与 --no-cache 同时使用")
+        return
+    if args.batch_import:
+        imported, failed = import_batch_results(args.batch_import, get_cache())
+        print(f"📥 Imported {imported} batch results into LLM cache" + (f" ({failed} failed or unreadable)" if failed else ""))
+    if args.batch_export:
+        enable_batch_export(args.batch_export)
+        if args.pipeline:
+            # 流水线中各阶段同时进行，无法在一个阶段结束时停下
+            print("⚠️  --batch_export 不支持流水线模式，改为逐阶段执行")
+            args.pipeline = False
+        if args.lazy_extraction:
+            # 按需提取在评估过程中发出提取请求，无法在提取阶段结束时停下
+            print("⚠️  --batch_export 不支持按需提取，改为评估前提取所有抓取对象")
+            args.lazy_extraction = False
+
+    # 测试API连接（批处理导出模式下不访问在线服务）
+    if not args.batch_export and not test_all_apis():
         print("🛑 API测试失败，程序退出")
         return
 
@@ -343,16 +581,30 @@ def main():
     print(f"   - Tested Model: {args.tested_model_name}")
     print(f"   - Tested Model Base URL: {args.tested_model_base_url}")
     print(f"   - Batch Size: {args.batch_size}")
+    print(f"   - Max Concurrency (tested/qwen/coder): {args.tested_model_max_concurrency}/{args.qwen_max_concurrency}/{args.qwen_coder_max_concurrency}")
+    print(f"   - Max Retries: {args.max_retries}")
+    print(f"   - HTTP Pool: {args.max_connections_per_host} connections/host, {args.max_keepalive_connections} keep-alive, "
+          f"{args.keepalive_expiry}s expiry{', HTTP/2' if args.http2 else ''}")
+    print(f"   - Prompt Layout: {args.prompt_layout}")
+    print(f"   - Judge Mode: {args.judge_mode}")
+    print(f"   - Token Budget: judge {args.judge_max_tokens or 'unlimited'}, extraction "
+          f"{str(args.extraction_token_ratio) + 'x response' if args.extraction_token_ratio else 'unlimited'}")
     print(f"   - Rounds: {args.rounds}")
     print(f"   - Output Directory: {args.output_dir}")
+    print(f"   - LLM Cache: {'disabled' if args.no_cache else args.cache_dir}")
+    if args.batch_export:
+        print(f"   - Batch Export: {args.batch_export}")
+    if args.reuse_extraction_code:
+        print(f"   - Reusable Extraction Programs: {args.program_dir or os.path.join(args.cache_dir, 'extraction_programs')}")
+    if args.fast_extract:
+        print("   - Fast Extraction: enabled")
+    if args.multi_key_extraction:
+        print("   - Multi-Key Extraction: enabled")
+    if args.lazy_extraction:
+        print("   - Lazy Extraction: enabled")
     print("=" * 80)
 
     # 根据数据路径判断使用哪个语言的评估模块
-    # 需要将 src_code 添加为包，并正确导入
-    project_root = os.path.dirname(os.path.dirname(__file__))
-    if project_root not in sys.path:
-        sys.path.insert(0, project_root)
-    
     # 智能判断语言：支持路径中包含 english/eng 或 asia/中文/日语/韩语
     data_path_lower = args.data_path.lower()
     is_english = ('english' in data_path_lower or 'eng' in data_path_lower or 
@@ -371,16 +623,39 @@ def main():
     if is_english and not is_asia:
         from src_code import process_rule_based_evaluate_eng
         rule_based_evaluate_func = process_rule_based_evaluate_eng.rule_based_evaluate
+        rule_registry = process_rule_based_evaluate_eng.RULES
         print("🔧 Using English/Multi-language evaluation modules")
     else:
         from src_code import process_rule_based_evaluate
         rule_based_evaluate_func = process_rule_based_evaluate.rule_based_evaluate
+        rule_registry = process_rule_based_evaluate.RULES
         print("🔧 Using Asia languages evaluation modules")
 
+    # 预编译数据中的所有规则，格式错误的规则在这里直接报错，而不是在评估时变成每个子问题的"规则评估异常"
+    rule_problems = rule_registry.check_rules(
+        sub_q["rule"]
+        for item in current_data
+        for sub_q in item.get("sub_questions", [])
+        if sub_q.get("rule") is not None
+    )
+    if rule_problems:
+        print(f"❌ Found {len(rule_problems)} malformed rules in data:")
+        for rule, problem in rule_problems:
+            print(f"   - {rule!r}: {problem}")
+        print("🛑 请修正数据中的规则后重试")
+        return
+    print("✅ All rules in data compiled")
+
+    # 启动规则评估进程池和执行提取代码的进程池
+    start_rule_workers(args.rule_workers, rule_based_evaluate_func)
+    start_code_workers(args.code_workers, args.code_timeout, args.code_memory_mb)
+
     # 多轮评估
     for round_num in range(args.rounds):
         print(f"🚀 Starting Round {round_num + 1} Evaluation")
         print("=" * 60)
+        # 用量按轮统计，丢弃之前（API连通性测试、上一轮）的累计值
+        take_usage()
 
         # 第一轮之后，只处理有错误的项目
         if round_num != 0:
@@ -393,30 +668,87 @@ def main():
             print("✅ No items to process in this round. All evaluations passed!")
             break
 
-        print("📝 Getting model responses for evaluation...")
-        process_in_batches(current_data, args.batch_size)
-
-        # 开始评估
-        og_start_time = time.time()
-        print(f"🔄 Round {round_num + 1} Processing Started")
+        output_file = os.path.join(args.output_dir, f"round_{round_num + 1}.json")
 
-        # 步骤1：提取对应部分
-        start_time = time.time()
-        print("🔍 Step 1: Extracting corresponding parts from all responses...")
-        current_data = extract_content(current_data)
-        print("✅ Corresponding parts extraction completed successfully")
-        end_time = time.time()
-        print(f"⏱️  Time taken: {end_time - start_time:.2f} seconds")
-        print()
+        # 断点续跑：本轮结果文件已存在时直接加载
+        if args.resume and os.path.exists(output_file):
+            with open(output_file, "r", encoding="utf-8") as f:
+                current_data = json.load(f)
+            print(f"⏭️  Round {round_num + 1} already completed, loaded results from: {output_file}")
+            print()
+            continue
+
+        # 本轮的断点日志，--resume 时回填已完成的回复、提取和评估结果
+        open_journal(args.output_dir, round_num + 1, resume=args.resume, items=current_data)
+
+        if args.pipeline:
+            # 流水线模式：获取回复、提取、评估三个阶段同时进行
+            og_start_time = time.time()
+            print(f"🔄 Round {round_num + 1} Pipeline Processing Started")
+            dedup_before = dedup_stats()
+            stage_batch_size = max(1, args.batch_size // args.pipeline_workers)
+            if args.lazy_extraction:
+                # 按需提取在评估阶段内进行，不需要单独的提取阶段
+                stages = [
+                    Stage("generation", lambda items: process_in_batches(items, len(items)),
+                          args.pipeline_workers, stage_batch_size),
+                    Stage("evaluation", lambda items: evaluate_with_lazy_extraction(items, len(items), rule_based_evaluate_func),
+                          args.pipeline_workers, stage_batch_size),
+                ]
+            else:
+                stages = [
+                    Stage("generation", lambda items: process_in_batches(items, len(items)),
+                          args.pipeline_workers, stage_batch_size),
+                    Stage("extraction", lambda items: extract_content(items, batch_size=len(items)),
+                          args.pipeline_workers, stage_batch_size),
+                    Stage("evaluation", lambda items: process_all_items(items, batch_size=len(items), rule_based_evaluate_func=rule_based_evaluate_func),
+                          args.pipeline_workers, stage_batch_size),
+                ]
+            current_data = run_pipeline(current_data, stages, queue_size=args.pipeline_queue_size)
+            end_time = time.time()
+            print_dedup_ratio("pipeline", dedup_before)
+            print()
+        else:
+            print("📝 Getting model responses for evaluation...")
+            dedup_before = dedup_stats()
+            process_in_batches(current_data, args.batch_size)
+            print_dedup_ratio("generation", dedup_before)
+            if stop_for_batch_export(round_num + 1, "generation"):
+                return
 
-        # 步骤2：处理和评估
-        start_time = time.time()
-        print("🔍 Step 2: Processing and evaluating all items...")
-        current_data = process_all_items(current_data, batch_size=5, rule_based_evaluate_func=rule_based_evaluate_func)
-        print("✅ Item processing and evaluation completed successfully")
-        end_time = time.time()
-        print(f"⏱️  Time taken: {end_time - start_time:.2f} seconds")
-        print()
+            # 开始评估
+            og_start_time = time.time()
+            print(f"🔄 Round {round_num + 1} Processing Started")
+
+            # 步骤1：提取对应部分（按需提取时在步骤2中逐层进行）
+            if not args.lazy_extraction:
+                start_time = time.time()
+                print("🔍 Step 1: Extracting corresponding parts from all responses...")
+                dedup_before = dedup_stats()
+                current_data = extract_content(current_data, batch_size=args.batch_size)
+                print_dedup_ratio("extraction", dedup_before)
+                if stop_for_batch_export(round_num + 1, "extraction"):
+                    return
+                print("✅ Corresponding parts extraction completed successfully")
+                end_time = time.time()
+                print(f"⏱️  Time taken: {end_time - start_time:.2f} seconds")
+                print()
+
+            # 步骤2：处理和评估
+            start_time = time.time()
+            print("🔍 Step 2: Processing and evaluating all items...")
+            dedup_before = dedup_stats()
+            if args.lazy_extraction:
+                current_data = evaluate_with_lazy_extraction(current_data, args.batch_size, rule_based_evaluate_func)
+            else:
+                current_data = process_all_items(current_data, batch_size=args.batch_size, rule_based_evaluate_func=rule_based_evaluate_func)
+            print_dedup_ratio("evaluation", dedup_before)
+            if stop_for_batch_export(round_num + 1, "evaluation"):
+                return
+            print("✅ Item processing and evaluation completed successfully")
+            end_time = time.time()
+            print(f"⏱️  Time taken: {end_time - start_time:.2f} seconds")
+            print()
 
         total_time = end_time - og_start_time
         print("=" * 60)
@@ -425,9 +757,9 @@ def main():
         print("=" * 60)
 
         # 保存结果
-        output_file = os.path.join(args.output_dir, f"round_{round_num + 1}.json")
         with open(output_file, "w", encoding="utf-8") as f:
             json.dump(current_data, f, ensure_ascii=False, indent=4)
+        close_journal()
         print(f"💾 Results saved to: {output_file}")
         print()
 
@@ -440,8 +772,20 @@ def main():
         print(f"   - Successful items: {success_items}")
         print(f"   - Items with errors: {error_items}")
         print(f"   - Success rate: {success_items/total_items*100:.2f}%")
+        print_cache_stats()
+        print_pool_stats()
+        print_replica_stats()
+        print_code_sandbox_stats()
+        print_program_stats()
+        print_fast_extract_stats()
+        print_lazy_extraction_stats()
+        usage = usage_report(take_usage())
+        print_usage_stats(usage)
+        print(f"📝 LLM usage saved to: {write_usage_report(args.output_dir, round_num + 1, usage)}")
         print()
 
+    stop_rule_workers()
+    stop_code_workers()
     print("🎊 All rounds completed successfully!")
 
 
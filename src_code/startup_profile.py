@@ -0,0 +1,158 @@
+"""
+启动耗时与内存分析（--profile-startup）
+
+记录每个模块导入的耗时和常驻内存（RSS）变化，以及每个NLP后端（camel_tools、pymorphy2、HanTa、verbecc、lingua……）
+第一次加载的耗时，写成两份报告：
+- startup_profile.json：按累计耗时降序排列的模块和后端列表，可以在版本之间对比
+- startup_profile.folded：折叠栈格式（"父模块;子模块 自身耗时微秒"），可直接交给 flamegraph.pl 或 speedscope
+
+导入计时通过替换 importlib._bootstrap._find_and_load 实现：import 语句和 importlib.import_module
+在模块不在 sys.modules 中时都会经过这个函数，嵌套的导入自然形成调用栈。
+"""
+
+import importlib
+import importlib._bootstrap as _bootstrap
+import json
+import os
+import sys
+import threading
+import time
+
+# 每个被导入的模块或被加载的后端一条记录
+_records = []
+_local = threading.local()
+_original_find_and_load = None
+_start_time = None
+_start_rss = None
+
+
+def _rss_mb():
+    """当前进程的常驻内存（MB）"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError, AttributeError):
+        # 没有 /proc 的系统：退化为峰值内存（近似值）
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _stack():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+def _measure(name, kind, func, *args):
+    """执行func并记录耗时、内存变化，嵌套在其中的导入记为它的子节点"""
+    stack = _stack()
+    frame = {"name": name, "children_time": 0.0}
+    stack.append(frame)
+    start_rss = _rss_mb()
+    start_time = time.perf_counter()
+    try:
+        return func(*args)
+    finally:
+        elapsed = time.perf_counter() - start_time
+        stack.pop()
+        if stack:
+            stack[-1]["children_time"] += elapsed
+        _records.append({
+            "name": name,
+            "kind": kind,
+            "stack": ";".join([f["name"] for f in stack] + [name]),
+            "cumulative_time": elapsed,
+            "self_time": elapsed - frame["children_time"],
+            "rss_delta_mb": _rss_mb() - start_rss,
+        })
+
+
+def _timed_find_and_load(name, import_):
+    return _measure(name, "module", _original_find_and_load, name, import_)
+
+
+def start():
+    """开始记录模块导入（应在导入其他模块之前调用）"""
+    global _original_find_and_load, _start_time, _start_rss
+    if _original_find_and_load is not None:
+        return
+    _start_time = time.perf_counter()
+    _start_rss = _rss_mb()
+    _original_find_and_load = _bootstrap._find_and_load
+    _bootstrap._find_and_load = _timed_find_and_load
+
+
+def stop():
+    """停止记录，恢复原来的导入函数"""
+    global _original_find_and_load
+    if _original_find_and_load is None:
+        return
+    _bootstrap._find_and_load = _original_find_and_load
+    _original_find_and_load = None
+
+
+def profile_backend(name):
+    """加载一个NLP后端并记录耗时"""
+    from src_code.nlp_backends import get_backend
+    return _measure(f"backend:{name}", "backend", get_backend, name)
+
+
+def write_report(output_dir, top=15):
+    """
+    写出报告并打印耗时最多的模块
+
+    Returns:
+        JSON报告的路径
+    """
+    total_time = time.perf_counter() - _start_time if _start_time is not None else None
+    modules = sorted((r for r in _records if r["kind"] == "module"), key=lambda r: r["cumulative_time"], reverse=True)
+    backends = sorted((r for r in _records if r["kind"] == "backend"), key=lambda r: r["cumulative_time"], reverse=True)
+    report = {
+        "python": sys.version.split()[0],
+        "total_time": total_time,
+        "rss_start_mb": _start_rss,
+        "rss_end_mb": _rss_mb(),
+        "module_count": len(modules),
+        "modules": modules,
+        "backends": backends,
+    }
+
+    os.makedirs(output_dir, exist_ok=True)
+    json_path = os.path.join(output_dir, "startup_profile.json")
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    folded_path = os.path.join(output_dir, "startup_profile.folded")
+    with open(folded_path, "w", encoding="utf-8") as f:
+        for record in _records:
+            f.write(f"{record['stack']} {max(0, int(record['self_time'] * 1e6))}\n")
+
+    print(f"⏱️  Startup profile: {len(modules)} modules imported, {len(backends)} backends loaded"
+          + (f" in {total_time:.2f} seconds" if total_time is not None else ""))
+    if _start_rss is not None:
+        print(f"   - RSS: {_start_rss:.1f} MB -> {report['rss_end_mb']:.1f} MB")
+    for record in sorted(_records, key=lambda r: r["cumulative_time"], reverse=True)[:top]:
+        print(f"   - {record['name']}: {record['cumulative_time']:.3f}s (self {record['self_time']:.3f}s), "
+              f"RSS {record['rss_delta_mb']:+.1f} MB")
+    print(f"📝 Startup profile saved to: {json_path}")
+    print(f"📝 Flamegraph stacks saved to: {folded_path}")
+    return json_path
+
+
+def profile_rule_modules(output_dir):
+    """
+    导入两个规则评估前端，再逐个加载所有已登记的NLP后端，然后写出报告
+
+    Args:
+        output_dir: 报告输出目录
+    """
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+    start()
+    importlib.import_module("src_code.process_rule_based_evaluate")
+    importlib.import_module("src_code.process_rule_based_evaluate_eng")
+    from src_code.nlp_backends import list_backends
+    for name in list_backends():
+        profile_backend(name)
+    stop()
+    return write_report(output_dir)